@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+AWS Learning Assistant - Answer Queue
+------------------------------------
+This module takes recording quiz answers off the web request path. The
+web interface puts each answer on a bounded queue and redirects right
+away; a background worker records the answers into the learners'
+trackers, writing all answers of the same learner that are waiting at
+that moment in one batch.
+
+When the queue is full, answers are recorded in the request instead, so
+a burst slows down rather than losing answers. Answers still queued when
+the process exits are written by an atexit hook, and a learner's next
+page view waits (briefly) for their own answers, so they always see them
+in their stats.
+"""
+
+import atexit
+import contextlib
+import os
+import queue
+import threading
+from collections import defaultdict
+
+# Answers waiting to be recorded; 0 records every answer in the request
+ANSWER_QUEUE_SIZE = int(os.getenv("ANSWER_QUEUE_SIZE", "1024"))
+
+# Queues with a running worker, drained when the interpreter exits
+_open_queues = set()
+_open_queues_lock = threading.Lock()
+
+
+@atexit.register
+def _close_open_queues():
+    with _open_queues_lock:
+        queues = list(_open_queues)
+    for answer_queue in queues:
+        answer_queue.close()
+
+
+class AnswerQueue:
+    """Record quiz answers into a TrackerPool from a background thread."""
+
+    def __init__(self, trackers, max_pending=None):
+        self.trackers = trackers
+        self.max_pending = ANSWER_QUEUE_SIZE if max_pending is None else max_pending
+        self._queue = queue.Queue(self.max_pending) if self.max_pending else None
+        # user id -> answers queued but not recorded yet
+        self._pending = defaultdict(int)
+        self._recorded = threading.Condition()
+        self._closed = False
+        self.inline = 0
+        if self._queue is not None:
+            self._worker = threading.Thread(target=self._run, name="answer-queue", daemon=True)
+            self._worker.start()
+            with _open_queues_lock:
+                _open_queues.add(self)
+
+    def submit(self, user_id, quiz_question, user_answer, is_correct):
+        """
+        Record an answer, normally by queueing it for the worker.
+
+        Args:
+            user_id (str): The learner
+            quiz_question (dict): The question that was answered
+            user_answer (str): The option the learner chose
+            is_correct (bool): Whether it was the correct option
+        """
+        answer = (user_id, quiz_question, user_answer, is_correct)
+        if self._queue is not None and not self._closed:
+            with self._recorded:
+                self._pending[user_id] += 1
+            try:
+                self._queue.put_nowait(answer)
+                return
+            except queue.Full:
+                self._done([user_id])
+        self.inline += 1
+        self._record([answer])
+
+    def wait_for(self, user_id, timeout=1.0):
+        """
+        Wait until the queued answers of a learner are recorded.
+
+        Returns:
+            bool: False if some were still queued after timeout seconds
+        """
+        with self._recorded:
+            return self._recorded.wait_for(lambda: not self._pending.get(user_id), timeout)
+
+    def flush(self, timeout=None):
+        """Wait until every queued answer is recorded."""
+        with self._recorded:
+            return self._recorded.wait_for(lambda: not self._pending, timeout)
+
+    def close(self):
+        """Record the queued answers, stop the worker and write the trackers' buffers."""
+        with _open_queues_lock:
+            _open_queues.discard(self)
+        if self._queue is not None and not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._worker.join()
+        self.trackers.flush()
+
+    def _record(self, answers):
+        """Record answers, one batch per learner (write-behind trackers buffer them already)."""
+        by_user = defaultdict(list)
+        for user_id, *answer in answers:
+            by_user[user_id].append(answer)
+        for user_id, user_answers in by_user.items():
+            try:
+                tracker = self.trackers.get(user_id)
+                with contextlib.nullcontext() if tracker.write_behind else tracker.batch():
+                    for quiz_question, user_answer, is_correct in user_answers:
+                        tracker.record_quiz_answer(quiz_question, user_answer, is_correct)
+            except Exception as e:
+                print(f"Error recording {len(user_answers)} answer(s) of {user_id}: {e}")
+
+    def _done(self, user_ids):
+        with self._recorded:
+            for user_id in user_ids:
+                self._pending[user_id] -= 1
+                if not self._pending[user_id]:
+                    del self._pending[user_id]
+            self._recorded.notify_all()
+
+    def _run(self):
+        stop = False
+        while not stop:
+            answers = [self._queue.get()]
+            # Take whatever else is waiting so each learner is written once
+            while True:
+                try:
+                    answers.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in answers:
+                stop = True
+                answers = [answer for answer in answers if answer is not None]
+            self._record(answers)
+            self._done([answer[0] for answer in answers])
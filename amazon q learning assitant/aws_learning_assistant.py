@@ -7,21 +7,25 @@ summarizes the top 3 updates, and creates quiz questions based on the content.
 The results are then sent via email.
 """
 
-import feedparser
-import requests
 import smtplib
 import random
 import datetime
-import json
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from bs4 import BeautifulSoup
 import os
 from dotenv import load_dotenv
+from feed_ingest import fetch_feeds, merge_latest
+from feed_cache import FeedCache
+from seen_index import SeenIndex
+from html_text import html_to_text
+from content_store import ContentStore
 
 # Import Bedrock enhancement if available
 try:
-    from bedrock_enhancement import generate_summary, generate_quiz_question
+    from bedrock_enhancement import (
+        generate_summaries, generate_quiz_questions,
+        get_client_metrics, get_response_cache,
+    )
     BEDROCK_AVAILABLE = True
     print("Amazon Bedrock enhancement is available and will be used.")
 except (ImportError, Exception) as e:
@@ -34,9 +38,10 @@ load_dotenv()
 
 # Try to import the learning tracker
 try:
-    from learning_tracker import LearningTracker
+    from learning_tracker import TrackerPool, DEFAULT_USER
     TRACKER_AVAILABLE = True
-    tracker = LearningTracker()
+    # The learner whose progress this run records
+    tracker = TrackerPool().get(os.getenv("LEARNER_ID", DEFAULT_USER))
     print("Learning tracker is available and will be used.")
 except (ImportError, Exception) as e:
     TRACKER_AVAILABLE = False
@@ -46,73 +51,103 @@ except (ImportError, Exception) as e:
 # Configuration
 AWS_WHATS_NEW_RSS = "https://aws.amazon.com/about-aws/whats-new/recent/feed/"
 AWS_BLOG_RSS = "https://aws.amazon.com/blogs/aws/feed/"
+# Extra feeds (regional blogs, service blogs) as a comma-separated list
+EXTRA_RSS_FEEDS = [url.strip() for url in os.getenv("EXTRA_RSS_FEEDS", "").split(",") if url.strip()]
+RSS_FEEDS = [AWS_WHATS_NEW_RSS, AWS_BLOG_RSS] + EXTRA_RSS_FEEDS
+FEED_TIMEOUT = float(os.getenv("FEED_TIMEOUT", "10"))
+FEED_MAX_WORKERS = int(os.getenv("FEED_MAX_WORKERS", "8"))
+FEED_CACHE_DIR = os.getenv("FEED_CACHE_DIR", ".feed_cache")
+SEEN_INDEX_FILE = os.getenv("SEEN_INDEX_FILE", "seen_entries.json")
+QUIZ_QUESTION_COUNT = int(os.getenv("QUIZ_QUESTION_COUNT", "3"))
+STATIC_SITE_DIR = os.getenv("STATIC_SITE_DIR")
 EMAIL_FROM = os.getenv("EMAIL_FROM")
 EMAIL_TO = os.getenv("EMAIL_TO")
 EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
 SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
 SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
 
-def fetch_rss_feed(url):
-    """Fetch and parse an RSS feed."""
-    feed = feedparser.parse(url)
-    return feed.entries
-
 def extract_content(entry):
     """Extract title, link, and summary from an RSS entry."""
     return {
         "title": entry.title,
         "link": entry.link,
-        "summary": BeautifulSoup(entry.summary, "html.parser").get_text() if hasattr(entry, "summary") else "",
+        "summary": html_to_text(entry.summary) if hasattr(entry, "summary") else "",
         "published": entry.published if hasattr(entry, "published") else "",
     }
 
-def get_latest_updates():
-    """Get the latest updates from AWS blogs and What's New feed."""
-    whats_new_entries = fetch_rss_feed(AWS_WHATS_NEW_RSS)
-    blog_entries = fetch_rss_feed(AWS_BLOG_RSS)
-    
-    # Combine and sort by publication date (most recent first)
-    all_entries = []
-    for entry in whats_new_entries + blog_entries:
-        content = extract_content(entry)
-        all_entries.append(content)
-    
-    # Sort by publication date (assuming entries have a 'published' field)
-    # Take the top 10 entries for further processing
-    return all_entries[:10]
+def get_latest_updates(seen_index=None, limit=10):
+    """
+    Get the latest updates from AWS blogs and What's New feed.
+    
+    Entries already in seen_index are served from their stored content
+    instead of being extracted again.
+    """
+    # Fetch all configured feeds concurrently; a failing feed is skipped and
+    # unchanged feeds (HTTP 304) are served from the on-disk cache
+    feed_cache = FeedCache(FEED_CACHE_DIR)
+    results = fetch_feeds(RSS_FEEDS, timeout=FEED_TIMEOUT, max_workers=FEED_MAX_WORKERS, cache=feed_cache)
+    cache_stats = feed_cache.get_stats()
+    print(f"Feed cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+    
+    feeds = []
+    for result in results:
+        if result["error"]:
+            print(f"Skipping feed {result['url']}: {result['error']}")
+            continue
+        feeds.append(result["entries"])
+    
+    # Merge the feeds by publication date (most recent first) and only
+    # extract the content of the entries that make the cut
+    latest_entries = []
+    for entry in merge_latest(feeds, limit):
+        content = seen_index.get_content(entry) if seen_index else None
+        if content is None:
+            content = extract_content(entry)
+            if seen_index:
+                seen_index.add_content(entry, content)
+        latest_entries.append(content)
+    
+    return latest_entries
 
-def summarize_updates(updates, count=3):
-    """Summarize the top updates."""
+def summarize_updates(updates, count=3, seen_index=None):
+    """
+    Summarize the top updates.
+    
+    Summaries generated on a previous run are reused from seen_index, so
+    Bedrock is only called for updates that are actually new. The new ones
+    are summarized in one concurrent batch.
+    """
     summaries = []
+    pending = []
     
     for update in updates[:count]:
-        if BEDROCK_AVAILABLE:
-            # Use Bedrock to generate a better summary
-            try:
-                update_copy = update.copy()
-                update_copy['summary'] = generate_summary(update['summary'])
-                summaries.append(update_copy)
-            except Exception as e:
-                print(f"Error using Bedrock for summarization: {e}")
-                # Fall back to the original summary
-                summaries.append(update)
-        else:
-            # Just use the original summary
-            summaries.append(update)
+        update_copy = update.copy()
+        stored_summary = seen_index.get_summary(update) if seen_index else None
+        if stored_summary:
+            update_copy['summary'] = stored_summary
+        elif BEDROCK_AVAILABLE:
+            pending.append((update, update_copy))
+        summaries.append(update_copy)
     
-    return summaries
-
-def create_quiz_question(update):
-    """Create a quiz question based on an update."""
-    if BEDROCK_AVAILABLE:
+    if pending:
+        # Use Bedrock to generate better summaries
         try:
-            # Use Bedrock to generate a better quiz question
-            return generate_quiz_question(update)
+            generated = generate_summaries([update['summary'] for update, _ in pending], fallback=False)
         except Exception as e:
-            print(f"Error using Bedrock for quiz generation: {e}")
-            # Fall back to basic quiz generation
+            print(f"Error using Bedrock for summarization: {e}")
+            generated = [None] * len(pending)
+        
+        for (update, update_copy), summary in zip(pending, generated):
+            # Items that failed keep the original summary
+            if summary is not None:
+                update_copy['summary'] = summary
+                if seen_index:
+                    seen_index.set_summary(update, summary)
     
-    # Basic quiz generation (fallback)
+    return summaries
+
+def create_basic_quiz_question(update):
+    """Create a quiz question without Bedrock."""
     question = f"What is the main benefit of the new feature described in '{update['title']}'?"
     
     # Generate some plausible options
@@ -134,8 +169,29 @@ def create_quiz_question(update):
         "source": update["link"]
     }
 
-def format_email_content(summaries, quiz_question):
-    """Format the email content with summaries and quiz question."""
+def create_quiz_questions(updates, count=QUIZ_QUESTION_COUNT):
+    """
+    Create a set of quiz questions covering several updates.
+    
+    With Bedrock the whole set is generated in a single model call;
+    otherwise each question is created with the basic generator.
+    """
+    if not updates:
+        return []
+    
+    if BEDROCK_AVAILABLE:
+        try:
+            return generate_quiz_questions(updates, count)
+        except Exception as e:
+            print(f"Error using Bedrock for quiz generation: {e}")
+            # Fall back to basic quiz generation
+    
+    return [create_basic_quiz_question(updates[i % len(updates)]) for i in range(count)]
+
+def format_email_content(summaries, quiz_questions):
+    """Format the email content with summaries and quiz questions."""
+    if isinstance(quiz_questions, dict):
+        quiz_questions = [quiz_questions]
     today = datetime.datetime.now().strftime("%Y-%m-%d")
     
     html = f"""
@@ -169,21 +225,26 @@ def format_email_content(summaries, quiz_question):
             </div>
         """
     
-    html += f"""
+    for number, quiz_question in enumerate(quiz_questions, 1):
+        heading = f"Quiz Question {number}" if len(quiz_questions) > 1 else "Today's Quiz Question"
+        html += f"""
             <div class="quiz">
-                <h2>Today's Quiz Question</h2>
+                <h2>{heading}</h2>
                 <p><strong>{quiz_question['question']}</strong></p>
                 <div class="options">
-    """
-    
-    for i, option in enumerate(quiz_question['options']):
-        html += f"                <p>{chr(65+i)}. {option}</p>\n"
-    
-    html += f"""
+        """
+        
+        for i, option in enumerate(quiz_question['options']):
+            html += f"                <p>{chr(65+i)}. {option}</p>\n"
+        
+        html += f"""
                 </div>
-                <p><em>The answer will be revealed in tomorrow's email!</em></p>
                 <p>Source: <a href="{quiz_question['source']}">Read the article</a></p>
             </div>
+        """
+    
+    html += f"""
+            <p><em>The answers will be revealed in tomorrow's email!</em></p>
             
             <div class="footer">
                 <p>This email was automatically generated by your AWS Learning Assistant.</p>
@@ -221,17 +282,29 @@ def send_email(subject, html_content):
 
 def main():
     """Main function to run the AWS Learning Assistant."""
+    seen_index = SeenIndex(SEEN_INDEX_FILE)
+    
     print("Fetching latest AWS updates...")
-    updates = get_latest_updates()
+    updates = get_latest_updates(seen_index)
     
     print(f"Found {len(updates)} updates. Summarizing...")
-    summaries = summarize_updates(updates)
+    summaries = summarize_updates(updates, seen_index=seen_index)
     
-    print("Creating quiz question...")
-    quiz_question = create_quiz_question(random.choice(summaries))
+    print("Creating quiz questions...")
+    quiz_questions = create_quiz_questions(summaries)
+    
+    if BEDROCK_AVAILABLE:
+        metrics = get_client_metrics()
+        print(f"Bedrock: {metrics['clients_created']} client(s) created in {metrics['client_create_seconds']:.2f}s, "
+              f"{metrics['invocations']} model call(s) in {metrics['invoke_seconds']:.2f}s")
+        response_cache = get_response_cache()
+        if response_cache:
+            cache_stats = response_cache.get_stats()
+            print(f"Bedrock response cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                  f"({cache_stats['hit_rate']:.0%} hit rate, {cache_stats['entries']} entries)")
     
     print("Formatting email content...")
-    html_content = format_email_content(summaries, quiz_question)
+    html_content = format_email_content(summaries, quiz_questions)
     
     today = datetime.datetime.now().strftime("%Y-%m-%d")
     subject = f"AWS Daily Learning Update - {today}"
@@ -243,23 +316,35 @@ def main():
         print("Failed to send email.")
     
     # Save today's content for reference
-    with open(f"aws_learning_{today}.json", "w") as f:
-        json.dump({
-            "summaries": summaries,
-            "quiz_question": quiz_question
-        }, f, indent=2)
+    content_store = ContentStore()
+    content_store.save_day(today, {
+        "summaries": summaries,
+        # The first question is kept under its old key for older readers
+        "quiz_question": quiz_questions[0] if quiz_questions else None,
+        "quiz_questions": quiz_questions
+    })
+    print(f"Content for {today} saved to {content_store.db_path}")
     
-    print(f"Content saved to aws_learning_{today}.json")
+    # Refresh the pre-rendered static site if one is configured
+    if STATIC_SITE_DIR:
+        from static_export import export_site
+        result = export_site(content_store, STATIC_SITE_DIR)
+        print(f"Static site in {STATIC_SITE_DIR} updated ({len(result['rendered'])} day(s) rendered)")
+    content_store.close()
     
     # Track learning progress if available
     if TRACKER_AVAILABLE:
         print("Tracking learning progress...")
-        for summary in summaries:
-            tracker.record_update_read(summary)
+        # Updates tracked on a previous run are not counted again
+        tracker.record_updates_read(
+            summary for update, summary in zip(updates, summaries) if seen_index.mark_tracked(update)
+        )
         
         # We don't have a user answer yet, so we'll just record that the quiz was generated
         # In a real implementation, you might want to track answers through the web interface
         print("Learning progress tracked.")
+    
+    seen_index.save()
 
 if __name__ == "__main__":
     main()
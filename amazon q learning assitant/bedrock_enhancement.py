@@ -7,25 +7,200 @@ to generate better summaries and more relevant quiz questions.
 """
 
 import boto3
+import concurrent.futures
 import json
+import os
+import random
+import threading
+import time
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from llm_cache import ResponseCache, make_key
+from quiz_parser import parse_json, parse_quiz, repair_quiz
+
+MODEL_ID = 'anthropic.claude-v2'
+# Bump these when a prompt template changes so cached responses are not reused
+SUMMARY_PROMPT_VERSION = "summary-v1"
+QUIZ_PROMPT_VERSION = "quiz-v1"
+QUIZ_REPAIR_PROMPT_VERSION = "quiz-repair-v1"
+QUIZ_SET_PROMPT_VERSION = "quiz-set-v1"
+
+# Connection pool settings for the shared client
+BEDROCK_MAX_POOL_CONNECTIONS = int(os.getenv("BEDROCK_MAX_POOL_CONNECTIONS", "10"))
+BEDROCK_TCP_KEEPALIVE = os.getenv("BEDROCK_TCP_KEEPALIVE", "true").lower() in ("1", "true", "yes")
+
+# Response cache settings
+LLM_CACHE_DB = os.getenv("LLM_CACHE_DB", "llm_cache.sqlite3")
+LLM_CACHE_TTL_DAYS = float(os.getenv("LLM_CACHE_TTL_DAYS", "30"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+
+# Error codes that mean "slow down and try again"
+RETRYABLE_ERROR_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "ModelNotReadyException",
+}
+
+_client = None
+_client_lock = threading.Lock()
+_metrics_lock = threading.Lock()
+_metrics = {
+    "clients_created": 0,
+    "client_create_seconds": 0.0,
+    "invocations": 0,
+    "invoke_seconds": 0.0,
+}
+
+def _record_metric(count_key, seconds_key, seconds):
+    with _metrics_lock:
+        _metrics[count_key] += 1
+        _metrics[seconds_key] += seconds
 
 def get_bedrock_client():
-    """Initialize and return the Amazon Bedrock client."""
-    return boto3.client('bedrock-runtime')
+    """
+    Return the process-wide Amazon Bedrock client.
+    
+    The client is created once, on first use, and then shared by every call
+    and worker thread (boto3 clients are thread-safe). Its connection pool
+    size and TCP keep-alive come from BEDROCK_MAX_POOL_CONNECTIONS and
+    BEDROCK_TCP_KEEPALIVE.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                started = time.perf_counter()
+                config = Config(
+                    max_pool_connections=BEDROCK_MAX_POOL_CONNECTIONS,
+                    tcp_keepalive=BEDROCK_TCP_KEEPALIVE,
+                )
+                _client = boto3.client('bedrock-runtime', config=config)
+                _record_metric("clients_created", "client_create_seconds", time.perf_counter() - started)
+    return _client
+
+def reset_bedrock_client():
+    """Drop the shared client and zero the metrics (used by tests)."""
+    global _client
+    with _client_lock:
+        _client = None
+    with _metrics_lock:
+        for key in _metrics:
+            _metrics[key] = type(_metrics[key])()
+
+_response_cache = None
+_response_cache_set = False
+_cache_lock = threading.Lock()
+
+def get_response_cache():
+    """Return the process-wide response cache, or None if caching is disabled."""
+    global _response_cache, _response_cache_set
+    with _cache_lock:
+        if not _response_cache_set:
+            if LLM_CACHE_DB:
+                _response_cache = ResponseCache(
+                    LLM_CACHE_DB,
+                    ttl_seconds=LLM_CACHE_TTL_DAYS * 24 * 60 * 60,
+                    max_entries=LLM_CACHE_MAX_ENTRIES,
+                )
+            _response_cache_set = True
+        return _response_cache
+
+def set_response_cache(cache):
+    """Replace the response cache; pass None to disable caching."""
+    global _response_cache, _response_cache_set
+    with _cache_lock:
+        _response_cache = cache
+        _response_cache_set = True
 
-def generate_summary(content, max_length=200):
+def get_client_metrics():
+    """Return how often and how long clients were created versus models invoked."""
+    with _metrics_lock:
+        return dict(_metrics)
+
+def invoke_with_retry(client, max_retries=3, base_delay=0.5, **kwargs):
+    """
+    Call invoke_model, retrying throttled requests with exponential backoff.
+    
+    Args:
+        client: A bedrock-runtime client
+        max_retries (int): Number of retries after the first attempt
+        base_delay (float): Delay before the first retry, doubled on each retry
+        **kwargs: Arguments passed to invoke_model
+        
+    Returns:
+        dict: The invoke_model response
+    """
+    for attempt in range(max_retries + 1):
+        started = time.perf_counter()
+        try:
+            return client.invoke_model(**kwargs)
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            if code not in RETRYABLE_ERROR_CODES or attempt == max_retries:
+                raise
+        finally:
+            _record_metric("invocations", "invoke_seconds", time.perf_counter() - started)
+        # Full jitter keeps concurrent workers from retrying in lockstep
+        time.sleep(random.uniform(0, base_delay * (2 ** attempt)))
+
+def complete(prompt, text, template_version, params, prompt_args=None,
+             client=None, max_retries=0, base_delay=0.5):
+    """
+    Return the model completion for a prompt, using the response cache.
+    
+    Args:
+        prompt (str): The rendered prompt
+        text (str): The input text the prompt was built from
+        template_version (str): Version of the prompt template
+        params (dict): Inference parameters sent with the prompt
+        prompt_args (dict): Other values rendered into the prompt
+        client: Optional bedrock-runtime client to use
+        max_retries (int): Retries for throttled requests
+        base_delay (float): Initial backoff delay in seconds
+        
+    Returns:
+        str: The completion text
+    """
+    cache = get_response_cache()
+    if cache:
+        key = make_key(MODEL_ID, template_version, text, {**params, **(prompt_args or {})})
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+    
+    client = client or get_bedrock_client()
+    response = invoke_with_retry(
+        client,
+        max_retries=max_retries,
+        base_delay=base_delay,
+        modelId=MODEL_ID,
+        body=json.dumps({
+            "prompt": f"\n\nHuman: {prompt}\n\nAssistant:",
+            **params,
+        })
+    )
+    
+    response_body = json.loads(response['body'].read())
+    completion = response_body['completion'].strip()
+    if cache:
+        cache.put(key, completion)
+    return completion
+
+def generate_summary(content, max_length=200, client=None, max_retries=0, base_delay=0.5):
     """
     Generate a concise summary of AWS content using Amazon Bedrock.
     
     Args:
         content (str): The AWS update content to summarize
         max_length (int): Maximum length of the summary
+        client: Optional bedrock-runtime client to use
+        max_retries (int): Retries for throttled requests
+        base_delay (float): Initial backoff delay in seconds
         
     Returns:
         str: A concise summary of the content
     """
-    client = get_bedrock_client()
-    
     prompt = f"""
     Summarize the following AWS update in a concise, informative way.
     Focus on the key benefits, features, and use cases. Keep it under {max_length} characters.
@@ -35,31 +210,76 @@ def generate_summary(content, max_length=200):
     """
     
     # Using Claude model as an example
-    response = client.invoke_model(
-        modelId='anthropic.claude-v2',
-        body=json.dumps({
-            "prompt": f"\n\nHuman: {prompt}\n\nAssistant:",
+    return complete(
+        prompt,
+        content,
+        SUMMARY_PROMPT_VERSION,
+        {
             "max_tokens_to_sample": 500,
             "temperature": 0.5,
             "top_p": 0.9,
-        })
+        },
+        prompt_args={"max_length": max_length},
+        client=client,
+        max_retries=max_retries,
+        base_delay=base_delay,
     )
+
+def generate_summaries(contents, max_length=200, max_workers=4, max_retries=3,
+                       base_delay=0.5, fallback=True, client=None):
+    """
+    Generate summaries for many AWS updates concurrently.
     
-    response_body = json.loads(response['body'].read())
-    return response_body['completion'].strip()
+    Requests run on a bounded worker pool that shares one client, so the
+    batch takes about one model round trip instead of one per update.
+    Keep max_workers at or below BEDROCK_MAX_POOL_CONNECTIONS so workers
+    do not wait on connections.
+    Throttled requests are retried with exponential backoff.
+    
+    Args:
+        contents (list): The AWS update contents to summarize
+        max_length (int): Maximum length of each summary
+        max_workers (int): Maximum number of concurrent model calls
+        max_retries (int): Retries for throttled requests
+        base_delay (float): Initial backoff delay in seconds
+        fallback (bool): Return the original content for items that fail
+            (otherwise None is returned for them)
+        client: Optional bedrock-runtime client to use
+        
+    Returns:
+        list: One summary per content, in the same order
+    """
+    contents = list(contents)
+    if not contents:
+        return []
+    
+    def summarize(content):
+        try:
+            return generate_summary(content, max_length, client, max_retries, base_delay)
+        except Exception as e:
+            print(f"Error using Bedrock for summarization: {e}")
+            return content if fallback else None
+    
+    workers = max(1, min(max_workers, len(contents)))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(summarize, contents))
 
-def generate_quiz_question(content):
+def generate_quiz_question(content, client=None, max_reprompts=1):
     """
     Generate a quiz question based on AWS content using Amazon Bedrock.
     
+    The reply is parsed and validated with quiz_parser. Fields that cannot
+    be repaired locally are asked for again (up to max_reprompts times)
+    before falling back to a canned question.
+    
     Args:
         content (dict): The AWS update content with title, summary, and link
+        client: Optional bedrock-runtime client to use
+        max_reprompts (int): Number of follow-up calls for invalid fields
         
     Returns:
         dict: A quiz question with options and correct answer
     """
-    client = get_bedrock_client()
-    
     prompt = f"""
     Create a multiple-choice quiz question based on the following AWS update.
     The question should test understanding of the key concepts, benefits, or use cases.
@@ -78,66 +298,190 @@ def generate_quiz_question(content):
     """
     
     # Using Claude model as an example
-    response = client.invoke_model(
-        modelId='anthropic.claude-v2',
-        body=json.dumps({
-            "prompt": f"\n\nHuman: {prompt}\n\nAssistant:",
+    response_text = complete(
+        prompt,
+        f"{content['title']}\n{content['summary']}",
+        QUIZ_PROMPT_VERSION,
+        {
             "max_tokens_to_sample": 1000,
             "temperature": 0.7,
             "top_p": 0.9,
-        })
+        },
+        client=client,
     )
     
-    response_body = json.loads(response['body'].read())
+    quiz_data, invalid = parse_quiz(response_text)
     
-    # Extract the JSON from the response
-    response_text = response_body['completion'].strip()
-    
-    # Find the JSON object in the response
-    try:
-        # Try to parse the entire response as JSON
-        quiz_data = json.loads(response_text)
-    except json.JSONDecodeError:
-        # If that fails, try to extract the JSON object from the text
-        import re
-        json_match = re.search(r'({.*})', response_text, re.DOTALL)
-        if json_match:
-            try:
-                quiz_data = json.loads(json_match.group(1))
-            except json.JSONDecodeError:
-                # Fallback to a default question if parsing fails
-                quiz_data = {
-                    "question": f"What is the main benefit of {content['title']}?",
-                    "options": [
-                        "Improved performance",
-                        "Cost reduction",
-                        "Enhanced security",
-                        "Better user experience"
-                    ],
-                    "correct_answer": "Improved performance",
-                    "correct_index": 0,
-                    "explanation": "Please refer to the article for details."
-                }
-        else:
-            # Fallback to a default question
-            quiz_data = {
-                "question": f"What is the main benefit of {content['title']}?",
-                "options": [
-                    "Improved performance",
-                    "Cost reduction",
-                    "Enhanced security",
-                    "Better user experience"
-                ],
-                "correct_answer": "Improved performance",
-                "correct_index": 0,
-                "explanation": "Please refer to the article for details."
-            }
+    # Ask again for just the fields that are still missing or invalid
+    for _ in range(max_reprompts):
+        if not invalid:
+            break
+        quiz_data, invalid = repair_quiz_fields(content, quiz_data, invalid, client)
+    
+    if invalid:
+        # Fallback to a default question if the reply could not be repaired
+        print(f"Could not parse a valid quiz question (invalid fields: {', '.join(invalid)})")
+        quiz_data = default_quiz_question(content)
     
     # Add the source link
     quiz_data["source"] = content["link"]
     
     return quiz_data
 
+def generate_quiz_questions(contents, count=None, client=None):
+    """
+    Generate a set of quiz questions covering several AWS updates in one call.
+    
+    The model is asked for a JSON array of questions. Each question is
+    validated and repaired like a single question; a question that is
+    still invalid gets one follow-up call for its invalid fields, and a
+    missing one falls back to the canned question for its update.
+    
+    Args:
+        contents (list): AWS update contents with title, summary, and link
+        count (int): Number of questions (defaults to one per update)
+        client: Optional bedrock-runtime client to use
+        
+    Returns:
+        list: count quiz questions, each with the source link of its update
+    """
+    contents = list(contents)
+    if not contents:
+        return []
+    count = count or len(contents)
+    
+    updates_text = "\n\n".join(
+        f"Update {i}:\nTitle: {content['title']}\nSummary: {content['summary']}"
+        for i, content in enumerate(contents, 1)
+    )
+    prompt = f"""
+    Create {count} multiple-choice quiz questions based on the following AWS updates.
+    Cover as many different updates as possible. Each question should test
+    understanding of the key concepts, benefits, or use cases.
+    
+    {updates_text}
+    
+    Format your response as a JSON array of {count} objects with the following structure:
+    [
+        {{
+            "update": 1,
+            "question": "The question text",
+            "options": ["Option A", "Option B", "Option C", "Option D"],
+            "correct_answer": "The correct option text",
+            "correct_index": 0,
+            "explanation": "Brief explanation of why this is the correct answer"
+        }}
+    ]
+    "update" is the number of the update the question is about and
+    "correct_index" is the 0-based index of the correct option.
+    """
+    
+    response_text = complete(
+        prompt,
+        "\n".join(f"{content['title']}\n{content['summary']}" for content in contents),
+        QUIZ_SET_PROMPT_VERSION,
+        {
+            "max_tokens_to_sample": 600 * count,
+            "temperature": 0.7,
+            "top_p": 0.9,
+        },
+        prompt_args={"count": count},
+        client=client,
+    )
+    
+    items = parse_json(response_text, "[")
+    items = [item for item in items if isinstance(item, dict)] if isinstance(items, list) else []
+    
+    questions = []
+    for i in range(count):
+        quiz_data = items[i] if i < len(items) else None
+        update_number = quiz_data.get("update") if quiz_data else None
+        if not (isinstance(update_number, int) and 1 <= update_number <= len(contents)):
+            update_number = i % len(contents) + 1
+        content = contents[update_number - 1]
+        
+        if quiz_data is None:
+            quiz_data = default_quiz_question(content)
+        else:
+            quiz_data.pop("update", None)
+            invalid = repair_quiz(quiz_data)
+            if invalid:
+                quiz_data, invalid = repair_quiz_fields(content, quiz_data, invalid, client)
+            if invalid:
+                quiz_data = default_quiz_question(content)
+        
+        quiz_data["source"] = content["link"]
+        questions.append(quiz_data)
+    
+    return questions
+
+def repair_quiz_fields(content, quiz_data, invalid, client=None):
+    """
+    Re-prompt the model for only the invalid fields of a quiz question.
+    
+    Args:
+        content (dict): The AWS update content with title and summary
+        quiz_data (dict): The partially valid quiz question
+        invalid (list): The names of the invalid fields
+        client: Optional bedrock-runtime client to use
+        
+    Returns:
+        tuple: The merged quiz question and its remaining invalid fields
+    """
+    # Fields derived from an invalid field have to be asked for as well
+    if "options" in invalid:
+        invalid = sorted(set(invalid) | {"correct_index", "correct_answer"})
+    valid = {key: value for key, value in quiz_data.items() if key not in invalid}
+    
+    prompt = f"""
+    The following is a partial multiple-choice quiz question about an AWS update.
+    Provide only the missing fields: {', '.join(invalid)}.
+    "options" must be a list of exactly 4 distinct answers, "correct_index" the
+    0-based index of the correct option and "correct_answer" its exact text.
+    
+    AWS Update Title: {content['title']}
+    AWS Update Summary: {content['summary']}
+    
+    Partial question:
+    {json.dumps(valid, indent=2)}
+    
+    Respond with a single JSON object containing only the missing fields.
+    """
+    
+    response_text = complete(
+        prompt,
+        f"{content['title']}\n{content['summary']}\n{json.dumps(valid, sort_keys=True)}",
+        QUIZ_REPAIR_PROMPT_VERSION,
+        {
+            "max_tokens_to_sample": 500,
+            "temperature": 0.2,
+            "top_p": 0.9,
+        },
+        prompt_args={"invalid": invalid},
+        client=client,
+    )
+    
+    fields = parse_json(response_text)
+    merged = dict(valid)
+    if isinstance(fields, dict):
+        merged.update({key: value for key, value in fields.items() if key in invalid or key not in merged})
+    return merged, repair_quiz(merged)
+
+def default_quiz_question(content):
+    """Return the canned quiz question used when generation fails."""
+    return {
+        "question": f"What is the main benefit of {content['title']}?",
+        "options": [
+            "Improved performance",
+            "Cost reduction",
+            "Enhanced security",
+            "Better user experience"
+        ],
+        "correct_answer": "Improved performance",
+        "correct_index": 0,
+        "explanation": "Please refer to the article for details."
+    }
+
 # Example usage:
 # This module can be imported into the main aws_learning_assistant.py script
 # and used to replace the basic summarize_updates and create_quiz_question functions
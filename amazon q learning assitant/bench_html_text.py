@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+AWS Learning Assistant - HTML to Text Benchmark
+----------------------------------------------
+Compares the throughput of html_to_text() with BeautifulSoup's get_text()
+on a corpus of saved feed summaries. The corpus is read from the feed
+cache when one exists, otherwise from fixtures/feed_summaries.json.
+
+Usage:
+    python bench_html_text.py [--cache-dir .feed_cache] [--repeat 200]
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+
+from bs4 import BeautifulSoup
+
+from html_text import html_to_text
+
+FIXTURE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "feed_summaries.json")
+
+
+def load_corpus(cache_dir):
+    """Load feed summaries from the feed cache, falling back to the fixture file."""
+    summaries = []
+    for path in glob.glob(os.path.join(cache_dir, "*.json")):
+        with open(path) as f:
+            summaries.extend(entry.get("summary", "") for entry in json.load(f)["entries"])
+    if summaries:
+        return summaries, cache_dir
+    with open(FIXTURE_FILE) as f:
+        return json.load(f), FIXTURE_FILE
+
+
+def measure(extract, corpus, repeat):
+    """Return the number of summaries converted per second."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for markup in corpus:
+            extract(markup)
+    return repeat * len(corpus) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cache-dir", default=".feed_cache")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    corpus, source = load_corpus(args.cache_dir)
+    mismatches = sum(html_to_text(m) != BeautifulSoup(m, "html.parser").get_text() for m in corpus)
+    print(f"Corpus: {len(corpus)} summaries from {source} ({mismatches} mismatches)")
+
+    soup_rate = measure(lambda m: BeautifulSoup(m, "html.parser").get_text(), corpus, args.repeat)
+    fast_rate = measure(html_to_text, corpus, args.repeat)
+    print(f"BeautifulSoup: {soup_rate:10.0f} summaries/s")
+    print(f"html_to_text:  {fast_rate:10.0f} summaries/s ({fast_rate / soup_rate:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+AWS Learning Assistant - Search Benchmark
+----------------------------------------
+Fills a content store with several years of generated daily updates and
+times ContentStore.search for common and rare words, prefixes, topic
+filters and date ranges, reporting the median and slowest query times.
+
+Usage:
+    python bench_search.py [--years 3] [--updates 10] [--repeat 50]
+"""
+
+import argparse
+import datetime
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from bench_topic_matcher import make_titles
+from content_store import ContentStore
+
+WORDS = ("performance availability regions pricing encryption latency throughput "
+         "integration console monitoring scaling replication backups compliance").split()
+
+QUERIES = [
+    ("common word", {"text": "amazon"}),
+    ("service", {"text": "lambda"}),
+    ("two words", {"text": "lambda regions"}),
+    ("prefix", {"text": "encry"}),
+    ("rare word", {"text": "html"}),
+    ("topic filter", {"text": "support", "topic": "S3"}),
+    ("date range", {"text": "amazon", "since": "2025-01-01", "until": "2025-03-31"}),
+]
+
+
+def fill(store, years, updates, seed):
+    rng = random.Random(seed)
+    start = datetime.date(2024, 1, 1)
+    days = years * 365
+    titles = make_titles(days * updates, seed)
+    for day in range(days):
+        summaries = [
+            {
+                "title": titles[day * updates + i],
+                "link": f"https://aws.amazon.com/about-aws/whats-new/{day}/{i}",
+                "summary": " ".join(rng.choice(WORDS) for _ in range(40)),
+            }
+            for i in range(updates)
+        ]
+        store.save_day((start + datetime.timedelta(days=day)).isoformat(), {"summaries": summaries})
+    return days * updates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--updates", type=int, default=10, help="updates per day")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ContentStore(os.path.join(directory, "content.sqlite3"))
+        started = time.perf_counter()
+        count = fill(store, args.years, args.updates, args.seed)
+        print(f"indexed {count} updates in {time.perf_counter() - started:.1f} s")
+
+        for name, query in QUERIES:
+            times = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                results = store.search(**query)
+                times.append(time.perf_counter() - started)
+            print(f"{name:<13} {len(results):>3} results, median {statistics.median(times) * 1000:.2f} ms, "
+                  f"max {max(times) * 1000:.2f} ms")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+AWS Learning Assistant - Answer Submission Benchmark
+---------------------------------------------------
+Sends a burst of quiz answers through the web interface's submit_answer
+view, from several concurrent clients spread over a set of learners
+(each with some answer history already recorded, so every stats write
+has a realistic size), once
+with answers recorded in the request (ANSWER_QUEUE_SIZE=0) and once with
+the background answer queue. Reports the request latency percentiles and
+checks that every answer ended up in the learners' stats.
+
+Usage:
+    python bench_submit_answer.py [--answers 2000] [--learners 50] [--concurrency 8] [--history 200]
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from content_store import ContentStore
+from web_interface import create_app
+
+DATE = "2026-10-01"
+QUIZ = {
+    "question": "What is the maximum memory for AWS Lambda?",
+    "options": ["1 GB", "3 GB", "10 GB", "64 GB"],
+    "correct_index": 2,
+    "correct_answer": "10 GB",
+}
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def run_burst(directory, queue_size, answers, learners, concurrency, history):
+    """Submit the answers and return the sorted latencies and the answers recorded."""
+    db_path = os.path.join(directory, "content.sqlite3")
+    store = ContentStore(db_path)
+    store.save_day(DATE, {"summaries": [], "quiz_question": QUIZ, "quiz_questions": [QUIZ]})
+    store.close()
+    app = create_app({
+        "SECRET_KEY": "bench",
+        "CONTENT_DB": db_path,
+        "TRACKER_SHARD_DIR": os.path.join(directory, "learning_stats"),
+        "ANSWER_QUEUE_SIZE": queue_size,
+        "ALLOW_USER_PARAM": True,
+    })
+
+    trackers = app.extensions["trackers"]
+    for n in range(learners):
+        tracker = trackers.get(f"learner-{n}")
+        with tracker.batch():
+            for i in range(history):
+                tracker.record_quiz_answer(dict(QUIZ, question=f"Question {i}"), "10 GB", i % 3 != 0)
+
+    latencies = []
+    lock = threading.Lock()
+
+    def client(offset):
+        # Without cookies, so flash messages do not pile up in one session
+        test_client = app.test_client(use_cookies=False)
+        local = []
+        for i in range(offset, answers, concurrency):
+            started = time.perf_counter()
+            test_client.get(f"/answer/{DATE}/0/{i % 4}?user=learner-{i % learners}")
+            local.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(local)
+
+    clients = [threading.Thread(target=client, args=(offset,)) for offset in range(concurrency)]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+
+    app.extensions["answers"].close()
+    recorded = sum(trackers.get(f"learner-{n}").get_stats()["quizzes_answered"] - history for n in range(learners))
+    return sorted(latencies), recorded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--answers", type=int, default=2000)
+    parser.add_argument("--learners", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--history", type=int, default=200, help="answers already recorded per learner")
+    args = parser.parse_args()
+
+    results = {}
+    for name, queue_size in (("in request", 0), ("queued", args.answers)):
+        with tempfile.TemporaryDirectory() as directory:
+            latencies, recorded = run_burst(directory, queue_size, args.answers, args.learners, args.concurrency,
+                                           args.history)
+        results[name] = latencies
+        print(f"{name:<11} p50 {percentile(latencies, 0.50) * 1000:.2f} ms, "
+              f"p99 {percentile(latencies, 0.99) * 1000:.2f} ms, {recorded}/{args.answers} answers recorded")
+    speedup = percentile(results["in request"], 0.99) / percentile(results["queued"], 0.99)
+    print(f"p99 speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
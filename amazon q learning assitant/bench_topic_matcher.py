@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+AWS Learning Assistant - Topic Matcher Benchmark
+-----------------------------------------------
+Compares the compiled TopicMatcher with the original topic extraction,
+which lowercased the title once per service name and matched substrings,
+on a set of generated update titles. Also counts the titles on which the
+two disagree (mostly substring false positives of the original).
+
+Usage:
+    python bench_topic_matcher.py [--titles 100000] [--seed 0]
+"""
+
+import argparse
+import random
+import time
+
+from topic_matcher import DEFAULT_SERVICES, TopicMatcher
+
+TEMPLATES = [
+    "Amazon {0} now supports {1} in additional AWS Regions",
+    "AWS {0} announces integration with Amazon {1}",
+    "Introducing {0} configuration templates for HTML dashboards",
+    "{0} adds support for containerized workloads on {1}",
+    "Announcing general availability of {0} serverless endpoints",
+    "New machine learning features in Amazon {0}",
+    "AWS releases updated documentation for configuring XML exports",
+    "Amazon {0} improves database performance with {1} caching",
+]
+
+
+def original_extract_topics(title):
+    """The topic extraction LearningTracker used before TopicMatcher."""
+    topics = []
+    for service in DEFAULT_SERVICES:
+        if service.lower() in title.lower():
+            topics.append(service)
+    if not topics:
+        if "serverless" in title.lower():
+            topics.append("Serverless")
+        elif "container" in title.lower():
+            topics.append("Containers")
+        elif "machine learning" in title.lower() or "ml" in title.lower():
+            topics.append("Machine Learning")
+        elif "database" in title.lower() or "db" in title.lower():
+            topics.append("Databases")
+        elif "security" in title.lower():
+            topics.append("Security")
+        else:
+            topics.append("General")
+    return topics
+
+
+def make_titles(count, seed):
+    rng = random.Random(seed)
+    services = list(DEFAULT_SERVICES)
+    return [
+        rng.choice(TEMPLATES).format(rng.choice(services), rng.choice(services))
+        for _ in range(count)
+    ]
+
+
+def measure(extract, titles):
+    started = time.perf_counter()
+    results = [extract(title) for title in titles]
+    return time.perf_counter() - started, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--titles", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    titles = make_titles(args.titles, args.seed)
+    compile_started = time.perf_counter()
+    matcher = TopicMatcher()
+    compile_time = time.perf_counter() - compile_started
+
+    original_time, original = measure(original_extract_topics, titles)
+    compiled_time, compiled = measure(matcher.match, titles)
+    differ = sum(1 for a, b in zip(original, compiled) if sorted(a) != sorted(b))
+
+    print(f"titles:          {len(titles)}")
+    print(f"original:        {original_time:.3f} s ({original_time / len(titles) * 1e6:.2f} us/title)")
+    print(f"compiled:        {compiled_time:.3f} s ({compiled_time / len(titles) * 1e6:.2f} us/title)"
+          f", compiled once in {compile_time * 1000:.1f} ms")
+    print(f"speedup:         {original_time / compiled_time:.1f}x")
+    print(f"different topics: {differ} titles")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+AWS Learning Assistant - Tracker Storage Benchmark
+-------------------------------------------------
+Measures the cost of recording one tracker event as the history grows,
+for each storage backend. The JSON store rewrites the whole document on
+every event, so its cost grows with the history; the event log store
+appends one line, so its cost should stay flat.
+
+Usage:
+    python bench_tracker_storage.py [--sizes 1000 10000 100000] [--writes 50]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from tracker_storage import open_store
+
+
+def make_event(i):
+    return {
+        "type": "quiz_answer",
+        "date": "2026-01-01",
+        "question": f"What does AWS service number {i} do?",
+        "user_answer": "It stores objects",
+        "correct_answer": "It stores objects",
+        "is_correct": i % 3 != 0,
+    }
+
+
+def measure(kind, history, writes):
+    """Return the mean seconds per recorded event with history events already stored."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = open_store(kind, os.path.join(tmpdir, "learning_stats.json"))
+        # Seed the history in one batch so setup time does not dominate
+        store.record(make_event(i) for i in range(history))
+        started = time.perf_counter()
+        for i in range(writes):
+            store.record([make_event(history + i)])
+        elapsed = time.perf_counter() - started
+        store.close()
+    return elapsed / writes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--writes", type=int, default=50)
+    parser.add_argument("--storage", nargs="+", default=["json", "eventlog"])
+    args = parser.parse_args()
+
+    print(f"{'history':>10}  " + "  ".join(f"{kind:>14}" for kind in args.storage))
+    for size in args.sizes:
+        costs = [measure(kind, size, args.writes) for kind in args.storage]
+        print(f"{size:>10}  " + "  ".join(f"{cost * 1000:11.3f} ms" for cost in costs))
+
+
+if __name__ == "__main__":
+    main()
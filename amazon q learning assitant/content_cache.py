@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+AWS Learning Assistant - Daily Content Cache
+-------------------------------------------
+This module keeps the web interface from querying the content store and
+parsing JSON on every page view. The list of available dates is cached
+and parsed daily documents are kept in a size-bounded LRU. Both are
+dropped when the store's version changes, which is checked at most once
+per poll interval, so a steady-state page view does not touch the
+database at all.
+
+Quiz answer keys are indexed separately from the documents: they are
+small, so the keys of every day that has been answered stay in memory
+even after its document drops out of the LRU.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class DailyContentCache:
+    """Cached access to the days in a ContentStore."""
+
+    def __init__(self, store, max_documents=32, poll_interval=1.0):
+        self.store = store
+        self.max_documents = max_documents
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._dates = []
+        self._date_set = frozenset()
+        self._version = None
+        self._checked = None
+        # date -> parsed document
+        self._documents = OrderedDict()
+        # date -> tuple of quiz questions
+        self._answer_keys = {}
+        self.scans = 0
+        self.loads = 0
+
+    def _refresh(self, now):
+        """Reload the date index if the store changed; call with the lock held."""
+        if self._checked is not None and now - self._checked < self.poll_interval:
+            return
+        self._checked = now
+        version = self.store.version()
+        if version == self._version:
+            return
+        self._version = version
+        self.scans += 1
+        self._dates = self.store.dates()
+        self._date_set = frozenset(self._dates)
+        # A day may have been saved again
+        self._documents.clear()
+        self._answer_keys.clear()
+
+    def dates(self):
+        """Return the available dates, most recent first."""
+        with self._lock:
+            self._refresh(time.monotonic())
+            return list(self._dates)
+
+    def get(self, date):
+        """
+        Return the parsed document for a date.
+
+        Args:
+            date (str): A date as YYYY-MM-DD
+
+        Returns:
+            dict: The document, or None if there is none for the date
+        """
+        with self._lock:
+            self._refresh(time.monotonic())
+            if date not in self._date_set:
+                return None
+            document = self._documents.get(date)
+            if document is not None:
+                self._documents.move_to_end(date)
+                return document
+            version = self._version
+
+        # Load outside the lock so a slow query does not block other pages
+        document = self.store.get_day(date)
+        if document is None:
+            return None
+
+        with self._lock:
+            self.loads += 1
+            # Do not cache a document loaded before the store changed again
+            if self._version == version:
+                self._documents[date] = document
+                while len(self._documents) > self.max_documents:
+                    self._documents.popitem(last=False)
+        return document
+
+    def quiz_questions(self, date):
+        """
+        Return the quiz questions of a date from the answer key index.
+
+        Returns:
+            tuple: The questions (older days only have one), or None if
+            there is no content for the date
+        """
+        with self._lock:
+            self._refresh(time.monotonic())
+            questions = self._answer_keys.get(date)
+            if questions is not None:
+                return questions
+            version = self._version
+
+        document = self.get(date)
+        if document is None:
+            return None
+        questions = tuple(document.get('quiz_questions') or [document['quiz_question']])
+        with self._lock:
+            if self._version == version:
+                self._answer_keys[date] = questions
+        return questions
+
+    def invalidate(self):
+        """Forget everything, so the next access reloads from the store."""
+        with self._lock:
+            self._version = None
+            self._checked = None
+            self._documents.clear()
+            self._answer_keys.clear()
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+AWS Learning Assistant - Daily Content Store
+-------------------------------------------
+This module keeps each day's summaries and quiz questions in one SQLite
+database instead of loose aws_learning_<date>.json files. The day
+documents are stored whole, and every update is also indexed by date,
+source link and topic, so listing dates, looking up a day, date ranges
+and topic or link lookups are index queries no matter how many days have
+accumulated.
+
+Updates are also indexed for full-text search (SQLite FTS5) on their
+title, summary, topics and date. The search index is kept up to date in
+the same transaction that saves a day, and is built from the stored days
+when an older database is opened for the first time.
+
+Existing files can be imported with:
+    python content_store.py import [--dir .] [--remove]
+"""
+
+import argparse
+import datetime
+import glob
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from topic_matcher import get_topic_matcher
+
+CONTENT_DB = os.getenv("CONTENT_DB", "aws_learning.sqlite3")
+FILE_PREFIX = "aws_learning_"
+FILE_SUFFIX = ".json"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS days (
+    date TEXT PRIMARY KEY,
+    document TEXT NOT NULL,
+    saved_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS updates (
+    date TEXT NOT NULL REFERENCES days (date) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    title TEXT,
+    link TEXT,
+    PRIMARY KEY (date, position)
+);
+CREATE INDEX IF NOT EXISTS idx_updates_link ON updates (link);
+CREATE TABLE IF NOT EXISTS update_topics (
+    date TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    topic TEXT NOT NULL,
+    PRIMARY KEY (date, position, topic),
+    FOREIGN KEY (date, position) REFERENCES updates (date, position) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_update_topics_topic ON update_topics (topic, date);
+"""
+
+# The rowid of an update in the search index is <date as YYYYMMDD> * 1000 +
+# position, so a day's rows and date ranges are rowid ranges
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS updates_fts USING fts5 (
+    title, summary, topics, date, link UNINDEXED,
+    tokenize = 'unicode61'
+);
+"""
+SEARCH_SCHEMA_VERSION = 1
+ROWS_PER_DAY = 1000
+# bm25 weights of title, summary, topics, date (link is not indexed)
+SEARCH_WEIGHTS = (10.0, 1.0, 5.0, 2.0, 0.0)
+SNIPPET_WORDS = 24
+# Topics can have several words ("API Gateway")
+TOPIC_SEPARATOR = "; "
+
+
+def _check_date(date):
+    """Raise ValueError unless date is a real day written as YYYY-MM-DD."""
+    if not isinstance(date, str) or not re.fullmatch(r"\d{4}-\d{2}-\d{2}", date):
+        raise ValueError(f"Invalid date {date!r}, expected YYYY-MM-DD")
+    datetime.datetime.strptime(date, "%Y-%m-%d")
+
+
+def _day_key(date):
+    """Return the first search index rowid of a day."""
+    return int(date.replace("-", "")) * ROWS_PER_DAY
+
+
+def _search_words(text):
+    return re.findall(r"\w+", text.lower())
+
+
+def _snippet(text, words, size=SNIPPET_WORDS):
+    """Return about size words of text around the first one matching a search word."""
+    tokens = text.split()
+    start = 0
+    for i, token in enumerate(tokens):
+        token = token.lower()
+        if any(token.startswith(word) for word in words):
+            start = max(0, i - size // 4)
+            break
+    snippet = " ".join(tokens[start:start + size])
+    return ("..." if start else "") + snippet + ("..." if start + size < len(tokens) else "")
+
+
+def search_query(text, topic=None):
+    """
+    Turn what a user typed into an FTS5 query.
+
+    Every word must match; the last one may be a prefix, so results show
+    up while typing. Quotes and operators are not passed through, so no
+    input can make the query invalid.
+
+    Returns:
+        str: The query, or None if there is nothing to search for
+    """
+    words = _search_words(text)
+    terms = [f'"{word}"' for word in words]
+    if terms and not text[-1:].isspace():
+        terms[-1] += "*"
+    if topic:
+        topic_words = re.findall(r"\w+", topic.lower())
+        if topic_words:
+            terms.append('topics : "{}"'.format(" ".join(topic_words)))
+    return " ".join(terms) or None
+
+
+class ContentStore:
+    """Daily content (summaries, quiz questions) in an indexed SQLite database."""
+
+    def __init__(self, db_path=None, topic_matcher=None):
+        self.db_path = db_path or CONTENT_DB
+        self.topic_matcher = topic_matcher or get_topic_matcher()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+            self._conn.executescript(SEARCH_SCHEMA)
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] < SEARCH_SCHEMA_VERSION:
+                # Rank results with bm25 weighted by column
+                self._conn.execute(
+                    "INSERT INTO updates_fts (updates_fts, rank) VALUES ('rank', ?)",
+                    ("bm25({})".format(", ".join(str(weight) for weight in SEARCH_WEIGHTS)),),
+                )
+                self._rebuild_search_index()
+                self._conn.execute(f"PRAGMA user_version = {SEARCH_SCHEMA_VERSION}")
+
+    def _search_rows(self, date, document):
+        """Return the search index rows of a day's updates."""
+        rows = []
+        for position, update in enumerate((document.get("summaries") or [])[:ROWS_PER_DAY]):
+            title = update.get("title") or ""
+            rows.append((
+                _day_key(date) + position, title, update.get("summary") or "",
+                TOPIC_SEPARATOR.join(self.topic_matcher.match(title)), date, update.get("link"),
+            ))
+        return rows
+
+    def _rebuild_search_index(self):
+        """Index every stored day for search; call inside a transaction."""
+        self._conn.execute("DELETE FROM updates_fts")
+        for date, document in self._conn.execute("SELECT date, document FROM days").fetchall():
+            self._conn.executemany(
+                "INSERT INTO updates_fts (rowid, title, summary, topics, date, link) VALUES (?, ?, ?, ?, ?, ?)",
+                self._search_rows(date, json.loads(document)),
+            )
+
+    def save_day(self, date, document):
+        """
+        Store (or replace) the document of a day and index its updates.
+
+        Args:
+            date (str): The day, as YYYY-MM-DD
+            document (dict): The day's summaries and quiz questions
+
+        Raises:
+            ValueError: If date is not a YYYY-MM-DD day
+        """
+        _check_date(date)
+        rows = []
+        topic_rows = []
+        for position, update in enumerate(document.get("summaries") or []):
+            rows.append((date, position, update.get("title"), update.get("link")))
+            for topic in self.topic_matcher.match(update.get("title") or ""):
+                topic_rows.append((date, position, topic))
+
+        search_rows = self._search_rows(date, document)
+
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM days WHERE date = ?", (date,))
+            self._conn.execute(
+                "DELETE FROM updates_fts WHERE rowid >= ? AND rowid < ?", (_day_key(date), _day_key(date) + ROWS_PER_DAY)
+            )
+            self._conn.execute(
+                "INSERT INTO days (date, document, saved_at) VALUES (?, ?, ?)",
+                (date, json.dumps(document), time.time()),
+            )
+            self._conn.executemany("INSERT INTO updates (date, position, title, link) VALUES (?, ?, ?, ?)", rows)
+            self._conn.executemany("INSERT INTO update_topics (date, position, topic) VALUES (?, ?, ?)", topic_rows)
+            self._conn.executemany(
+                "INSERT INTO updates_fts (rowid, title, summary, topics, date, link) VALUES (?, ?, ?, ?, ?, ?)",
+                search_rows,
+            )
+            self._writes += 1
+
+    def get_day(self, date):
+        """Return the document of a day, or None if there is none."""
+        with self._lock:
+            row = self._conn.execute("SELECT document FROM days WHERE date = ?", (date,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def dates(self):
+        """Return the stored dates, most recent first."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT date FROM days ORDER BY date DESC")]
+
+    def days_between(self, start, end):
+        """Return (date, document) pairs for start <= date <= end, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT date, document FROM days WHERE date BETWEEN ? AND ? ORDER BY date", (start, end)
+            ).fetchall()
+        return [(date, json.loads(document)) for date, document in rows]
+
+    def updates_for_topic(self, topic, limit=50):
+        """Return the most recent updates about a topic as dicts with date, title and link."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT u.date, u.title, u.link FROM update_topics t"
+                " JOIN updates u ON u.date = t.date AND u.position = t.position"
+                " WHERE t.topic = ? ORDER BY t.date DESC, t.position LIMIT ?",
+                (topic, limit),
+            ).fetchall()
+        return [{"date": date, "title": title, "link": link} for date, title, link in rows]
+
+    def dates_for_link(self, link):
+        """Return the dates on which an update with this source link was included."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT date FROM updates WHERE link = ? ORDER BY date", (link,)
+            )]
+
+    def search(self, text, topic=None, since=None, until=None, limit=20):
+        """
+        Search the titles, summaries, topics and dates of all updates.
+
+        Args:
+            text (str): What to search for; all words must match
+            topic (str): Only updates about this topic
+            since (str): Only updates on or after this date (YYYY-MM-DD)
+            until (str): Only updates on or before this date (YYYY-MM-DD)
+            limit (int): The maximum number of results
+
+        Returns:
+            list: Dicts with date, title, link, topics and a snippet of the
+            summary, best match first
+        """
+        query = search_query(text, topic)
+        if query is None:
+            return []
+        low = _day_key(since) if since else 0
+        high = _day_key(until) + ROWS_PER_DAY if until else 2 ** 63 - 1
+        with self._lock:
+            # Rank every match; ties go to the most recent update
+            ids = [row[0] for row in self._conn.execute(
+                "SELECT rowid FROM updates_fts WHERE updates_fts MATCH ? AND rowid >= ? AND rowid < ?"
+                " ORDER BY rank, rowid DESC LIMIT ?",
+                (query, low, high, limit),
+            )]
+            rows = {row[0]: row[1:] for row in self._conn.execute(
+                "SELECT rowid, date, title, link, topics, summary FROM updates_fts"
+                f" WHERE rowid IN ({', '.join('?' * len(ids))})",
+                ids,
+            )}
+        words = _search_words(text)
+        return [
+            {"date": date, "title": title, "link": link, "topics": topics.split(TOPIC_SEPARATOR) if topics else [],
+             "snippet": _snippet(summary, words)}
+            for date, title, link, topics, summary in (rows[rowid] for rowid in ids)
+        ]
+
+    def version(self):
+        """
+        Return a value that changes whenever the stored content changes.
+
+        Covers writes from this store and from other connections, e.g. the
+        daily script writing while the web interface is running.
+        """
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0], self._writes
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def date_from_filename(path):
+    """Return the date in an aws_learning_<date>.json file name."""
+    name = os.path.basename(path)
+    return name[len(FILE_PREFIX):-len(FILE_SUFFIX)]
+
+
+def import_json_files(store, directory='.', remove=False):
+    """
+    Import aws_learning_<date>.json files into a content store.
+
+    Args:
+        store (ContentStore): The store to import into
+        directory (str): Where the files are
+        remove (bool): Delete each file once it has been imported
+
+    Returns:
+        tuple: The imported dates and the (path, error) pairs of files that failed
+    """
+    imported = []
+    failed = []
+    for path in sorted(glob.glob(os.path.join(directory, f"{FILE_PREFIX}*{FILE_SUFFIX}"))):
+        try:
+            with open(path, 'r') as f:
+                document = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            failed.append((path, e))
+            continue
+        date = date_from_filename(path)
+        try:
+            store.save_day(date, document)
+        except ValueError as e:
+            # Not a daily file, e.g. aws_learning_<date>.backup.json
+            failed.append((path, e))
+            continue
+        imported.append(date)
+        if remove:
+            os.remove(path)
+    return imported, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the daily content store.")
+    parser.add_argument("--db", default=None, help=f"database file (default: {CONTENT_DB})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", help="import aws_learning_<date>.json files")
+    import_parser.add_argument("--dir", default=".", help="directory with the files")
+    import_parser.add_argument("--remove", action="store_true", help="delete files once imported")
+    args = parser.parse_args()
+
+    store = ContentStore(args.db)
+    imported, failed = import_json_files(store, args.dir, remove=args.remove)
+    store.close()
+    print(f"Imported {len(imported)} day(s) into {store.db_path}")
+    for path, error in failed:
+        print(f"Skipped {path}: {error}")
+
+
+if __name__ == "__main__":
+    main()
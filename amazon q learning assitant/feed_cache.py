@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+AWS Learning Assistant - Feed Cache
+----------------------------------
+This module keeps a persistent, per-URL cache of RSS feeds. It stores the
+ETag / Last-Modified validators returned by the server together with the
+parsed entries, so the next fetch can be a conditional request and an
+unchanged feed (HTTP 304) is served without downloading or parsing it.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+import feedparser
+
+
+def _restore(value):
+    """Turn cached JSON values back into the shapes feedparser produces."""
+    if isinstance(value, dict):
+        restored = feedparser.FeedParserDict()
+        for key, item in value.items():
+            if key.endswith("_parsed") and isinstance(item, list):
+                restored[key] = time.struct_time(item)
+            else:
+                restored[key] = _restore(item)
+        return restored
+    if isinstance(value, list):
+        return [_restore(item) for item in value]
+    return value
+
+
+class FeedCache:
+    """An on-disk store of feed validators and parsed entries, one file per URL."""
+
+    def __init__(self, cache_dir='.feed_cache'):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._memory = {}
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url):
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def _load(self, url):
+        with self._lock:
+            if url in self._memory:
+                return self._memory[url]
+        try:
+            with open(self._path(url), 'r') as f:
+                record = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if record.get("url") != url:
+            return None
+        with self._lock:
+            self._memory[url] = record
+        return record
+
+    def conditional_headers(self, url):
+        """Return the If-None-Match / If-Modified-Since headers for a URL."""
+        record = self._load(url)
+        headers = {}
+        if record:
+            if record.get("etag"):
+                headers["If-None-Match"] = record["etag"]
+            if record.get("last_modified"):
+                headers["If-Modified-Since"] = record["last_modified"]
+        return headers
+
+    def get_entries(self, url):
+        """
+        Return the cached entries for a URL after a 304 response.
+
+        Args:
+            url (str): The feed URL
+
+        Returns:
+            list: The cached entries, or None if nothing is cached
+        """
+        record = self._load(url)
+        with self._lock:
+            if record is None:
+                return None
+            self.hits += 1
+            if "_entries" not in record:
+                record["_entries"] = _restore(record["entries"])
+            return record["_entries"]
+
+    def store(self, url, entries, etag=None, last_modified=None):
+        """Store freshly parsed entries and their validators for a URL."""
+        record = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+            "entries": json.loads(json.dumps(entries, default=str)),
+        }
+        path = self._path(url)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, 'w') as f:
+            json.dump(record, f)
+        os.replace(tmp_path, path)
+
+        record["_entries"] = entries
+        with self._lock:
+            self.misses += 1
+            self._memory[url] = record
+
+    def get_stats(self):
+        """Return the hit/miss counters."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+AWS Learning Assistant - Feed Ingestion
+--------------------------------------
+This module fetches many RSS feeds at the same time. Each feed is
+downloaded on a bounded thread pool with its own deadline, so the total
+run time tracks the slowest feed instead of the sum of all feeds, and a
+broken feed only loses its own entries.
+"""
+
+import calendar
+import concurrent.futures
+import heapq
+import itertools
+import time
+
+import feedparser
+import requests
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MAX_WORKERS = 8
+USER_AGENT = "aws-learning-assistant/1.0 (+feedparser)"
+CHUNK_SIZE = 64 * 1024
+
+
+class FeedTimeout(Exception):
+    """Raised when a feed takes longer than its deadline to download."""
+
+
+def _download(session, url, timeout, headers=None):
+    """Download a feed body, giving up once the whole transfer exceeds timeout."""
+    deadline = time.monotonic() + timeout
+    response = session.get(
+        url,
+        timeout=timeout,
+        stream=True,
+        headers={"User-Agent": USER_AGENT, **(headers or {})},
+    )
+    try:
+        if response.status_code == 304:
+            return response, None
+        response.raise_for_status()
+        chunks = []
+        for chunk in response.iter_content(CHUNK_SIZE):
+            chunks.append(chunk)
+            if time.monotonic() > deadline:
+                raise FeedTimeout(f"Timed out after {timeout}s")
+        return response, b"".join(chunks)
+    finally:
+        response.close()
+
+
+def _fetch_entries(session, url, timeout, cache):
+    """Fetch a feed's entries, answering from the cache on a 304."""
+    headers = cache.conditional_headers(url) if cache else {}
+    response, body = _download(session, url, timeout, headers)
+    if body is None:
+        entries = cache.get_entries(url) if cache else None
+        if entries is not None:
+            return entries, True
+        # The server says "not modified" but we have nothing cached
+        response, body = _download(session, url, timeout)
+        if body is None:
+            raise ValueError("Got 304 Not Modified for an uncached feed")
+
+    feed = feedparser.parse(body, response_headers=dict(response.headers))
+    if cache:
+        cache.store(
+            url,
+            feed.entries,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+    return feed.entries, False
+
+
+def fetch_feed(url, timeout=DEFAULT_TIMEOUT, session=None, cache=None):
+    """
+    Fetch and parse a single RSS feed.
+
+    Args:
+        url (str): The feed URL
+        timeout (float): Seconds allowed for the whole download
+        session (requests.Session): Optional session to reuse connections
+        cache (FeedCache): Optional cache used for conditional requests
+
+    Returns:
+        dict: The feed url, its entries, an error message (or None),
+        whether it was served from the cache and the elapsed time in seconds
+    """
+    started = time.monotonic()
+    session = session or requests
+    try:
+        entries, cached = _fetch_entries(session, url, timeout, cache)
+        error = None
+    except Exception as e:
+        entries, cached, error = [], False, str(e) or e.__class__.__name__
+    return {
+        "url": url,
+        "entries": entries,
+        "error": error,
+        "cached": cached,
+        "elapsed": time.monotonic() - started,
+    }
+
+
+def fetch_feeds(urls, timeout=DEFAULT_TIMEOUT, max_workers=DEFAULT_MAX_WORKERS, cache=None):
+    """
+    Fetch and parse several RSS feeds concurrently.
+
+    Args:
+        urls (list): The feed URLs to fetch
+        timeout (float): Seconds allowed for each feed
+        max_workers (int): Maximum number of feeds downloaded at once
+        cache (FeedCache): Optional cache used for conditional requests
+
+    Returns:
+        list: One result dict per URL (see fetch_feed), in the order of urls.
+        Failed feeds have an error message and no entries.
+    """
+    urls = list(urls)
+    if not urls:
+        return []
+
+    workers = max(1, min(max_workers, len(urls)))
+    with requests.Session() as session:
+        adapter = requests.adapters.HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(fetch_feed, url, timeout, session, cache) for url in urls]
+            return [future.result() for future in futures]
+
+
+def entry_timestamp(entry):
+    """Return an entry's publication time in seconds since the epoch (0 if unknown)."""
+    parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+    return calendar.timegm(parsed) if parsed else 0
+
+
+def merge_latest(feeds, limit):
+    """
+    Merge the entries of several feeds into the most recent ones.
+
+    Each entry's date is parsed once. A bounded heap keeps the newest
+    ``limit`` entries of every feed, and a k-way merge of those runs yields
+    the overall newest entries without sorting everything.
+
+    Args:
+        feeds (list): One list (or iterable) of feed entries per feed
+        limit (int): Number of entries to return
+
+    Returns:
+        list: Up to limit entries, most recent first. Ties keep feed order.
+    """
+    runs = []
+    for entries in feeds:
+        dated = ((entry_timestamp(entry), entry) for entry in entries)
+        runs.append(heapq.nlargest(limit, dated, key=lambda item: item[0]))
+    merged = heapq.merge(*runs, key=lambda item: item[0], reverse=True)
+    return [entry for _, entry in itertools.islice(merged, limit)]
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+AWS Learning Assistant - HTML to Text
+------------------------------------
+This module turns feed summaries into plain text. The fast path is a
+streaming extractor on top of the standard library HTML parser that
+produces the same text as BeautifulSoup's get_text() without building a
+document tree. Input the fast path cannot handle exactly (unknown
+entities, invalid character references, parser errors) falls back to
+BeautifulSoup.
+"""
+
+from html.entities import html5
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup
+
+# Tags whose contents BeautifulSoup leaves out of get_text()
+HIDDEN_TAGS = {"script", "style"}
+# Tags inside which BeautifulSoup keeps whitespace as is; left to the fallback
+PRESERVE_WHITESPACE_TAGS = {"pre", "textarea"}
+# Void elements; a stray end tag for one of these is left to the fallback
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+
+class _Fallback(Exception):
+    """Raised when the fast path cannot match BeautifulSoup's output."""
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.parts = []
+        self.run = []
+        self.hidden = 0
+
+    def flush(self):
+        """End the current run of text, collapsing it like BeautifulSoup does."""
+        if not self.run:
+            return
+        text = "".join(self.run)
+        self.run = []
+        if self.hidden:
+            return
+        if not text.strip(ASCII_SPACES):
+            text = "\n" if "\n" in text else " "
+        self.parts.append(text)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in PRESERVE_WHITESPACE_TAGS:
+            raise _Fallback(tag)
+        self.flush()
+        if tag in HIDDEN_TAGS:
+            self.hidden += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.flush()
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS:
+            raise _Fallback(tag)
+        self.flush()
+        if tag in HIDDEN_TAGS and self.hidden:
+            self.hidden -= 1
+
+    def handle_data(self, data):
+        self.run.append(data)
+
+    def handle_entityref(self, name):
+        character = html5.get(name + ";")
+        if character is None:
+            raise _Fallback(name)
+        self.run.append(character)
+
+    def handle_charref(self, name):
+        try:
+            codepoint = int(name[1:], 16) if name[:1] in ("x", "X") else int(name)
+            if codepoint < 256:
+                character = bytes([codepoint]).decode("windows-1252")
+            else:
+                character = chr(codepoint)
+        except (ValueError, OverflowError, UnicodeDecodeError):
+            raise _Fallback(name)
+        self.run.append(character)
+
+    def handle_comment(self, data):
+        self.flush()
+
+    def handle_decl(self, decl):
+        self.flush()
+
+    def handle_pi(self, data):
+        self.flush()
+
+    def unknown_decl(self, data):
+        self.flush()
+        if data.startswith("CDATA["):
+            self.run.append(data[len("CDATA["):])
+            self.flush()
+
+
+def html_to_text(markup):
+    """
+    Extract the text content of an HTML fragment.
+
+    Args:
+        markup (str): The HTML to convert
+
+    Returns:
+        str: The text, identical to BeautifulSoup(markup, "html.parser").get_text()
+    """
+    if "<" not in markup and "&" not in markup and markup.strip(ASCII_SPACES):
+        return markup
+
+    extractor = _TextExtractor()
+    try:
+        extractor.feed(markup)
+        extractor.close()
+        extractor.flush()
+    except Exception:
+        return BeautifulSoup(markup, "html.parser").get_text()
+    return "".join(extractor.parts)
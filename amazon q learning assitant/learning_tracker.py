@@ -7,203 +7,316 @@ This module tracks learning progress, including:
 - Quiz questions answered
 - Correct answers
 - Learning streak
+
+Each learner gets their own tracker; TrackerPool hands them out from
+per-user storage shards.
 """
 
+import atexit
+import contextlib
 import json
 import os
 import datetime
-from collections import defaultdict
+import hashlib
+import heapq
+import re
+import threading
+import time
+import weakref
+from collections import OrderedDict, defaultdict
+
+from topic_matcher import get_topic_matcher
+from tracker_storage import open_store
+
+# Storage backend: "json" (one document), "eventlog" (append-only log + snapshots)
+# or "sqlite" (indexed tables queried with SQL aggregates)
+TRACKER_STORAGE = os.getenv("TRACKER_STORAGE", "json")
+# Per-user stats live in shards under this directory
+TRACKER_SHARD_DIR = os.getenv("TRACKER_SHARD_DIR", "learning_stats")
+# Number of user trackers kept loaded in memory
+TRACKER_CACHE_SIZE = int(os.getenv("TRACKER_CACHE_SIZE", "256"))
+DEFAULT_USER = "default"
+# Seconds the web interface buffers tracker writes before flushing them
+# in the background (0 writes every change through immediately)
+TRACKER_FLUSH_INTERVAL = float(os.getenv("TRACKER_FLUSH_INTERVAL", "0"))
+# Related topics recommended even before they show up together in titles
+CURATED_RELATED_TOPICS = {
+    "EC2": ["EBS", "Auto Scaling", "VPC"],
+    "S3": ["CloudFront", "Glacier", "Storage Gateway"],
+    "Lambda": ["API Gateway", "Step Functions", "EventBridge"],
+    "DynamoDB": ["DAX", "DocumentDB", "AppSync"],
+    "RDS": ["Aurora", "Neptune", "Redshift"],
+    "ECS": ["EKS", "Fargate", "ECR"],
+    "SageMaker": ["Comprehend", "Rekognition", "Forecast"],
+    "CloudFormation": ["CDK", "SAM", "Service Catalog"],
+}
+# Score of a curated relation, in title co-occurrences
+CURATED_WEIGHT = 1
+
+# Write-behind trackers with changes not written yet, flushed when the
+# interpreter exits. Held strongly, so a tracker its last user dropped
+# (say, after the pool evicted it) keeps its changes until they are written
+_unflushed_trackers = set()
+
+
+@atexit.register
+def _flush_unflushed_trackers():
+    for tracker in list(_unflushed_trackers):
+        tracker.flush()
+
+
+def _run_flusher(pool_ref, interval):
+    """Flush a pool's write-behind trackers every interval seconds until the pool is collected."""
+    while True:
+        time.sleep(interval)
+        pool = pool_ref()
+        if pool is None:
+            return
+        pool.flush_write_behind()
+        del pool
+
 
 class LearningTracker:
-    def __init__(self, stats_file='learning_stats.json'):
+    def __init__(self, stats_file='learning_stats.json', storage=None, store=None, topic_matcher=None,
+                 write_behind=False):
         self.stats_file = stats_file
-        self.stats = self._load_stats()
+        self.store = store or open_store(storage or TRACKER_STORAGE, stats_file)
+        self.topic_matcher = topic_matcher or get_topic_matcher()
+        # Serializes writes to this tracker only; other users' trackers are independent
+        self._lock = threading.RLock()
+        # Events not written to the store yet (inside a batch or write-behind)
+        self._pending = []
+        self._batch_depth = 0
+        # Buffer every change until flush(); TrackerPool flushes its trackers periodically
+        self.write_behind = write_behind
+    
+    @property
+    def stats(self):
+        """
+        The current stats document.
+        
+        Write-behind changes are flushed first, so they are included; inside
+        a batch the stats are the stored ones until the batch ends.
+        """
+        self.flush()
+        return self.store.get_stats()
+    
+    def _today(self):
+        return datetime.datetime.now().strftime("%Y-%m-%d")
+    
+    def _record(self, event):
+        """Apply an event to the stats and persist it (or buffer it)."""
+        with self._lock:
+            if self._batch_depth or self.write_behind:
+                self._pending.append(event)
+                if self.write_behind:
+                    _unflushed_trackers.add(self)
+            else:
+                self.store.record([event])
+    
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Buffer the changes made inside the block and write them once at the end.
         
-    def _load_stats(self):
-        """Load stats from file or create default stats."""
+        Batches can be nested; the outermost one flushes. Other threads
+        recording into this tracker meanwhile are added to the same batch.
+        """
+        with self._lock:
+            self._batch_depth += 1
         try:
-            with open(self.stats_file, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            # Create default stats
-            return {
-                "total_updates": 0,
-                "quizzes_answered": 0,
-                "correct_answers": 0,
-                "streak": 0,
-                "last_activity_date": None,
-                "topics": {},
-                "daily_activity": {},
-                "quiz_history": []
-            }
-    
-    def _save_stats(self):
-        """Save stats to file."""
-        with open(self.stats_file, 'w') as f:
-            json.dump(self.stats, f, indent=2)
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self.flush()
+    
+    def flush(self):
+        """Write the buffered changes to the store."""
+        with self._lock:
+            if self._batch_depth or not self._pending:
+                return
+            events, self._pending = self._pending, []
+            try:
+                self.store.record(events)
+            except Exception:
+                # Keep the events so the next flush retries them
+                self._pending[:0] = events
+                raise
+            _unflushed_trackers.discard(self)
+    
+    def close(self):
+        """Write the buffered changes and close the store."""
+        with self._lock:
+            self._batch_depth = 0
+            self.flush()
+            self.store.close()
     
     def record_update_read(self, update):
         """Record that an update was read."""
-        self.stats["total_updates"] += 1
-        
-        # Extract topics from the update title and add to topics dictionary
-        topics = self._extract_topics(update["title"])
-        for topic in topics:
-            if topic in self.stats["topics"]:
-                self.stats["topics"][topic] += 1
-            else:
-                self.stats["topics"][topic] = 1
-        
-        # Update daily activity
-        today = datetime.datetime.now().strftime("%Y-%m-%d")
-        if today in self.stats["daily_activity"]:
-            self.stats["daily_activity"][today]["updates_read"] += 1
-        else:
-            self.stats["daily_activity"][today] = {
-                "updates_read": 1,
-                "quizzes_answered": 0,
-                "correct_answers": 0
-            }
-        
-        # Update streak
-        self._update_streak()
-        
-        # Save stats
-        self._save_stats()
+        self._record({
+            "type": "update_read",
+            "date": self._today(),
+            "title": update["title"],
+            # Extract topics from the update title
+            "topics": self._extract_topics(update["title"]),
+        })
     
     def record_quiz_answer(self, quiz_question, user_answer, is_correct):
         """Record a quiz answer."""
-        self.stats["quizzes_answered"] += 1
-        if is_correct:
-            self.stats["correct_answers"] += 1
-        
-        # Update daily activity
-        today = datetime.datetime.now().strftime("%Y-%m-%d")
-        if today in self.stats["daily_activity"]:
-            self.stats["daily_activity"][today]["quizzes_answered"] += 1
-            if is_correct:
-                self.stats["daily_activity"][today]["correct_answers"] += 1
-        else:
-            self.stats["daily_activity"][today] = {
-                "updates_read": 0,
-                "quizzes_answered": 1,
-                "correct_answers": 1 if is_correct else 0
-            }
-        
-        # Add to quiz history
-        self.stats["quiz_history"].append({
-            "date": today,
+        self._record({
+            "type": "quiz_answer",
+            "date": self._today(),
             "question": quiz_question["question"],
             "user_answer": user_answer,
             "correct_answer": quiz_question["correct_answer"],
-            "is_correct": is_correct
+            "is_correct": is_correct,
         })
-        
-        # Update streak
-        self._update_streak()
-        
-        # Save stats
-        self._save_stats()
     
-    def _update_streak(self):
-        """Update the learning streak."""
-        today = datetime.datetime.now().strftime("%Y-%m-%d")
-        last_date = self.stats["last_activity_date"]
-        
-        if last_date is None:
-            # First activity
-            self.stats["streak"] = 1
-        else:
-            # Convert string dates to datetime objects
-            today_dt = datetime.datetime.strptime(today, "%Y-%m-%d")
-            last_dt = datetime.datetime.strptime(last_date, "%Y-%m-%d")
-            
-            # Calculate the difference in days
-            diff = (today_dt - last_dt).days
-            
-            if diff == 0:
-                # Same day, streak unchanged
-                pass
-            elif diff == 1:
-                # Consecutive day, increment streak
-                self.stats["streak"] += 1
-            else:
-                # Streak broken
-                self.stats["streak"] = 1
-        
-        # Update last activity date
-        self.stats["last_activity_date"] = today
+    def record_updates_read(self, updates):
+        """Record several updates as read with a single write."""
+        with self.batch():
+            for update in updates:
+                self.record_update_read(update)
     
     def _extract_topics(self, title):
         """Extract AWS service topics from the title."""
-        # List of common AWS services to look for
-        aws_services = [
-            "EC2", "S3", "Lambda", "DynamoDB", "RDS", "Aurora", "ECS", "EKS",
-            "Fargate", "SQS", "SNS", "CloudFormation", "CloudWatch", "IAM",
-            "Cognito", "API Gateway", "Step Functions", "Kinesis", "Glue",
-            "Athena", "Redshift", "EMR", "SageMaker", "Comprehend", "Rekognition",
-            "Polly", "Lex", "Bedrock", "CodeBuild", "CodePipeline", "CodeDeploy",
-            "CloudFront", "Route 53", "VPC", "ELB", "ALB", "NLB", "WAF", "Shield",
-            "GuardDuty", "Security Hub", "CloudTrail", "Config", "Secrets Manager",
-            "KMS", "ACM", "Lake Formation", "EventBridge", "AppSync", "Amplify"
-        ]
-        
-        # Find all AWS services mentioned in the title
-        topics = []
-        for service in aws_services:
-            if service.lower() in title.lower():
-                topics.append(service)
-        
-        # If no specific services found, use general categories
-        if not topics:
-            if "serverless" in title.lower():
-                topics.append("Serverless")
-            elif "container" in title.lower():
-                topics.append("Containers")
-            elif "machine learning" in title.lower() or "ml" in title.lower():
-                topics.append("Machine Learning")
-            elif "database" in title.lower() or "db" in title.lower():
-                topics.append("Databases")
-            elif "security" in title.lower():
-                topics.append("Security")
-            else:
-                topics.append("General")
-        
-        return topics
+        return self.topic_matcher.match(title)
     
     def get_stats(self):
         """Get the current stats."""
         return self.stats
     
-    def get_topic_recommendations(self):
-        """Get topic recommendations based on learning history."""
-        if not self.stats["topics"]:
+    def get_topic_recommendations(self, limit=3):
+        """
+        Get topic recommendations based on learning history.
+        
+        Topics related to the most studied ones are scored by how often they
+        appeared together in update titles, plus a small prior for curated
+        relations, and returned best first (ties by name).
+        """
+        self.flush()
+        # Find the most studied topics; both lookups are precomputed by the store
+        top = self.store.top_topics(3)
+        if not top:
             return ["EC2", "S3", "Lambda"]  # Default recommendations
         
-        # Find the most studied topics
-        sorted_topics = sorted(self.stats["topics"].items(), key=lambda x: x[1], reverse=True)
-        most_studied = [topic for topic, count in sorted_topics[:3]]
+        most_studied = [topic for topic, count in top]
+        scores = defaultdict(float)
+        for topic, neighbours in self.store.related_topics(most_studied).items():
+            for other, weight in neighbours.items():
+                scores[other] += weight
+            for other in CURATED_RELATED_TOPICS.get(topic, ()):
+                scores[other] += CURATED_WEIGHT
+        for topic in most_studied:
+            scores.pop(topic, None)
+        
+        best = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [topic for topic, score in best]
+
+class TrackerPool:
+    """
+    Hand out one LearningTracker per user.
+    
+    Each user's stats are stored in their own file, spread over 256 shard
+    directories so no directory grows too large. Trackers are loaded lazily
+    on first use and the most recently used ones are kept in an LRU cache.
+    Loading and writing happen outside the pool lock, so one user's
+    activity never waits on another's.
+    
+    The default user keeps using the original single-user stats file.
+    
+    With flush_interval set, trackers buffer their changes and one
+    background thread per pool writes them every flush_interval seconds.
+    """
+    
+    def __init__(self, shard_dir=None, max_trackers=None, storage=None,
+                 default_stats_file='learning_stats.json', flush_interval=0):
+        self.shard_dir = shard_dir or TRACKER_SHARD_DIR
+        self.max_trackers = max_trackers or TRACKER_CACHE_SIZE
+        self.storage = storage
+        self.default_stats_file = default_stats_file
+        self.flush_interval = flush_interval
+        self._trackers = OrderedDict()
+        self._lock = threading.Lock()
+        # Write-behind trackers still in use or with unwritten changes,
+        # including ones evicted from the LRU
+        self._write_behind = weakref.WeakSet()
+        self._flusher = None
+        if flush_interval:
+            self._flusher = threading.Thread(
+                target=_run_flusher,
+                args=(weakref.ref(self), flush_interval),
+                name="tracker-flusher",
+                daemon=True,
+            )
+            self._flusher.start()
+    
+    def stats_file_for(self, user_id):
+        """Return the stats file of a user."""
+        if user_id == DEFAULT_USER:
+            return self.default_stats_file
+        digest = hashlib.sha1(user_id.encode("utf-8")).hexdigest()
+        # Keep file names readable but safe; the digest keeps them unique
+        safe_id = re.sub(r"[^A-Za-z0-9_.-]", "_", user_id)[:40]
+        return os.path.join(self.shard_dir, digest[:2], f"{safe_id}-{digest[:12]}.json")
+    
+    def get(self, user_id=DEFAULT_USER):
+        """Return the tracker of a user, loading it on first use."""
+        with self._lock:
+            tracker = self._trackers.get(user_id)
+            if tracker is not None:
+                self._trackers.move_to_end(user_id)
+                return tracker
         
-        # Find related topics to recommend
-        related_topics = {
-            "EC2": ["EBS", "Auto Scaling", "VPC"],
-            "S3": ["CloudFront", "Glacier", "Storage Gateway"],
-            "Lambda": ["API Gateway", "Step Functions", "EventBridge"],
-            "DynamoDB": ["DAX", "DocumentDB", "AppSync"],
-            "RDS": ["Aurora", "Neptune", "Redshift"],
-            "ECS": ["EKS", "Fargate", "ECR"],
-            "SageMaker": ["Comprehend", "Rekognition", "Forecast"],
-            "CloudFormation": ["CDK", "SAM", "Service Catalog"],
-            # Add more related topics as needed
-        }
+        stats_file = self.stats_file_for(user_id)
+        os.makedirs(os.path.dirname(stats_file) or ".", exist_ok=True)
+        loaded = LearningTracker(stats_file, storage=self.storage, write_behind=bool(self.flush_interval))
         
-        recommendations = []
-        for topic in most_studied:
-            if topic in related_topics:
-                recommendations.extend(related_topics[topic])
+        evicted = []
+        with self._lock:
+            # Another request may have loaded the same user in the meantime
+            tracker = self._trackers.setdefault(user_id, loaded)
+            self._trackers.move_to_end(user_id)
+            while len(self._trackers) > self.max_trackers:
+                # Evicted trackers are not closed: a request may still be using
+                # one, and its store is released once it is garbage collected
+                evicted.append(self._trackers.popitem(last=False)[1])
+            if tracker is loaded and loaded.write_behind:
+                self._write_behind.add(loaded)
+        if tracker is not loaded:
+            # Lost the race: release the duplicate's store
+            loaded.close()
+        for old in evicted:
+            old.flush()
+        return tracker
+    
+    def flush(self):
+        """Write the buffered changes of all loaded trackers."""
+        with self._lock:
+            trackers = list(self._trackers.values())
+        for tracker in trackers:
+            tracker.flush()
+    
+    def flush_write_behind(self):
+        """
+        Write the buffered changes of the pool's write-behind trackers.
         
-        # Return unique recommendations
-        return list(set(recommendations))[:3]
+        Errors are logged rather than raised: the failed tracker keeps its
+        events for the next flush and the other trackers are still written.
+        """
+        with self._lock:
+            trackers = list(self._write_behind)
+        for tracker in trackers:
+            try:
+                tracker.flush()
+            except Exception as e:
+                print(f"Error writing learning stats to {tracker.stats_file}: {e}")
+    
+    def __len__(self):
+        with self._lock:
+            return len(self._trackers)
 
 # Example usage
 if __name__ == "__main__":
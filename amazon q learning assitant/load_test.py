@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+AWS Learning Assistant - Web Load Test
+-------------------------------------
+Sends requests to a running web interface from several concurrent
+clients for a fixed time and reports requests per second and latency
+percentiles. Start the server first, e.g.:
+
+    gunicorn --workers 4 --bind 127.0.0.1:5000 wsgi:app
+
+Usage:
+    python load_test.py [--url http://127.0.0.1:5000/] [--concurrency 16] [--duration 10]
+"""
+
+import argparse
+import threading
+import time
+
+import requests
+
+
+def run_client(url, deadline, latencies, errors, lock):
+    """Request url in a loop until the deadline, recording each latency."""
+    session = requests.Session()
+    local_latencies = []
+    local_errors = 0
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = session.get(url, timeout=10)
+            if response.status_code >= 400:
+                local_errors += 1
+        except requests.RequestException:
+            local_errors += 1
+        local_latencies.append(time.perf_counter() - started)
+    with lock:
+        latencies.extend(local_latencies)
+        errors.append(local_errors)
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:5000/")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    started = time.perf_counter()
+    deadline = started + args.duration
+    clients = [
+        threading.Thread(target=run_client, args=(args.url, deadline, latencies, errors, lock))
+        for _ in range(args.concurrency)
+    ]
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    elapsed = time.perf_counter() - started
+
+    if not latencies:
+        print("No requests completed.")
+        return
+    latencies.sort()
+    print(f"requests:    {len(latencies)} ({sum(errors)} errors) in {elapsed:.1f} s")
+    print(f"throughput:  {len(latencies) / elapsed:.1f} requests/s")
+    print(f"latency:     p50 {percentile(latencies, 0.50) * 1000:.1f} ms, "
+          f"p90 {percentile(latencies, 0.90) * 1000:.1f} ms, p99 {percentile(latencies, 0.99) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
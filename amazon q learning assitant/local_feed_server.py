@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+AWS Learning Assistant - Local Feed Server
+-----------------------------------------
+A small HTTP server that stands in for the AWS RSS feeds during tests
+and local experiments. Each path serves a canned RSS document and can be
+made slow or broken to exercise timeouts and partial failures.
+"""
+
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.sax.saxutils import escape
+
+
+def make_rss(items, title="Local AWS Feed"):
+    """
+    Build an RSS 2.0 document.
+
+    Args:
+        items (list): Dicts with title, link, summary and an optional
+            published timestamp (seconds since the epoch)
+        title (str): The channel title
+
+    Returns:
+        bytes: The encoded RSS document
+    """
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<rss version="2.0"><channel>',
+        f"<title>{escape(title)}</title>",
+        "<link>http://localhost/</link>",
+        "<description>Local stand-in feed</description>",
+    ]
+    for item in items:
+        parts.append("<item>")
+        parts.append(f"<title>{escape(item['title'])}</title>")
+        parts.append(f"<link>{escape(item['link'])}</link>")
+        parts.append(f"<guid>{escape(item.get('guid', item['link']))}</guid>")
+        parts.append(f"<description>{escape(item.get('summary', ''))}</description>")
+        if "published" in item:
+            parts.append(f"<pubDate>{formatdate(item['published'], usegmt=True)}</pubDate>")
+        parts.append("</item>")
+    parts.append("</channel></rss>")
+    return "\n".join(parts).encode("utf-8")
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        route = self.server.routes.get(self.path)
+        self.server.requests.append((self.path, dict(self.headers)))
+        if route is None:
+            self.send_error(404)
+            return
+
+        time.sleep(route.get("delay", 0))
+        status = route.get("status", 200)
+        if status != 200:
+            self.send_error(status)
+            return
+
+        etag = route.get("etag")
+        last_modified = route.get("last_modified")
+        if (etag and self.headers.get("If-None-Match") == etag) or (
+            last_modified and self.headers.get("If-Modified-Since") == last_modified
+        ):
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = route.get("body", b"")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+        if etag:
+            self.send_header("ETag", etag)
+        if last_modified:
+            self.send_header("Last-Modified", last_modified)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalFeedServer:
+    """
+    Serve canned feeds on an ephemeral localhost port.
+
+    Routes map a path to a dict with the response body and optional
+    ``delay`` (seconds), ``status``, ``etag`` and ``last_modified`` keys.
+    Routes with validators answer matching conditional requests with a 304.
+    Use it as a context manager:
+
+        with LocalFeedServer({"/feed": {"body": make_rss(items)}}) as server:
+            fetch_feeds([server.url("/feed")])
+    """
+
+    def __init__(self, routes=None):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _FeedHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.routes = dict(routes or {})
+        self.httpd.requests = []
+        self._thread = None
+
+    @property
+    def routes(self):
+        return self.httpd.routes
+
+    @property
+    def requests(self):
+        """(path, headers) pairs requested so far, in arrival order."""
+        return self.httpd.requests
+
+    def url(self, path):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    sample = make_rss([
+        {
+            "title": "Amazon S3 adds a new storage class",
+            "link": "https://aws.amazon.com/about-aws/whats-new/sample-s3/",
+            "summary": "<p>Amazon S3 now offers a <b>new</b> storage class.</p>",
+            "published": time.time(),
+        }
+    ])
+    server = LocalFeedServer({"/feed/": {"body": sample}}).start()
+    print(f"Serving a sample feed at {server.url('/feed/')} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+AWS Learning Assistant - Quiz Parser
+-----------------------------------
+This module turns model replies into validated quiz questions. It finds
+the first balanced JSON value in a single pass, tolerates the comments
+and trailing commas models like to add, checks the result against the
+quiz schema and repairs the fields that can be derived from the others.
+Only the fields that are still invalid need to be asked for again.
+"""
+
+import json
+import re
+
+OPTION_COUNT = 4
+QUIZ_FIELDS = ("question", "options", "correct_index", "correct_answer")
+
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+
+
+def extract_json(text, opening="{"):
+    """
+    Find the first balanced JSON object (or array) in text.
+
+    Args:
+        text (str): The model reply
+        opening (str): "{" for an object, "[" for an array
+
+    Returns:
+        str: The JSON fragment, or None if there is no balanced one
+    """
+    closing = "}" if opening == "{" else "]"
+    start = text.find(opening)
+    while start != -1:
+        depth = 0
+        in_string = False
+        escaped = False
+        for i in range(start, len(text)):
+            char = text[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in "{[":
+                depth += 1
+            elif char in "}]":
+                depth -= 1
+                if depth == 0:
+                    if char == closing:
+                        return text[start:i + 1]
+                    break
+        start = text.find(opening, start + 1)
+    return None
+
+
+def _strip_comments(fragment):
+    """Remove // and /* */ comments that are outside of strings."""
+    out = []
+    i = 0
+    in_string = False
+    while i < len(fragment):
+        char = fragment[i]
+        if in_string:
+            out.append(char)
+            if char == "\\" and i + 1 < len(fragment):
+                out.append(fragment[i + 1])
+                i += 1
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+            out.append(char)
+        elif fragment.startswith("//", i):
+            end = fragment.find("\n", i)
+            i = len(fragment) if end == -1 else end
+            continue
+        elif fragment.startswith("/*", i):
+            end = fragment.find("*/", i + 2)
+            i = len(fragment) if end == -1 else end + 2
+            continue
+        else:
+            out.append(char)
+        i += 1
+    return "".join(out)
+
+
+def loads_lenient(fragment):
+    """
+    Parse a JSON fragment, repairing comments and trailing commas if needed.
+
+    Returns:
+        The parsed value, or None if it cannot be parsed
+    """
+    try:
+        return json.loads(fragment)
+    except json.JSONDecodeError:
+        pass
+    try:
+        return json.loads(_TRAILING_COMMA.sub(r"\1", _strip_comments(fragment)))
+    except json.JSONDecodeError:
+        return None
+
+
+def parse_json(text, opening="{"):
+    """Return the first JSON object (or array) in text, or None."""
+    fragment = extract_json(text, opening)
+    return loads_lenient(fragment) if fragment else None
+
+
+def _as_index(value, options):
+    """Interpret an index given as an int, a digit string or an option letter."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value if 0 <= value < len(options) else None
+    if isinstance(value, str):
+        value = value.strip().rstrip(".)")
+        if value.isdigit():
+            return _as_index(int(value), options)
+        if len(value) == 1 and value.upper() in "ABCD"[:len(options)]:
+            return "ABCD".index(value.upper())
+    return None
+
+
+def invalid_fields(quiz):
+    """
+    Check a quiz question against the schema.
+
+    Returns:
+        list: The names of the fields that are missing or invalid
+    """
+    invalid = []
+    question = quiz.get("question")
+    if not isinstance(question, str) or not question.strip():
+        invalid.append("question")
+
+    options = quiz.get("options")
+    options_valid = (
+        isinstance(options, list)
+        and len(options) == OPTION_COUNT
+        and all(isinstance(o, str) and o.strip() for o in options)
+        and len(set(options)) == OPTION_COUNT
+    )
+    if not options_valid:
+        invalid.append("options")
+
+    index = quiz.get("correct_index")
+    if not (isinstance(index, int) and not isinstance(index, bool) and 0 <= index < OPTION_COUNT):
+        invalid.append("correct_index")
+    if not options_valid or "correct_index" in invalid or quiz.get("correct_answer") != options[index]:
+        invalid.append("correct_answer")
+    return invalid
+
+
+def repair_quiz(quiz):
+    """
+    Fix the quiz fields that can be derived from the others.
+
+    The correct index and answer are derived from each other, indexes given
+    as strings or letters are converted, and whitespace is trimmed.
+
+    Args:
+        quiz (dict): A parsed quiz question (modified in place)
+
+    Returns:
+        list: The fields that are still invalid after repair
+    """
+    if isinstance(quiz.get("question"), str):
+        quiz["question"] = quiz["question"].strip()
+    options = quiz.get("options")
+    if isinstance(options, list):
+        quiz["options"] = options = [o.strip() if isinstance(o, str) else o for o in options]
+
+    invalid = invalid_fields(quiz)
+    if "options" in invalid:
+        return invalid
+
+    answer = quiz.get("correct_answer")
+    answer = answer.strip() if isinstance(answer, str) else answer
+    index = _as_index(quiz.get("correct_index"), options)
+    answer_index = options.index(answer) if answer in options else _as_index(answer, options)
+
+    if index is not None and (answer_index is None or answer_index == index):
+        quiz["correct_index"] = index
+    elif index is None and answer_index is not None:
+        quiz["correct_index"] = answer_index
+    elif index is not None and answer_index is not None:
+        # Index and answer disagree; the answer text is what the model wrote out
+        quiz["correct_index"] = answer_index
+    if "correct_index" in quiz and _as_index(quiz["correct_index"], options) is not None:
+        quiz["correct_answer"] = options[quiz["correct_index"]]
+    return invalid_fields(quiz)
+
+
+def parse_quiz(text):
+    """
+    Parse and repair a quiz question from a model reply.
+
+    Args:
+        text (str): The model reply
+
+    Returns:
+        tuple: The quiz dict ({} if nothing could be parsed) and the list
+        of fields that are still invalid
+    """
+    quiz = parse_json(text)
+    if not isinstance(quiz, dict):
+        return {}, list(QUIZ_FIELDS)
+    return quiz, repair_quiz(quiz)
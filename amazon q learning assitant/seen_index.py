@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+AWS Learning Assistant - Seen Entries Index
+------------------------------------------
+This module remembers which feed entries have already been processed.
+Entries are keyed by their GUID (or link) plus a hash of their content,
+so an unchanged entry is served from the stored results instead of being
+parsed, summarized with Bedrock and tracked again on every run.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import tempfile
+
+
+def entry_key(entry):
+    """Return the stable key of a feed entry (its GUID, falling back to the link)."""
+    return entry.get("id") or entry.get("link")
+
+
+def content_hash(*parts):
+    """Hash the given text parts into a short, stable fingerprint."""
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update((part or "").encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class SeenIndex:
+    """A persistent record of processed entries and their stored results."""
+
+    def __init__(self, index_file='seen_entries.json'):
+        self.index_file = index_file
+        self.records = self._load()
+        self._by_link = {r["content"]["link"]: key for key, r in self.records.items() if r.get("content")}
+        self._dirty = False
+
+    def _load(self):
+        """Load the index from file or start an empty one."""
+        try:
+            with open(self.index_file, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def save(self, max_age_days=90):
+        """Drop records not seen for max_age_days and write the index to file."""
+        cutoff = (datetime.date.today() - datetime.timedelta(days=max_age_days)).isoformat()
+        stale = [key for key, record in self.records.items() if record["last_seen"] < cutoff]
+        for key in stale:
+            del self.records[key]
+        if not (self._dirty or stale):
+            return
+
+        directory = os.path.dirname(os.path.abspath(self.index_file))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self.records, f)
+        os.replace(tmp_path, self.index_file)
+        self._dirty = False
+
+    def _record_for_update(self, update):
+        key = self._by_link.get(update["link"])
+        return self.records.get(key) if key else None
+
+    def get_content(self, entry):
+        """
+        Return the stored extracted content for an unchanged entry.
+
+        Args:
+            entry: A feed entry
+
+        Returns:
+            dict: The content stored by add_content, or None if the entry
+            is new or has changed since it was stored
+        """
+        record = self.records.get(entry_key(entry))
+        fingerprint = content_hash(entry.get("title"), entry.get("summary"), entry.get("published"))
+        if record is None or record["hash"] != fingerprint:
+            return None
+        today = datetime.date.today().isoformat()
+        if record["last_seen"] != today:
+            record["last_seen"] = today
+            self._dirty = True
+        return record["content"]
+
+    def add_content(self, entry, content):
+        """Store the extracted content of a new or changed entry."""
+        key = entry_key(entry)
+        self.records[key] = {
+            "hash": content_hash(entry.get("title"), entry.get("summary"), entry.get("published")),
+            "content": content,
+            "summary": None,
+            "tracked": False,
+            "last_seen": datetime.date.today().isoformat(),
+        }
+        self._by_link[content["link"]] = key
+        self._dirty = True
+
+    def get_summary(self, update):
+        """Return the stored generated summary for an update, if any."""
+        record = self._record_for_update(update)
+        if record and record["summary"] and record["content"]["summary"] == update["summary"]:
+            return record["summary"]
+        return None
+
+    def set_summary(self, update, summary):
+        """Store the generated summary for an update."""
+        record = self._record_for_update(update)
+        if record and record["content"]["summary"] == update["summary"]:
+            record["summary"] = summary
+            self._dirty = True
+
+    def mark_tracked(self, update):
+        """
+        Mark an update as recorded in the learning tracker.
+
+        Returns:
+            bool: True if the update had not been tracked before
+        """
+        record = self._record_for_update(update)
+        if record is None:
+            return True
+        if record["tracked"]:
+            return False
+        record["tracked"] = True
+        self._dirty = True
+        return True
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+AWS Learning Assistant - Static Site Export
+------------------------------------------
+This module pre-renders the daily archive into static files that nginx,
+S3 or any other static hosting can serve without running Flask:
+
+    <out>/index.html            archive index, most recent day first
+    <out>/dates.json            the available dates
+    <out>/days/<date>.html      a day's summaries and quiz questions
+    <out>/days/<date>.json      the same day as JSON
+    <out>/manifest.json         source hash of every exported day
+
+Exports are incremental. A day is only rendered again when the hash of
+its document (or of the template) differs from the one in the manifest,
+days removed from the store are removed from the site, and files whose
+content did not change are not rewritten, so their modification times
+stay put for rsync or S3 sync. The days that do need rendering are
+rendered in parallel worker processes.
+
+Usage:
+    python static_export.py [--out site] [--db aws_learning.sqlite3] [--jobs N] [--force]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from content_store import ContentStore
+from web_interface import chr_filter
+
+STATIC_SITE_DIR = os.getenv("STATIC_SITE_DIR")
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+TEMPLATE_NAME = "index.html"
+MANIFEST_NAME = "manifest.json"
+# Bump when the export layout changes so every day is rendered again
+EXPORT_VERSION = 1
+
+
+def encode_json(data):
+    """Serialize data the same way every time, so equal content gives equal bytes."""
+    return json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def source_hash(document):
+    return hashlib.sha256(encode_json(document)).hexdigest()
+
+
+def renderer_hash():
+    """Hash of everything besides the document that affects a day's pages."""
+    with open(os.path.join(TEMPLATE_DIR, TEMPLATE_NAME), "rb") as f:
+        return hashlib.sha256(f.read() + str(EXPORT_VERSION).encode("ascii")).hexdigest()
+
+
+_environment = None
+
+
+def _template():
+    """Return the page template, loading it once per process."""
+    global _environment
+    if _environment is None:
+        _environment = Environment(loader=FileSystemLoader(TEMPLATE_DIR), autoescape=select_autoescape(["html"]))
+        _environment.filters["chr"] = chr_filter
+    return _environment.get_template(TEMPLATE_NAME)
+
+
+def render_index(dates):
+    return _template().render(static_site=True, available_dates=dates, archive=True).encode("utf-8")
+
+
+def render_day(date, document):
+    return _template().render(static_site=True, selected_date=date, content=document).encode("utf-8")
+
+
+def write_file(path, data):
+    """
+    Write data to path atomically, unless the file already has that content.
+
+    Returns:
+        bool: Whether the file was written
+    """
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # mkstemp creates files only the owner can read; the web server must read them
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return True
+
+
+def export_day(out_dir, date, document):
+    """Render and write the HTML and JSON pages of one day."""
+    days_dir = os.path.join(out_dir, "days")
+    write_file(os.path.join(days_dir, f"{date}.html"), render_day(date, document))
+    write_file(os.path.join(days_dir, f"{date}.json"), encode_json(document))
+    return date
+
+
+def _export_day_job(job):
+    return export_day(*job)
+
+
+def _read_manifest(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def export_site(store, out_dir=None, jobs=None, force=False):
+    """
+    Export every day in a content store into a static site.
+
+    Args:
+        store (ContentStore): Where the days are read from
+        out_dir (str): The site directory (default: STATIC_SITE_DIR or "site")
+        jobs (int): Worker processes for rendering (default: one per CPU);
+            1 renders in this process
+        force (bool): Render every day, even if its source is unchanged
+
+    Returns:
+        dict: The dates "rendered", "unchanged" and "removed"
+    """
+    out_dir = out_dir or STATIC_SITE_DIR or "site"
+    days_dir = os.path.join(out_dir, "days")
+    os.makedirs(days_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+
+    manifest = _read_manifest(manifest_path)
+    renderer = renderer_hash()
+    previous = manifest.get("days", {}) if manifest.get("renderer") == renderer and not force else {}
+
+    days = store.days_between("0000-00-00", "9999-99-99")
+    hashes = {date: source_hash(document) for date, document in days}
+    stale = [
+        (out_dir, date, document) for date, document in days
+        if previous.get(date) != hashes[date]
+        or not os.path.exists(os.path.join(days_dir, f"{date}.html"))
+    ]
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(stale) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(stale))) as executor:
+            rendered = list(executor.map(_export_day_job, stale, chunksize=max(1, len(stale) // (jobs * 4))))
+    else:
+        rendered = [_export_day_job(job) for job in stale]
+
+    removed = []
+    for date in sorted(set(manifest.get("days", {})) - set(hashes)):
+        for suffix in (".html", ".json"):
+            try:
+                os.remove(os.path.join(days_dir, f"{date}{suffix}"))
+            except FileNotFoundError:
+                pass
+        removed.append(date)
+
+    dates = sorted(hashes, reverse=True)
+    write_file(os.path.join(out_dir, "index.html"), render_index(dates))
+    write_file(os.path.join(out_dir, "dates.json"), encode_json({"dates": dates}))
+    # Written last, so an interrupted export renders the missing days next time
+    write_file(manifest_path, encode_json({"renderer": renderer, "days": hashes}))
+
+    return {
+        "rendered": rendered,
+        "unchanged": sorted(set(hashes) - set(rendered)),
+        "removed": removed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the daily archive as a static site.")
+    parser.add_argument("--out", default=None, help="site directory (default: STATIC_SITE_DIR or site)")
+    parser.add_argument("--db", default=None, help="content database (default: CONTENT_DB)")
+    parser.add_argument("--jobs", type=int, default=None, help="rendering processes (default: one per CPU)")
+    parser.add_argument("--force", action="store_true", help="render every day again")
+    args = parser.parse_args()
+
+    store = ContentStore(args.db)
+    try:
+        result = export_site(store, args.out, jobs=args.jobs, force=args.force)
+    finally:
+        store.close()
+    print(f"Rendered {len(result['rendered'])} day(s), {len(result['unchanged'])} unchanged, "
+          f"{len(result['removed'])} removed")
+
+
+if __name__ == "__main__":
+    main()
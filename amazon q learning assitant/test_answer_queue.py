@@ -0,0 +1,100 @@
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from answer_queue import AnswerQueue
+from learning_tracker import LearningTracker, TrackerPool
+
+QUIZ = {"question": "What is the maximum memory for AWS Lambda?", "correct_answer": "10 GB"}
+
+
+class TestAnswerQueue(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.trackers = TrackerPool(shard_dir=self.tmpdir.name)
+
+    def answers(self, **kwargs):
+        answers = AnswerQueue(self.trackers, **kwargs)
+        self.addCleanup(answers.close)
+        return answers
+
+    def stats(self, user_id):
+        return self.trackers.get(user_id).get_stats()
+
+    def test_answers_are_recorded_in_the_background(self):
+        answers = self.answers()
+        for i in range(10):
+            answers.submit("alice", QUIZ, "10 GB", i % 2 == 0)
+        answers.submit("bob", QUIZ, "3 GB", False)
+        self.assertTrue(answers.wait_for("alice"))
+        self.assertEqual(self.stats("alice")["quizzes_answered"], 10)
+        self.assertEqual(self.stats("alice")["correct_answers"], 5)
+        self.assertTrue(answers.flush(timeout=5))
+        self.assertEqual(self.stats("bob")["quizzes_answered"], 1)
+        self.assertEqual(answers.inline, 0)
+
+    def test_waiting_answers_of_a_learner_are_written_once(self):
+        answers = self.answers()
+        tracker = self.trackers.get("alice")
+        release = threading.Event()
+        record = tracker.store.record
+        with mock.patch.object(tracker.store, "record", side_effect=lambda events: (release.wait(5), record(events))) as recorded:
+            answers.submit("alice", QUIZ, "10 GB", True)
+            # These queue up while the first answer is being written
+            for _ in range(5):
+                answers.submit("alice", QUIZ, "10 GB", True)
+            release.set()
+            answers.flush(timeout=5)
+        self.assertLessEqual(recorded.call_count, 2)
+        self.assertEqual(self.stats("alice")["quizzes_answered"], 6)
+
+    def test_full_queue_records_in_the_request(self):
+        answers = self.answers(max_pending=1)
+        release = threading.Event()
+        get = self.trackers.get
+        with mock.patch.object(self.trackers, "get", side_effect=lambda user_id: (release.wait(5), get(user_id))[1]):
+            submitters = [
+                threading.Thread(target=answers.submit, args=("alice", QUIZ, "10 GB", True)) for _ in range(3)
+            ]
+            for submitter in submitters:
+                submitter.start()
+            # With the worker stuck and one answer queued, the others cannot wait in the queue
+            deadline = time.monotonic() + 5
+            while answers.inline < 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            release.set()
+            for submitter in submitters:
+                submitter.join()
+            answers.flush(timeout=5)
+        self.assertGreaterEqual(answers.inline, 1)
+        self.assertEqual(self.stats("alice")["quizzes_answered"], 3)
+
+    def test_close_drains_the_queue(self):
+        stats_file = self.trackers.stats_file_for("carol")
+        answers = AnswerQueue(self.trackers)
+        for _ in range(20):
+            answers.submit("carol", QUIZ, "10 GB", True)
+        answers.close()
+        self.assertEqual(LearningTracker(stats_file).get_stats()["quizzes_answered"], 20)
+
+    def test_write_behind_trackers_keep_answers_buffered(self):
+        self.trackers = TrackerPool(shard_dir=self.tmpdir.name, flush_interval=600)
+        stats_file = self.trackers.stats_file_for("alice")
+        answers = self.answers()
+        answers.submit("alice", QUIZ, "10 GB", True)
+        self.assertTrue(answers.flush(timeout=5))
+        self.assertEqual(LearningTracker(stats_file).get_stats()["quizzes_answered"], 0)
+        self.assertEqual(self.stats("alice")["quizzes_answered"], 1)
+
+    def test_queue_can_be_disabled(self):
+        answers = self.answers(max_pending=0)
+        answers.submit("alice", QUIZ, "10 GB", True)
+        self.assertEqual(answers.inline, 1)
+        self.assertEqual(self.stats("alice")["quizzes_answered"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
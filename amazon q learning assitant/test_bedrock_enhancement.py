@@ -0,0 +1,261 @@
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from botocore.exceptions import ClientError
+
+import bedrock_enhancement
+from bedrock_enhancement import generate_quiz_question, generate_quiz_questions, generate_summaries
+from llm_cache import ResponseCache
+
+
+def setUpModule():
+    # Tests opt in to the response cache explicitly
+    bedrock_enhancement.set_response_cache(None)
+
+
+class StubBedrockClient:
+    """A stand-in for the bedrock-runtime client with canned completions."""
+
+    def __init__(self, delay=0.0, throttle_first=0, fail_on=(), quiz_replies=None):
+        self.delay = delay
+        self.quiz_replies = list(quiz_replies or [])
+        self.throttle_first = throttle_first
+        self.fail_on = set(fail_on)
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def invoke_model(self, modelId, body):
+        prompt = json.loads(body)["prompt"]
+        with self.lock:
+            self.calls += 1
+            call = self.calls
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if call <= self.throttle_first:
+                raise ClientError({"Error": {"Code": "ThrottlingException", "Message": "Slow down"}}, "InvokeModel")
+            for marker in self.fail_on:
+                if marker in prompt:
+                    raise ClientError({"Error": {"Code": "ValidationException", "Message": "Bad input"}}, "InvokeModel")
+            if "Content to summarize:" not in prompt and self.quiz_replies:
+                completion = self.quiz_replies.pop(0)
+                return {"body": io.BytesIO(json.dumps({"completion": completion}).encode())}
+            if "Content to summarize:" not in prompt:
+                completion = json.dumps({
+                    "question": "Which service is this?",
+                    "options": ["S3", "EC2", "Lambda", "IAM"],
+                    "correct_answer": "S3",
+                    "correct_index": 0,
+                })
+                return {"body": io.BytesIO(json.dumps({"completion": completion}).encode())}
+            content = prompt.split("Content to summarize:")[1].split("\n\nAssistant:")[0].strip()
+            completion = f" Summary of {content} "
+            return {"body": io.BytesIO(json.dumps({"completion": completion}).encode())}
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class TestGenerateSummaries(unittest.TestCase):
+    def test_results_are_ordered_and_concurrent(self):
+        """A batch should take about one round trip and keep input order"""
+        client = StubBedrockClient(delay=0.2)
+        contents = [f"update {i}" for i in range(8)]
+        started = time.monotonic()
+        summaries = generate_summaries(contents, max_workers=8, client=client)
+        elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual(summaries, [f"Summary of update {i}" for i in range(8)])
+
+    def test_concurrency_is_bounded(self):
+        """No more than max_workers calls should be in flight"""
+        client = StubBedrockClient(delay=0.05)
+        generate_summaries([f"update {i}" for i in range(10)], max_workers=3, client=client)
+        self.assertEqual(client.max_in_flight, 3)
+
+    def test_throttling_is_retried(self):
+        """Throttled calls should be retried with backoff until they succeed"""
+        client = StubBedrockClient(throttle_first=2)
+        summaries = generate_summaries(["update"], max_retries=3, base_delay=0.01, client=client)
+        self.assertEqual(summaries, ["Summary of update"])
+        self.assertEqual(client.calls, 3)
+
+    def test_per_item_fallback(self):
+        """A failing item should fall back to its original content"""
+        client = StubBedrockClient(fail_on={"broken"})
+        contents = ["good one", "broken one", "good two"]
+        self.assertEqual(
+            generate_summaries(contents, client=client),
+            ["Summary of good one", "broken one", "Summary of good two"],
+        )
+        self.assertEqual(
+            generate_summaries(contents, fallback=False, client=client),
+            ["Summary of good one", None, "Summary of good two"],
+        )
+
+    def test_retries_are_exhausted(self):
+        """Persistent throttling should give up after max_retries"""
+        client = StubBedrockClient(throttle_first=10)
+        self.assertEqual(generate_summaries(["update"], max_retries=2, base_delay=0.01, client=client), ["update"])
+        self.assertEqual(client.calls, 3)
+
+
+class TestGenerateQuizQuestion(unittest.TestCase):
+    UPDATE = {"title": "Amazon S3 update", "summary": "S3 news", "link": "https://aws.amazon.com/s3"}
+
+    def test_repairable_reply_needs_one_call(self):
+        """A reply with a comment and a mismatched answer should be repaired locally"""
+        client = StubBedrockClient(quiz_replies=[
+            'Here it is: {"question": "Q?", "options": ["a", "b", "c", "d"], '
+            '"correct_answer": "c", "correct_index": 0, // 0-based\n}'
+        ])
+        quiz = generate_quiz_question(self.UPDATE, client=client)
+        self.assertEqual((quiz["correct_index"], quiz["correct_answer"]), (2, "c"))
+        self.assertEqual(quiz["source"], self.UPDATE["link"])
+        self.assertEqual(client.calls, 1)
+
+    def test_only_invalid_fields_are_reprompted(self):
+        """Invalid options should be asked for again and merged with the valid fields"""
+        client = StubBedrockClient(quiz_replies=[
+            '{"question": "Which storage service?", "options": ["S3", "EC2"], "correct_index": 0}',
+            '{"options": ["S3", "EC2", "Lambda", "IAM"], "correct_index": 0, "correct_answer": "S3"}',
+        ])
+        quiz = generate_quiz_question(self.UPDATE, client=client)
+        self.assertEqual(quiz["question"], "Which storage service?")
+        self.assertEqual(quiz["options"], ["S3", "EC2", "Lambda", "IAM"])
+        self.assertEqual(client.calls, 2)
+
+    def test_canned_fallback(self):
+        """Replies that stay invalid should end in the canned question"""
+        client = StubBedrockClient(quiz_replies=["no json", "still no json"])
+        quiz = generate_quiz_question(self.UPDATE, client=client)
+        self.assertEqual(quiz["question"], "What is the main benefit of Amazon S3 update?")
+        self.assertEqual(client.calls, 2)
+
+
+class TestGenerateQuizQuestions(unittest.TestCase):
+    UPDATES = [
+        {"title": f"Update {i}", "summary": f"News {i}", "link": f"https://aws.amazon.com/{i}"}
+        for i in range(1, 4)
+    ]
+
+    def test_question_set_in_one_call(self):
+        """All questions should come from one call, each linked to its update"""
+        reply = json.dumps([
+            {"update": 2, "question": "Q2?", "options": ["a", "b", "c", "d"], "correct_index": 1, "correct_answer": "b"},
+            {"update": 3, "question": "Q3?", "options": ["e", "f", "g", "h"], "correct_index": 0, "correct_answer": "e"},
+            {"update": 1, "question": "Q1?", "options": ["i", "j", "k", "l"], "correct_index": 3, "correct_answer": "l"},
+        ])
+        client = StubBedrockClient(quiz_replies=["Here are your questions:\n" + reply])
+        questions = generate_quiz_questions(self.UPDATES, client=client)
+
+        self.assertEqual(client.calls, 1)
+        self.assertEqual([q["question"] for q in questions], ["Q2?", "Q3?", "Q1?"])
+        self.assertEqual([q["source"] for q in questions], [u["link"] for u in (self.UPDATES[1], self.UPDATES[2], self.UPDATES[0])])
+        self.assertNotIn("update", questions[0])
+
+    def test_per_question_fallback(self):
+        """Missing questions fall back to the canned question for their update"""
+        reply = json.dumps([
+            {"update": 1, "question": "Q1?", "options": ["a", "b", "c", "d"], "correct_index": 2},
+        ])
+        client = StubBedrockClient(quiz_replies=[reply])
+        questions = generate_quiz_questions(self.UPDATES, count=3, client=client)
+
+        self.assertEqual(client.calls, 1)
+        self.assertEqual(questions[0]["correct_answer"], "c")
+        self.assertEqual(questions[1]["question"], "What is the main benefit of Update 2?")
+        self.assertEqual(questions[2]["source"], self.UPDATES[2]["link"])
+
+
+class TestSharedClient(unittest.TestCase):
+    def setUp(self):
+        bedrock_enhancement.reset_bedrock_client()
+        self.addCleanup(bedrock_enhancement.reset_bedrock_client)
+
+    def test_client_is_created_once(self):
+        """Calls from many threads should share a single pooled client"""
+        stub = StubBedrockClient(delay=0.01)
+        with mock.patch.object(bedrock_enhancement.boto3, "client", return_value=stub) as factory:
+            generate_summaries([f"update {i}" for i in range(6)], max_workers=3)
+            generate_summaries(["another update"])
+
+        factory.assert_called_once()
+        config = factory.call_args.kwargs["config"]
+        self.assertEqual(config.max_pool_connections, bedrock_enhancement.BEDROCK_MAX_POOL_CONNECTIONS)
+
+        metrics = bedrock_enhancement.get_client_metrics()
+        self.assertEqual(metrics["clients_created"], 1)
+        self.assertEqual(metrics["invocations"], 7)
+        self.assertGreater(metrics["invoke_seconds"], 0)
+
+    def test_reset(self):
+        """Resetting should force a new client and clear the metrics"""
+        with mock.patch.object(bedrock_enhancement.boto3, "client", side_effect=[object(), object()]):
+            first = bedrock_enhancement.get_bedrock_client()
+            self.assertIs(bedrock_enhancement.get_bedrock_client(), first)
+            bedrock_enhancement.reset_bedrock_client()
+            self.assertIsNot(bedrock_enhancement.get_bedrock_client(), first)
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.cache = ResponseCache(os.path.join(self.tmpdir.name, "cache.sqlite3"))
+        self.addCleanup(self.cache.close)
+        bedrock_enhancement.set_response_cache(self.cache)
+        self.addCleanup(bedrock_enhancement.set_response_cache, None)
+
+    def test_repeated_content_costs_no_model_calls(self):
+        """The same summary and quiz input should only call the model once"""
+        client = StubBedrockClient()
+        update = {"title": "Amazon S3 update", "summary": "S3 news", "link": "https://aws.amazon.com/s3"}
+        first = generate_summaries(["S3 news", "EC2 news"], client=client)
+        second = generate_summaries(["EC2 news", "S3 news"], client=client)
+        quiz = generate_quiz_question(update, client=client)
+        generate_quiz_question(update, client=client)
+
+        self.assertEqual(second, list(reversed(first)))
+        self.assertEqual(quiz["correct_answer"], "S3")
+        self.assertEqual(client.calls, 3)
+        self.assertEqual(self.cache.get_stats(), {"hits": 3, "misses": 3, "hit_rate": 0.5, "entries": 3})
+
+    def test_params_are_part_of_the_key(self):
+        """A different max_length should not reuse a cached summary"""
+        client = StubBedrockClient()
+        generate_summaries(["S3 news"], max_length=200, client=client)
+        generate_summaries(["S3 news"], max_length=100, client=client)
+        self.assertEqual(client.calls, 2)
+
+    def test_ttl_and_lru_eviction(self):
+        """Expired entries are misses and the least recently used entry is evicted"""
+        cache = ResponseCache(os.path.join(self.tmpdir.name, "small.sqlite3"), max_entries=2)
+        self.addCleanup(cache.close)
+        cache.put("a", "1")
+        time.sleep(0.01)
+        cache.put("b", "2")
+        time.sleep(0.01)
+        self.assertEqual(cache.get("a"), "1")
+        cache.put("c", "3")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "3")
+        self.assertEqual(cache.get_stats()["entries"], 2)
+
+        cache.ttl_seconds = 0
+        time.sleep(0.01)
+        self.assertIsNone(cache.get("a"))
+
+
+if __name__ == '__main__':
+    unittest.main()
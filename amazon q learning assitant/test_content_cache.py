@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from content_cache import DailyContentCache
+from content_store import ContentStore
+
+
+class TestDailyContentCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.db_path = os.path.join(self.tmpdir.name, "content.sqlite3")
+        self.store = self.open_store()
+        self.now = 1000.0
+        patcher = mock.patch("content_cache.time.monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def open_store(self):
+        store = ContentStore(self.db_path)
+        self.addCleanup(store.close)
+        return store
+
+    def cache(self, **kwargs):
+        return DailyContentCache(self.store, **kwargs)
+
+    def test_steady_state_does_not_query_the_store(self):
+        self.store.save_day("2026-10-01", {"summaries": []})
+        self.store.save_day("2026-10-02", {"summaries": [], "day": 2})
+        cache = self.cache()
+        self.assertEqual(cache.dates(), ["2026-10-02", "2026-10-01"])
+        self.assertEqual(cache.get("2026-10-02"), {"summaries": [], "day": 2})
+
+        with mock.patch.object(self.store, "_conn") as conn:
+            for _ in range(100):
+                cache.dates()
+                cache.get("2026-10-02")
+        conn.execute.assert_not_called()
+        self.assertEqual((cache.scans, cache.loads), (1, 1))
+
+    def test_writes_from_other_connections_are_picked_up(self):
+        self.store.save_day("2026-10-01", {"summaries": [], "day": 1})
+        cache = self.cache()
+        self.assertEqual(cache.get("2026-10-01"), {"summaries": [], "day": 1})
+
+        writer = self.open_store()
+        writer.save_day("2026-10-02", {"summaries": []})
+        writer.save_day("2026-10-01", {"summaries": [], "day": 11})
+        # Nothing is checked again until the poll interval has passed
+        self.assertEqual(cache.dates(), ["2026-10-01"])
+        self.now += 1
+        self.assertEqual(cache.dates(), ["2026-10-02", "2026-10-01"])
+        self.assertEqual(cache.get("2026-10-01"), {"summaries": [], "day": 11})
+
+    def test_documents_are_lru_bounded(self):
+        for day in range(1, 6):
+            self.store.save_day(f"2026-10-0{day}", {"summaries": [], "day": day})
+        cache = self.cache(max_documents=2)
+        for day in (1, 2, 1, 3):
+            cache.get(f"2026-10-0{day}")
+        self.assertEqual(list(cache._documents), ["2026-10-01", "2026-10-03"])
+        self.assertEqual(cache.loads, 3)
+
+    def test_unknown_dates(self):
+        cache = self.cache()
+        self.assertIsNone(cache.get("2026-10-01"))
+        self.assertIsNone(cache.quiz_questions("2026-10-01"))
+
+    def test_answer_keys_outlive_documents(self):
+        quiz = {"question": "Q", "options": ["A", "B"], "correct_index": 1}
+        self.store.save_day("2026-10-01", {"summaries": [], "quiz_questions": [quiz]})
+        # Older days only have a single quiz_question
+        self.store.save_day("2026-10-02", {"summaries": [], "quiz_question": quiz})
+        cache = self.cache(max_documents=1)
+        self.assertEqual(cache.quiz_questions("2026-10-01"), (quiz,))
+        self.assertEqual(cache.quiz_questions("2026-10-02"), (quiz,))
+        self.assertEqual(list(cache._documents), ["2026-10-02"])
+
+        with mock.patch.object(self.store, "_conn") as conn:
+            cache.quiz_questions("2026-10-01")
+        conn.execute.assert_not_called()
+
+        self.store.save_day("2026-10-01", {"summaries": [], "quiz_questions": [quiz, quiz]})
+        self.now += 1
+        self.assertEqual(len(cache.quiz_questions("2026-10-01")), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import datetime
+import json
+import os
+import tempfile
+import unittest
+
+from content_store import ContentStore, import_json_files
+
+
+def _day(*titles):
+    return {
+        "summaries": [
+            {"title": title, "link": f"https://aws.amazon.com/{i}", "summary": title}
+            for i, title in enumerate(titles)
+        ],
+        "quiz_questions": [],
+    }
+
+
+class TestContentStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.store = ContentStore(os.path.join(self.tmpdir.name, "content.sqlite3"))
+        self.addCleanup(self.store.close)
+
+    def test_save_and_query(self):
+        self.store.save_day("2026-10-01", _day("AWS Lambda adds Python 3.13", "Amazon S3 Tables"))
+        self.store.save_day("2026-10-03", _day("Amazon S3 conditional writes"))
+        self.store.save_day("2026-10-02", _day("New HTML dashboards"))
+
+        self.assertEqual(self.store.dates(), ["2026-10-03", "2026-10-02", "2026-10-01"])
+        self.assertEqual(self.store.get_day("2026-10-02"), _day("New HTML dashboards"))
+        self.assertIsNone(self.store.get_day("2026-09-30"))
+        self.assertEqual([d for d, _ in self.store.days_between("2026-10-02", "2026-10-31")],
+                         ["2026-10-02", "2026-10-03"])
+        self.assertEqual([u["date"] for u in self.store.updates_for_topic("S3")], ["2026-10-03", "2026-10-01"])
+        self.assertEqual(self.store.dates_for_link("https://aws.amazon.com/0"),
+                         ["2026-10-01", "2026-10-02", "2026-10-03"])
+
+    def test_saving_a_day_again_replaces_it(self):
+        self.store.save_day("2026-10-01", _day("Amazon S3 Tables"))
+        self.store.save_day("2026-10-01", _day("AWS Lambda update"))
+        self.assertEqual(self.store.get_day("2026-10-01"), _day("AWS Lambda update"))
+        self.assertEqual(self.store.updates_for_topic("S3"), [])
+        self.assertEqual(len(self.store.updates_for_topic("Lambda")), 1)
+
+    def test_import_json_files(self):
+        for date in ("2026-10-01", "2026-10-02"):
+            with open(os.path.join(self.tmpdir.name, f"aws_learning_{date}.json"), "w") as f:
+                json.dump(_day(f"Amazon EC2 update {date}"), f)
+        with open(os.path.join(self.tmpdir.name, "aws_learning_2026-10-03.json"), "w") as f:
+            f.write("{broken")
+        with open(os.path.join(self.tmpdir.name, "aws_learning_2026-10-02.backup.json"), "w") as f:
+            json.dump(_day("Amazon EC2 backup"), f)
+
+        imported, failed = import_json_files(self.store, self.tmpdir.name, remove=True)
+        self.assertEqual(imported, ["2026-10-01", "2026-10-02"])
+        self.assertEqual(sorted(os.path.basename(path) for path, _ in failed),
+                         ["aws_learning_2026-10-02.backup.json", "aws_learning_2026-10-03.json"])
+        self.assertEqual(self.store.get_day("2026-10-01"), _day("Amazon EC2 update 2026-10-01"))
+        self.assertEqual(self.store.get_day("2026-10-02"), _day("Amazon EC2 update 2026-10-02"))
+        remaining = sorted(name for name in os.listdir(self.tmpdir.name) if name.endswith(".json"))
+        self.assertEqual(remaining, ["aws_learning_2026-10-02.backup.json", "aws_learning_2026-10-03.json"])
+
+    def test_invalid_dates_are_rejected(self):
+        for date in ("2026-10-02.backup", "2026-1-2", "2026-02-30", ""):
+            with self.assertRaises(ValueError):
+                self.store.save_day(date, _day("Amazon S3 Tables"))
+        self.assertEqual(self.store.dates(), [])
+
+
+class TestSearch(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.db_path = os.path.join(self.tmpdir.name, "content.sqlite3")
+        self.store = self.open_store()
+        self.store.save_day("2026-09-30", {"summaries": [
+            {"title": "Amazon API Gateway adds routing rules", "link": "https://aws.amazon.com/gw",
+             "summary": "Route requests to AWS Lambda functions by header."},
+        ]})
+        self.store.save_day("2026-10-01", _day("AWS Lambda adds Python 3.13", "Amazon S3 Tables"))
+        self.store.save_day("2026-10-02", _day("Amazon S3 conditional writes"))
+
+    def open_store(self):
+        store = ContentStore(self.db_path)
+        self.addCleanup(store.close)
+        return store
+
+    def titles(self, *args, **kwargs):
+        return [result["title"] for result in self.store.search(*args, **kwargs)]
+
+    def test_ranking_and_fields(self):
+        # A title match ranks above a mention in the summary
+        self.assertEqual(self.titles("lambda"), ["AWS Lambda adds Python 3.13", "Amazon API Gateway adds routing rules"])
+        result = self.store.search("routing")[0]
+        self.assertEqual(result["date"], "2026-09-30")
+        self.assertEqual(result["topics"], ["API Gateway"])
+        self.assertIn("Lambda functions", result["snippet"])
+        # The last word matches as a prefix; dates are searchable too
+        self.assertEqual(self.titles("write"), ["Amazon S3 conditional writes"])
+        self.assertEqual(self.titles("condit"), ["Amazon S3 conditional writes"])
+        self.assertEqual(len(self.titles("2026 10")), 3)
+
+    def test_filters(self):
+        self.assertEqual(self.titles("amazon", topic="API Gateway"), ["Amazon API Gateway adds routing rules"])
+        self.assertCountEqual(self.titles("", topic="S3"), ["Amazon S3 conditional writes", "Amazon S3 Tables"])
+        self.assertEqual(self.titles("amazon", since="2026-10-01", until="2026-10-01"), ["Amazon S3 Tables"])
+        self.assertEqual(len(self.titles("amazon", limit=1)), 1)
+        # Operators and quotes are searched as words, never as query syntax
+        self.assertEqual(self.titles('s3 "OR NEAR('), [])
+        self.assertEqual(self.titles("  "), [])
+
+    def test_old_title_matches_outrank_many_newer_mentions(self):
+        self.store.save_day("2020-01-01", _day("AWS Lambda SnapStart for Java"))
+        start = datetime.date(2021, 1, 1)
+        for n in range(1100):
+            self.store.save_day((start + datetime.timedelta(days=n)).isoformat(), {"summaries": [
+                {"title": f"Update n{n}", "link": f"https://aws.amazon.com/{n}", "summary": "Works with AWS Lambda."},
+            ]})
+        self.assertEqual(self.titles("lambda", limit=1), ["AWS Lambda SnapStart for Java"])
+
+    def test_saving_a_day_again_reindexes_it(self):
+        self.store.save_day("2026-10-02", _day("Amazon EC2 instances"))
+        self.assertEqual(self.titles("conditional"), [])
+        self.assertEqual(self.titles("ec2"), ["Amazon EC2 instances"])
+
+    def test_older_databases_are_indexed_when_opened(self):
+        with self.store._conn:
+            self.store._conn.execute("DROP TABLE updates_fts")
+            self.store._conn.execute("PRAGMA user_version = 0")
+        self.assertEqual(len(self.open_store().search("amazon")), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
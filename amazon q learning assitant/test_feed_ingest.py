@@ -0,0 +1,133 @@
+import tempfile
+import time
+import unittest
+
+from feed_cache import FeedCache
+from feed_ingest import fetch_feeds, merge_latest
+from local_feed_server import LocalFeedServer, make_rss
+
+
+def _items(prefix, count):
+    return [
+        {
+            "title": f"{prefix} update {i}",
+            "link": f"https://aws.amazon.com/{prefix}/{i}",
+            "summary": f"<p>{prefix} summary {i}</p>",
+            "published": 1700000000 + i * 60,
+        }
+        for i in range(count)
+    ]
+
+
+class TestFetchFeeds(unittest.TestCase):
+    def test_feeds_are_fetched_concurrently(self):
+        """Wall time should track the slowest feed, not the sum"""
+        routes = {
+            f"/feed/{i}": {"body": make_rss(_items(f"feed{i}", 3)), "delay": 0.3}
+            for i in range(5)
+        }
+        with LocalFeedServer(routes) as server:
+            urls = [server.url(path) for path in routes]
+            started = time.monotonic()
+            results = fetch_feeds(urls, timeout=5, max_workers=5)
+            elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual([r["url"] for r in results], urls)
+        for result in results:
+            self.assertIsNone(result["error"])
+            self.assertEqual(len(result["entries"]), 3)
+
+    def test_concurrency_cap(self):
+        """At most max_workers feeds should be in flight at once"""
+        routes = {f"/feed/{i}": {"body": make_rss(_items("x", 1)), "delay": 0.2} for i in range(4)}
+        with LocalFeedServer(routes) as server:
+            started = time.monotonic()
+            fetch_feeds([server.url(path) for path in routes], timeout=5, max_workers=2)
+            elapsed = time.monotonic() - started
+
+        self.assertGreaterEqual(elapsed, 0.4)
+
+    def test_partial_failure_and_timeout(self):
+        """A broken or slow feed should not take down the others"""
+        routes = {
+            "/ok": {"body": make_rss(_items("ok", 2))},
+            "/broken": {"status": 500},
+            "/slow": {"body": make_rss(_items("slow", 2)), "delay": 2},
+        }
+        with LocalFeedServer(routes) as server:
+            started = time.monotonic()
+            ok, broken, slow = fetch_feeds(
+                [server.url("/ok"), server.url("/broken"), server.url("/slow")],
+                timeout=0.5,
+            )
+            elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 1.5)
+        self.assertIsNone(ok["error"])
+        self.assertEqual(len(ok["entries"]), 2)
+        self.assertIsNotNone(broken["error"])
+        self.assertEqual(broken["entries"], [])
+        self.assertIsNotNone(slow["error"])
+        self.assertEqual(slow["entries"], [])
+
+
+class TestFeedCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_not_modified_is_served_from_cache(self):
+        """A 304 should return the cached entries without re-parsing"""
+        routes = {"/feed": {"body": make_rss(_items("s3", 3)), "etag": '"v1"'}}
+        with LocalFeedServer(routes) as server:
+            url = server.url("/feed")
+            first = fetch_feeds([url], cache=FeedCache(self.tmpdir.name))[0]
+
+            # A fresh cache object reads the validators back from disk
+            cache = FeedCache(self.tmpdir.name)
+            second = fetch_feeds([url], cache=cache)[0]
+            headers = server.requests[-1][1]
+
+        self.assertFalse(first["cached"])
+        self.assertTrue(second["cached"])
+        self.assertEqual(headers.get("If-None-Match"), '"v1"')
+        self.assertEqual(cache.get_stats()["hits"], 1)
+        self.assertEqual(cache.get_stats()["misses"], 0)
+        self.assertEqual([e.title for e in second["entries"]], [e.title for e in first["entries"]])
+        self.assertEqual(second["entries"][0].published_parsed, first["entries"][0].published_parsed)
+
+    def test_changed_feed_is_a_miss(self):
+        """A changed Last-Modified should replace the cached entries"""
+        routes = {"/feed": {"body": make_rss(_items("s3", 1)), "last_modified": "Mon, 01 Jan 2024 00:00:00 GMT"}}
+        with LocalFeedServer(routes) as server:
+            url = server.url("/feed")
+            cache = FeedCache(self.tmpdir.name)
+            fetch_feeds([url], cache=cache)
+            server.routes["/feed"] = {"body": make_rss(_items("s3", 2)), "last_modified": "Tue, 02 Jan 2024 00:00:00 GMT"}
+            result = fetch_feeds([url], cache=cache)[0]
+
+        self.assertFalse(result["cached"])
+        self.assertEqual(len(result["entries"]), 2)
+        self.assertEqual(cache.get_stats(), {"hits": 0, "misses": 2, "hit_rate": 0.0})
+
+
+class TestMergeLatest(unittest.TestCase):
+    def _entry(self, title, day):
+        return {"title": title, "published_parsed": time.gmtime(1700000000 + day * 86400)}
+
+    def test_newest_entries_across_feeds(self):
+        """Entries should be merged by date regardless of feed order"""
+        whats_new = [self._entry("wn3", 3), self._entry("wn1", 1), self._entry("wn5", 5)]
+        blog = [self._entry("b4", 4), self._entry("b2", 2), self._entry("b0", 0)]
+        merged = merge_latest([whats_new, blog], 4)
+        self.assertEqual([e["title"] for e in merged], ["wn5", "b4", "wn3", "b2"])
+
+    def test_undated_entries_sort_last(self):
+        """Entries without a date should only fill remaining slots"""
+        merged = merge_latest([[{"title": "undated"}], [self._entry("dated", 1)]], 2)
+        self.assertEqual([e["title"] for e in merged], ["dated", "undated"])
+
+
+if __name__ == '__main__':
+    unittest.main()
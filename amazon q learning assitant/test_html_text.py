@@ -0,0 +1,65 @@
+import json
+import os
+import random
+import unittest
+
+from bs4 import BeautifulSoup
+
+from html_text import html_to_text
+
+CORPUS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "feed_summaries.json")
+
+
+def _soup_text(markup):
+    return BeautifulSoup(markup, "html.parser").get_text()
+
+
+class TestHtmlToTextParity(unittest.TestCase):
+    def assertParity(self, markup):
+        self.assertEqual(html_to_text(markup), _soup_text(markup), repr(markup))
+
+    def test_saved_feed_summaries(self):
+        """Real feed summaries should match BeautifulSoup exactly"""
+        with open(CORPUS_FILE) as f:
+            for markup in json.load(f):
+                self.assertParity(markup)
+
+    def test_entities_and_references(self):
+        """Named, numeric and windows-1252 references should decode like BeautifulSoup"""
+        for markup in ["a &amp; b", "&nbsp;&copy;&#39;", "&#150; &#x80; &#x2014;", "&amp", "&copyright", "a &# b"]:
+            self.assertParity(markup)
+
+    def test_hidden_and_ignored_content(self):
+        """Scripts, styles, comments and declarations should not produce text"""
+        for markup in [
+            "<p>a<script>x=1</script><style>p{}</style><!-- c --> d</p>",
+            "<!DOCTYPE html><p>t</p>",
+            "<?php x ?>y",
+            "<![CDATA[z]]>q",
+        ]:
+            self.assertParity(markup)
+
+    def test_whitespace_collapsing(self):
+        """Whitespace-only strings between tags collapse like BeautifulSoup"""
+        for markup in ["<p>a</p>\n\n<p>b</p>", "<b> </b>\t<i>\t</i>", "\n\n", "", "a\r\nb"]:
+            self.assertParity(markup)
+
+    def test_fallback_cases(self):
+        """Input the fast path does not handle should still match via the fallback"""
+        for markup in ["&unknown; x", "&#99999999999;", "<pre>  a  </pre>", "a<br></br>b", "<p>unclosed <b>bold", "a < b"]:
+            self.assertParity(markup)
+
+    def test_random_markup(self):
+        """Randomly assembled markup should match BeautifulSoup"""
+        tokens = [
+            "<p>", "</p>", "<b>", "</b>", "<script>", "</script>", "<style>", "</style>",
+            "&amp;", "&amp", "&nbsp;", "&#8217;", "&#150;", "&foo;", "<!-- x -->", "<![CDATA[y]]>",
+            "text", " ", "\n", "\t", "<", ">", "&", "<br/>", '<a href="x">', "</a>", "&#", "<pre>", "</br>",
+        ]
+        rng = random.Random(42)
+        for _ in range(2000):
+            self.assertParity("".join(rng.choice(tokens) for _ in range(rng.randint(0, 12))))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,514 @@
+import datetime
+import gc
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from learning_tracker import DEFAULT_USER, LearningTracker, TrackerPool
+import tracker_storage
+from tracker_storage import EventLogStore, JsonStatsStore
+
+
+def _update(title):
+    return {"title": title, "link": "https://aws.amazon.com/"}
+
+
+QUIZ = {"question": "What is the maximum memory for AWS Lambda?", "correct_answer": "10 GB"}
+
+
+def _hammer(stats_file, storage, count):
+    store = None
+    if storage == "eventlog":
+        # A small snapshot interval makes writers compact under each other
+        store = EventLogStore(stats_file, snapshot_interval=7)
+    tracker = LearningTracker(stats_file, storage=storage, store=store)
+    for i in range(count):
+        tracker.record_update_read(_update(f"AWS Lambda update {i}"))
+        tracker.record_quiz_answer(QUIZ, "10 GB", i % 2 == 0)
+    tracker.store.close()
+
+
+class TrackerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.stats_file = os.path.join(self.tmpdir.name, "learning_stats.json")
+
+    def tracker(self, storage):
+        tracker = LearningTracker(self.stats_file, storage=storage)
+        self.addCleanup(tracker.store.close)
+        return tracker
+
+
+class TestStorageBackends(TrackerTestCase):
+    def _exercise(self, tracker):
+        tracker.record_update_read(_update("AWS Lambda now supports Python 3.13"))
+        tracker.record_update_read(_update("Amazon S3 and AWS Lambda integration"))
+        tracker.record_quiz_answer(QUIZ, "10 GB", True)
+        tracker.record_quiz_answer(QUIZ, "3 GB", False)
+
+    def test_backends_agree(self):
+        """Both backends should produce the same stats after a reload"""
+        results = {}
+        for storage in ("json", "eventlog", "sqlite"):
+            self.stats_file = os.path.join(self.tmpdir.name, f"{storage}.json")
+            tracker = self.tracker(storage)
+            self._exercise(tracker)
+            tracker.store.close()
+            results[storage] = self.tracker(storage).get_stats()
+
+        self.assertEqual(results["json"], results["eventlog"])
+        self.assertEqual(results["json"], results["sqlite"])
+        self.assertEqual(results["json"]["total_updates"], 2)
+        self.assertEqual(results["json"]["topics"], {"Lambda": 2, "S3": 1})
+        self.assertEqual(results["json"]["correct_answers"], 1)
+        self.assertEqual(results["json"]["streak"], 1)
+
+
+class TestSQLiteStatsStore(TrackerTestCase):
+    def _record_on(self, tracker, date):
+        with mock.patch.object(LearningTracker, "_today", return_value=date):
+            tracker.record_update_read(_update("Amazon EC2 update"))
+
+    def test_streak_is_computed_in_sql(self):
+        """The streak should count consecutive days up to the last activity"""
+        tracker = self.tracker("sqlite")
+        for date in ("2026-01-01", "2026-01-03", "2026-01-04", "2026-01-04", "2026-01-05"):
+            self._record_on(tracker, date)
+        stats = tracker.get_stats()
+        self.assertEqual(stats["streak"], 3)
+        self.assertEqual(stats["last_activity_date"], "2026-01-05")
+        self.assertEqual(stats["daily_activity"]["2026-01-04"]["updates_read"], 2)
+
+    def test_json_stats_are_migrated(self):
+        """An existing JSON stats file should be imported on first use"""
+        json_tracker = self.tracker("json")
+        json_tracker.record_update_read(_update("AWS Lambda and Amazon S3"))
+        json_tracker.record_quiz_answer(QUIZ, "10 GB", True)
+        expected = json.loads(json.dumps(json_tracker.get_stats()))
+
+        self.assertEqual(self.tracker("sqlite").get_stats(), expected)
+        # Migration only happens once
+        self.assertEqual(self.tracker("sqlite").get_stats()["total_updates"], 1)
+
+    def test_recommendations_use_top_topics(self):
+        tracker = self.tracker("sqlite")
+        tracker.record_update_read(_update("AWS Lambda update"))
+        self.assertEqual(tracker.store.top_topics(3), [("Lambda", 1)])
+        self.assertEqual(sorted(tracker.get_topic_recommendations()), ["API Gateway", "EventBridge", "Step Functions"])
+
+
+class TestRecommendations(TrackerTestCase):
+    def test_top_topics_are_maintained_incrementally(self):
+        stats = tracker_storage.default_stats()
+        rng = random.Random(7)
+        topics = [f"Topic{i:02d}" for i in range(30)]
+        for i in range(2000):
+            tracker_storage.apply_event(stats, {
+                "type": "update_read", "date": "2026-01-01", "title": "",
+                "topics": rng.sample(topics, rng.randint(1, 3)),
+            })
+            if i % 97 == 0:
+                expected = sorted(stats["topics"].items(), key=lambda x: (-x[1], x[0]))
+                self.assertEqual([tuple(e) for e in stats["top_topics"]], expected[:tracker_storage.TOP_TOPICS_SIZE])
+
+    def test_ranked_by_cooccurrence(self):
+        for storage in ("json", "eventlog", "sqlite"):
+            self.stats_file = os.path.join(self.tmpdir.name, f"{storage}.json")
+            tracker = self.tracker(storage)
+            tracker.record_updates_read([
+                _update("AWS Lambda adds Amazon SQS event filtering"),
+                _update("AWS Lambda now integrates with Amazon SQS and Amazon SNS"),
+                _update("AWS Lambda and Amazon SQS fair queues"),
+                _update("Amazon S3 conditional writes"),
+                _update("Amazon S3 Tables"),
+            ])
+            # Lambda, SQS and S3 are the most studied; SNS appeared with two of
+            # them, then the curated relations follow by name
+            self.assertEqual(tracker.get_topic_recommendations(limit=5),
+                             ["SNS", "API Gateway", "CloudFront", "EventBridge", "Glacier"], storage)
+            self.assertEqual(tracker.get_topic_recommendations(), tracker.get_topic_recommendations())
+
+
+class TestEventLogStore(TrackerTestCase):
+    def test_snapshot_compaction(self):
+        """Compaction should truncate the log and replay from the snapshot"""
+        store = EventLogStore(self.stats_file, snapshot_interval=3)
+        tracker = LearningTracker(self.stats_file, store=store)
+        for i in range(4):
+            tracker.record_update_read(_update(f"Amazon EC2 update {i}"))
+        store.close()
+
+        with open(store.log_file) as f:
+            self.assertEqual(len(f.readlines()), 1)
+        with open(store.snapshot_file) as f:
+            self.assertEqual(json.load(f)["last_seq"], 3)
+        self.assertEqual(self.tracker("eventlog").get_stats()["total_updates"], 4)
+
+    def test_torn_line_is_dropped(self):
+        """A partial line from a crash should not swallow later events"""
+        tracker = self.tracker("eventlog")
+        tracker.record_update_read(_update("Amazon EC2 update"))
+        tracker.store.close()
+        with open(tracker.store.log_file, "a") as f:
+            f.write('{"type": "update_read", "da')
+
+        tracker = self.tracker("eventlog")
+        tracker.record_update_read(_update("Amazon EC2 update"))
+        tracker.store.close()
+        self.assertEqual(self.tracker("eventlog").get_stats()["total_updates"], 2)
+
+    def test_offset_matches_the_log_size(self):
+        """The replay offset should count the bytes on disk, so catching up starts on a line"""
+        writer, reader = self.tracker("eventlog"), self.tracker("eventlog")
+        writer.record_update_read(_update("Amazon EC2 — mise à jour"))
+        reader.record_update_read(_update("Amazon S3 update"))
+        writer.record_update_read(_update("Amazon EC2 update"))
+        self.assertEqual(writer.store.offset, os.path.getsize(writer.store.log_file))
+        self.assertEqual(reader.get_stats()["total_updates"], 3)
+        self.assertEqual(reader.store.offset, os.path.getsize(reader.store.log_file))
+
+    def test_seeded_from_json_stats(self):
+        """The first event log run should start from an existing stats file"""
+        tracker = self.tracker("json")
+        tracker.record_update_read(_update("Amazon EC2 update"))
+        self.assertEqual(self.tracker("eventlog").get_stats()["total_updates"], 1)
+
+
+class TestTrackerPool(TrackerTestCase):
+    def pool(self, **kwargs):
+        return TrackerPool(
+            shard_dir=os.path.join(self.tmpdir.name, "shards"),
+            default_stats_file=self.stats_file,
+            storage="json",
+            **kwargs
+        )
+
+    def test_users_have_separate_shards(self):
+        """Each user should write to their own stats file"""
+        pool = self.pool()
+        pool.get("alice").record_update_read(_update("Amazon EC2 update"))
+        pool.get("bob@example.com").record_quiz_answer(QUIZ, "10 GB", True)
+
+        self.assertEqual(pool.get("alice").get_stats()["total_updates"], 1)
+        self.assertEqual(pool.get("bob@example.com").get_stats()["total_updates"], 0)
+        self.assertNotEqual(pool.stats_file_for("alice"), pool.stats_file_for("bob@example.com"))
+        self.assertTrue(os.path.exists(pool.stats_file_for("alice")))
+        self.assertEqual(pool.stats_file_for(DEFAULT_USER), self.stats_file)
+
+    def test_lru_is_bounded_and_reloads_lazily(self):
+        """Evicted users should be reloaded from their shard"""
+        pool = self.pool(max_trackers=2)
+        pool.get("alice").record_update_read(_update("Amazon EC2 update"))
+        pool.get("bob")
+        pool.get("carol")
+        self.assertEqual(len(pool), 2)
+        self.assertEqual(pool.get("alice").get_stats()["total_updates"], 1)
+
+    def test_users_do_not_block_each_other(self):
+        """A slow write for one user should not delay another user"""
+        pool = self.pool()
+        alice, bob = pool.get("alice"), pool.get("bob")
+        original_record = alice.store.record
+
+        def slow_record(events):
+            time.sleep(0.5)
+            original_record(events)
+
+        alice.store.record = slow_record
+        writer = threading.Thread(target=alice.record_update_read, args=(_update("Amazon EC2 update"),))
+        writer.start()
+        time.sleep(0.05)
+        started = time.monotonic()
+        bob.record_update_read(_update("Amazon S3 update"))
+        pool.get("carol")
+        elapsed = time.monotonic() - started
+        writer.join()
+
+        self.assertLess(elapsed, 0.3)
+
+    def test_duplicate_loaded_in_a_race_is_closed(self):
+        """A tracker loaded concurrently for the same user should be closed, not leaked"""
+        pool = self.pool(flush_interval=60)
+        created = []
+
+        def racing_tracker(*args, **kwargs):
+            tracker = LearningTracker(*args, **kwargs)
+            created.append(tracker)
+            if len(created) == 1:
+                # Another request loads the same user meanwhile
+                pool.get("alice")
+            return tracker
+
+        with mock.patch("learning_tracker.LearningTracker", side_effect=racing_tracker), \
+                mock.patch.object(LearningTracker, "close", autospec=True) as close:
+            tracker = pool.get("alice")
+        self.assertIs(tracker, created[1])
+        close.assert_called_once_with(created[0])
+        for tracker in created:
+            tracker.close()
+
+
+class TestConcurrentWriters(TrackerTestCase):
+    PROCESSES = 4
+    EVENTS = 50
+
+    def _run_writers(self, storage):
+        processes = [
+            multiprocessing.Process(target=_hammer, args=(self.stats_file, storage, self.EVENTS))
+            for _ in range(self.PROCESSES)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(60)
+            self.assertEqual(process.exitcode, 0)
+
+        stats = self.tracker(storage).get_stats()
+        total = self.PROCESSES * self.EVENTS
+        self.assertEqual(stats["total_updates"], total)
+        self.assertEqual(stats["quizzes_answered"], total)
+        self.assertEqual(stats["correct_answers"], total // 2)
+        self.assertEqual(stats["topics"], {"Lambda": total})
+        self.assertEqual(len(stats["quiz_history"]), total)
+
+    def test_no_lost_increments_json(self):
+        self._run_writers("json")
+
+    def test_no_lost_increments_eventlog(self):
+        self._run_writers("eventlog")
+
+    def test_no_lost_increments_sqlite(self):
+        self._run_writers("sqlite")
+
+    def test_sees_other_writers(self):
+        """A store picks up what another process wrote since it loaded"""
+        first = self.tracker("json")
+        second = self.tracker("json")
+        first.record_update_read(_update("Amazon S3 update"))
+        second.record_update_read(_update("Amazon S3 update"))
+        self.assertEqual(first.get_stats()["total_updates"], 2)
+
+    def test_corrupt_stats_file_is_kept(self):
+        with open(self.stats_file, "w") as f:
+            f.write('{"total_updates": 12, "topi')
+        with mock.patch("builtins.print"):
+            store = JsonStatsStore(self.stats_file)
+        self.assertEqual(store.get_stats()["total_updates"], 0)
+        backups = [name for name in os.listdir(self.tmpdir.name) if ".corrupt-" in name]
+        self.assertEqual(len(backups), 1)
+        with open(os.path.join(self.tmpdir.name, backups[0])) as f:
+            self.assertIn('"total_updates": 12', f.read())
+
+
+class TestBatching(TrackerTestCase):
+    def test_batch_writes_once(self):
+        tracker = self.tracker("json")
+        with mock.patch.object(tracker.store, "record", wraps=tracker.store.record) as record:
+            tracker.record_updates_read(_update(f"AWS Lambda update {i}") for i in range(20))
+            with tracker.batch():
+                tracker.record_quiz_answer(QUIZ, "10 GB", True)
+                with tracker.batch():
+                    tracker.record_quiz_answer(QUIZ, "3 GB", False)
+                self.assertEqual(record.call_count, 1)
+        self.assertEqual(record.call_count, 2)
+        self.assertEqual(len(record.call_args_list[0].args[0]), 20)
+
+        with open(self.stats_file) as f:
+            stats = json.load(f)
+        self.assertEqual(stats["total_updates"], 20)
+        self.assertEqual(stats["quizzes_answered"], 2)
+
+    def test_batched_changes_are_visible_after_the_batch(self):
+        tracker = self.tracker("json")
+        with tracker.batch():
+            tracker.record_update_read(_update("Amazon S3 update"))
+            self.assertFalse(os.path.exists(self.stats_file))
+            self.assertEqual(tracker.get_stats()["total_updates"], 0)
+        self.assertEqual(tracker.get_stats()["total_updates"], 1)
+
+    def test_reads_include_write_behind_changes(self):
+        tracker = self.write_behind_pool(60).get()
+        tracker.record_quiz_answer(QUIZ, "10 GB", True)
+        self.assertEqual(tracker.get_stats()["quizzes_answered"], 1)
+
+    def write_behind_pool(self, flush_interval):
+        pool = TrackerPool(
+            shard_dir=os.path.join(self.tmpdir.name, "shards"),
+            default_stats_file=self.stats_file,
+            storage="json",
+            flush_interval=flush_interval,
+        )
+        self.addCleanup(lambda: [tracker.close() for tracker in list(pool._write_behind)])
+        return pool
+
+    def test_write_behind_flusher(self):
+        tracker = self.write_behind_pool(0.05).get()
+        tracker.record_quiz_answer(QUIZ, "10 GB", True)
+        self.assertFalse(os.path.exists(self.stats_file))
+        deadline = time.monotonic() + 5
+        while not os.path.exists(self.stats_file) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        with open(self.stats_file) as f:
+            self.assertEqual(json.load(f)["quizzes_answered"], 1)
+
+    def test_evicted_trackers_keep_their_changes(self):
+        """Changes recorded on an evicted tracker should be written after its last user drops it"""
+        pool = self.write_behind_pool(60)
+        pool.max_trackers = 1
+        tracker = pool.get("alice")
+        stats_file = tracker.stats_file
+        pool.get("bob")
+        tracker.record_quiz_answer(QUIZ, "10 GB", True)
+        del tracker
+        gc.collect()
+        pool.flush_write_behind()
+        self.assertEqual(LearningTracker(stats_file, storage="json").get_stats()["quizzes_answered"], 1)
+
+    def test_one_flusher_per_pool(self):
+        """Write-behind trackers should share their pool's flusher thread"""
+        def flushers():
+            return {thread for thread in threading.enumerate() if thread.name == "tracker-flusher"}
+
+        # Flushers of earlier pools may exit meanwhile, so only look for new ones
+        before = flushers()
+        pool = self.write_behind_pool(0.05)
+        trackers = [pool.get(f"learner-{n}") for n in range(10)]
+        self.assertEqual(flushers() - before, {pool._flusher})
+        for tracker in trackers:
+            tracker.record_quiz_answer(QUIZ, "10 GB", True)
+        deadline = time.monotonic() + 5
+        while not all(os.path.exists(tracker.stats_file) for tracker in trackers) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        for tracker in trackers:
+            with open(tracker.stats_file) as f:
+                self.assertEqual(json.load(f)["quizzes_answered"], 1)
+
+    def test_flusher_survives_failed_flushes(self):
+        tracker = self.write_behind_pool(0.02).get()
+        record = tracker.store.record
+        failures = [OSError("disk full"), OSError("lock timeout")]
+
+        def flaky_record(events):
+            if failures:
+                raise failures.pop(0)
+            record(events)
+
+        with mock.patch.object(tracker.store, "record", side_effect=flaky_record), \
+                mock.patch("builtins.print"):
+            tracker.record_quiz_answer(QUIZ, "10 GB", True)
+            deadline = time.monotonic() + 5
+            while not os.path.exists(self.stats_file) and time.monotonic() < deadline:
+                time.sleep(0.01)
+        with open(self.stats_file) as f:
+            self.assertEqual(json.load(f)["quizzes_answered"], 1)
+
+    def test_failed_flush_keeps_events(self):
+        tracker = self.tracker("json")
+        with mock.patch.object(tracker.store, "record", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                tracker.record_updates_read([_update("Amazon S3 update")])
+        tracker.flush()
+        self.assertEqual(tracker.get_stats()["total_updates"], 1)
+
+
+class TestRetention(TrackerTestCase):
+    START = datetime.date(2023, 1, 2)
+    DAYS = 3 * 365
+
+    def _record_history(self, tracker):
+        """Answer a question (with unique text) and read an update every other day"""
+        for offset in range(0, self.DAYS, 2):
+            date = (self.START + datetime.timedelta(days=offset)).isoformat()
+            with mock.patch.object(LearningTracker, "_today", return_value=date):
+                tracker.record_update_read(_update("Amazon EC2 update"))
+                tracker.record_quiz_answer(dict(QUIZ, question=f"Question {offset}?"), "10 GB", offset % 4 == 0)
+
+    def test_stats_are_bounded(self):
+        tracker = self.tracker("json")
+        self._record_history(tracker)
+        stats = tracker.get_stats()
+
+        self.assertEqual(stats["total_updates"], self.DAYS // 2 + 1)
+        self.assertLessEqual(len(stats["daily_activity"]), tracker_storage.RAW_ACTIVITY_DAYS)
+        self.assertLessEqual(len(stats["weekly_activity"]), tracker_storage.WEEKLY_ACTIVITY_WEEKS + 1)
+        self.assertLessEqual(len(stats["monthly_activity"]), tracker_storage.MONTHLY_ACTIVITY_MONTHS + 1)
+        self.assertLessEqual(len(stats["quiz_history"]), tracker_storage.RAW_ACTIVITY_DAYS // 2)
+        self.assertEqual(set(stats["questions"]), {q["question_id"] for q in stats["quiz_history"]})
+        self.assertEqual(stats["questions"][stats["quiz_history"][-1]["question_id"]], f"Question {self.DAYS - 1}?")
+
+        # Nothing from the retained months is lost in the roll-up
+        retained = sum(day["updates_read"] for tier in tracker_storage.ACTIVITY_TIERS for day in stats[tier].values())
+        first_month = min(stats["monthly_activity"])
+        self.assertEqual(retained, sum(
+            1 for offset in range(0, self.DAYS, 2)
+            if tracker_storage._week_start((self.START + datetime.timedelta(days=offset)).isoformat())[:7] >= first_month
+        ))
+
+    def test_backends_agree_on_tiers(self):
+        results = {}
+        for storage in ("json", "eventlog", "sqlite"):
+            self.stats_file = os.path.join(self.tmpdir.name, f"{storage}.json")
+            tracker = self.tracker(storage)
+            self._record_history(tracker)
+            tracker.store.close()
+            results[storage] = self.tracker(storage).get_stats()
+        self.assertEqual(results["json"], results["eventlog"])
+        self.assertEqual(results["json"], results["sqlite"])
+
+    def test_old_stats_are_upgraded(self):
+        """Stats written before retention are rolled up on load"""
+        stats = tracker_storage.default_stats()
+        del stats["weekly_activity"], stats["monthly_activity"], stats["questions"]
+        stats.update(last_activity_date="2026-03-31", total_updates=2, quizzes_answered=1, streak=1)
+        stats["daily_activity"] = {
+            "2026-01-05": {"updates_read": 1, "quizzes_answered": 0, "correct_answers": 0},
+            "2026-03-31": {"updates_read": 1, "quizzes_answered": 1, "correct_answers": 0},
+        }
+        stats["quiz_history"] = [{"date": "2026-03-31", "question": QUIZ["question"], "user_answer": "3 GB",
+                                  "correct_answer": "10 GB", "is_correct": False}]
+        with open(self.stats_file, "w") as f:
+            json.dump(stats, f)
+
+        upgraded = self.tracker("json").get_stats()
+        self.assertEqual(list(upgraded["daily_activity"]), ["2026-03-31"])
+        self.assertEqual(upgraded["weekly_activity"], {"2026-01-05": {
+            "updates_read": 1, "quizzes_answered": 0, "correct_answers": 0}})
+        qid = upgraded["quiz_history"][0]["question_id"]
+        self.assertEqual(upgraded["questions"], {qid: QUIZ["question"]})
+        self.assertEqual(self.tracker("sqlite").get_stats(), json.loads(json.dumps(upgraded)))
+
+    def test_long_history_is_migrated_to_sqlite(self):
+        """Migrating keeps the totals of dropped months and a streak longer than the raw window"""
+        json_tracker = self.tracker("json")
+        with json_tracker.batch():
+            for offset in range(self.DAYS):
+                date = (self.START + datetime.timedelta(days=offset)).isoformat()
+                with mock.patch.object(LearningTracker, "_today", return_value=date):
+                    json_tracker.record_update_read(_update("Amazon EC2 update"))
+        expected = json.loads(json.dumps(json_tracker.get_stats()))
+        self.assertEqual(expected["total_updates"], self.DAYS)
+        self.assertEqual(expected["streak"], self.DAYS)
+
+        tracker = self.tracker("sqlite")
+        self.assertEqual(tracker.get_stats(), expected)
+
+        # The migrated streak carries on, and breaks, like the JSON one
+        end = self.START + datetime.timedelta(days=self.DAYS)
+        with mock.patch.object(LearningTracker, "_today", return_value=end.isoformat()):
+            tracker.record_update_read(_update("Amazon EC2 update"))
+        stats = tracker.get_stats()
+        self.assertEqual((stats["total_updates"], stats["streak"]), (self.DAYS + 1, self.DAYS + 1))
+        with mock.patch.object(LearningTracker, "_today", return_value=(end + datetime.timedelta(days=2)).isoformat()):
+            tracker.record_update_read(_update("Amazon EC2 update"))
+        self.assertEqual(tracker.get_stats()["streak"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
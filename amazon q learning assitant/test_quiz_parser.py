@@ -0,0 +1,73 @@
+import unittest
+
+from quiz_parser import extract_json, invalid_fields, parse_quiz
+
+VALID = '{"question": "Q?", "options": ["A1", "B1", "C1", "D1"], "correct_answer": "C1", "correct_index": 2}'
+
+
+class TestExtractJson(unittest.TestCase):
+    def test_first_balanced_object(self):
+        """Only the first object should be returned, not everything between braces"""
+        text = 'Here you go: {"a": 1} and also {"b": 2}'
+        self.assertEqual(extract_json(text), '{"a": 1}')
+
+    def test_braces_inside_strings(self):
+        """Braces and escaped quotes in strings should not end the object"""
+        text = 'x {"q": "use {curly} \\"quotes\\"", "n": {"m": 1}} y'
+        self.assertEqual(extract_json(text), '{"q": "use {curly} \\"quotes\\"", "n": {"m": 1}}')
+
+    def test_unbalanced(self):
+        """An unterminated object should not be returned"""
+        self.assertIsNone(extract_json('{"a": {"b": 1'))
+        self.assertEqual(extract_json('{"a": 1, {"b": 2}'), '{"b": 2}')
+
+    def test_arrays(self):
+        self.assertEqual(extract_json('Result: [{"a": [1, 2]}, {"b": 3}] done', "["), '[{"a": [1, 2]}, {"b": 3}]')
+
+
+class TestParseQuiz(unittest.TestCase):
+    def test_valid_reply(self):
+        quiz, invalid = parse_quiz("Sure!\n" + VALID + "\nHope this helps.")
+        self.assertEqual(invalid, [])
+        self.assertEqual(quiz["correct_index"], 2)
+
+    def test_comments_and_trailing_commas(self):
+        """The prompt's own // comment and trailing commas should be tolerated"""
+        reply = """{
+            "question": "Q?",
+            "options": ["A1", "B1", "C1", "D1",],
+            "correct_answer": "B1",
+            "correct_index": 1,  // The index of the correct answer (0-based)
+            "explanation": "See https://aws.amazon.com/ for details", /* note */
+        }"""
+        quiz, invalid = parse_quiz(reply)
+        self.assertEqual(invalid, [])
+        self.assertEqual(quiz["explanation"], "See https://aws.amazon.com/ for details")
+
+    def test_derived_fields_are_repaired(self):
+        """A missing or mismatched answer/index should be derived from the other"""
+        quiz, invalid = parse_quiz('{"question": "Q?", "options": ["A1", "B1", "C1", "D1"], "correct_index": "3"}')
+        self.assertEqual(invalid, [])
+        self.assertEqual((quiz["correct_index"], quiz["correct_answer"]), (3, "D1"))
+
+        quiz, invalid = parse_quiz('{"question": "Q?", "options": ["A1", "B1", "C1", "D1"], "correct_answer": "B"}')
+        self.assertEqual((quiz["correct_index"], quiz["correct_answer"]), (1, "B1"))
+
+        quiz, invalid = parse_quiz(
+            '{"question": "Q?", "options": ["A1", "B1", "C1", "D1"], "correct_answer": "A1", "correct_index": 2}'
+        )
+        self.assertEqual((quiz["correct_index"], quiz["correct_answer"]), (0, "A1"))
+
+    def test_unrepairable_fields(self):
+        """Fields that cannot be derived should be reported"""
+        quiz, invalid = parse_quiz('{"question": "", "options": ["A1", "B1"], "correct_index": 0}')
+        self.assertEqual(invalid, ["question", "options", "correct_answer"])
+        self.assertEqual(parse_quiz("no json here"), ({}, ["question", "options", "correct_index", "correct_answer"]))
+
+    def test_invalid_fields(self):
+        self.assertEqual(invalid_fields({"question": "Q?", "options": ["a", "b", "c", "d"], "correct_index": 4}),
+                         ["correct_index", "correct_answer"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import datetime
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from seen_index import SeenIndex
+
+ENTRY = {
+    "id": "https://aws.amazon.com/about-aws/whats-new/2026/10/lambda",
+    "link": "https://aws.amazon.com/about-aws/whats-new/2026/10/lambda",
+    "title": "AWS Lambda adds Python 3.13",
+    "summary": "<p>Lambda now supports Python 3.13.</p>",
+    "published": "Thu, 01 Oct 2026 12:00:00 GMT",
+}
+CONTENT = {
+    "title": ENTRY["title"],
+    "link": ENTRY["link"],
+    "summary": "Lambda now supports Python 3.13.",
+    "published": ENTRY["published"],
+}
+
+
+class TestSeenIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.index_file = os.path.join(self.tmpdir.name, "seen_entries.json")
+
+    def test_content_is_served_until_the_entry_changes(self):
+        index = SeenIndex(self.index_file)
+        self.assertIsNone(index.get_content(ENTRY))
+        index.add_content(ENTRY, CONTENT)
+        self.assertEqual(index.get_content(ENTRY), CONTENT)
+        index.save()
+
+        reloaded = SeenIndex(self.index_file)
+        self.assertEqual(reloaded.get_content(ENTRY), CONTENT)
+        self.assertIsNone(reloaded.get_content(dict(ENTRY, summary="<p>Now also Python 3.14.</p>")))
+        self.assertIsNone(reloaded.get_content(dict(ENTRY, title="AWS Lambda adds Python 3.14")))
+
+    def test_entries_without_id_are_keyed_by_link(self):
+        entry = {key: value for key, value in ENTRY.items() if key != "id"}
+        index = SeenIndex(self.index_file)
+        index.add_content(entry, CONTENT)
+        self.assertEqual(index.get_content(entry), CONTENT)
+
+    def test_summaries_are_kept_for_unchanged_content(self):
+        index = SeenIndex(self.index_file)
+        index.add_content(ENTRY, CONTENT)
+        self.assertIsNone(index.get_summary(CONTENT))
+        index.set_summary(CONTENT, "Python 3.13 runtime for Lambda.")
+        self.assertEqual(index.get_summary(CONTENT), "Python 3.13 runtime for Lambda.")
+
+        changed = dict(CONTENT, summary="Lambda now supports Python 3.14.")
+        self.assertIsNone(index.get_summary(changed))
+        index.set_summary(changed, "Python 3.14 runtime for Lambda.")
+        self.assertEqual(index.get_summary(CONTENT), "Python 3.13 runtime for Lambda.")
+
+        # Unknown updates have no summary and setting one is ignored
+        unknown = dict(CONTENT, link="https://aws.amazon.com/other")
+        index.set_summary(unknown, "Ignored")
+        self.assertIsNone(index.get_summary(unknown))
+
+    def test_mark_tracked(self):
+        index = SeenIndex(self.index_file)
+        index.add_content(ENTRY, CONTENT)
+        self.assertTrue(index.mark_tracked(CONTENT))
+        self.assertFalse(index.mark_tracked(CONTENT))
+        index.save()
+        self.assertFalse(SeenIndex(self.index_file).mark_tracked(CONTENT))
+        # Updates that are not in the index are always tracked
+        self.assertTrue(index.mark_tracked(dict(CONTENT, link="https://aws.amazon.com/other")))
+
+    def test_save_prunes_old_records(self):
+        index = SeenIndex(self.index_file)
+        index.add_content(ENTRY, CONTENT)
+        old_entry = dict(ENTRY, id="old", link="https://aws.amazon.com/old")
+        index.add_content(old_entry, dict(CONTENT, link=old_entry["link"]))
+        index.records["old"]["last_seen"] = (datetime.date.today() - datetime.timedelta(days=91)).isoformat()
+        index.save()
+
+        with open(self.index_file, "r") as f:
+            self.assertEqual(list(json.load(f)), [ENTRY["id"]])
+        self.assertIsNone(SeenIndex(self.index_file).get_content(old_entry))
+
+    def test_reading_refreshes_last_seen(self):
+        index = SeenIndex(self.index_file)
+        index.add_content(ENTRY, CONTENT)
+        index.save()
+
+        later = datetime.date.today() + datetime.timedelta(days=80)
+        with mock.patch("seen_index.datetime.date") as date:
+            date.today.return_value = later
+            reloaded = SeenIndex(self.index_file)
+            self.assertEqual(reloaded.get_content(ENTRY), CONTENT)
+            reloaded.save()
+        self.assertEqual(SeenIndex(self.index_file).records[ENTRY["id"]]["last_seen"], later.isoformat())
+
+    def test_save_without_changes_does_not_write(self):
+        index = SeenIndex(self.index_file)
+        index.save()
+        self.assertFalse(os.path.exists(self.index_file))
+
+    def test_corrupt_index_starts_empty(self):
+        with open(self.index_file, "w") as f:
+            f.write("{broken")
+        self.assertEqual(SeenIndex(self.index_file).records, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
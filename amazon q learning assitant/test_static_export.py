@@ -0,0 +1,95 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from content_store import ContentStore
+import static_export
+from static_export import export_site
+
+QUIZ = {
+    "question": "What is the maximum memory for AWS Lambda?",
+    "options": ["1 GB", "3 GB", "10 GB", "64 GB"],
+    "correct_index": 2,
+    "correct_answer": "10 GB",
+}
+
+
+def day(title):
+    return {
+        "summaries": [{"title": title, "link": "https://aws.amazon.com/", "summary": "<b>More</b> memory"}],
+        "quiz_question": QUIZ,
+        "quiz_questions": [QUIZ],
+    }
+
+
+class TestStaticExport(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.store = ContentStore(os.path.join(self.tmpdir.name, "content.sqlite3"))
+        self.addCleanup(self.store.close)
+        self.out = os.path.join(self.tmpdir.name, "site")
+        for n in (1, 2, 3):
+            self.store.save_day(f"2026-10-0{n}", day(f"AWS Lambda update {n}"))
+
+    def read(self, *parts):
+        with open(os.path.join(self.out, *parts), "r") as f:
+            return f.read()
+
+    def test_export(self):
+        result = export_site(self.store, self.out, jobs=1)
+        self.assertEqual(result["rendered"], ["2026-10-01", "2026-10-02", "2026-10-03"])
+
+        page = self.read("days", "2026-10-02.html")
+        self.assertIn("AWS Lambda update 2", page)
+        self.assertIn("&lt;b&gt;More&lt;/b&gt;", page)
+        self.assertIn("C. 10 GB", page)
+        self.assertIn('href="../index.html"', page)
+        self.assertEqual(json.loads(self.read("days", "2026-10-02.json")), day("AWS Lambda update 2"))
+
+        index = self.read("index.html")
+        self.assertLess(index.index("days/2026-10-03.html"), index.index("days/2026-10-01.html"))
+        self.assertEqual(json.loads(self.read("dates.json"))["dates"], ["2026-10-03", "2026-10-02", "2026-10-01"])
+
+    def test_only_changed_days_are_rendered(self):
+        export_site(self.store, self.out, jobs=1)
+        unchanged = os.stat(os.path.join(self.out, "days", "2026-10-01.html")).st_mtime_ns
+        self.store.save_day("2026-10-02", day("AWS Lambda update 2, revised"))
+        self.store.save_day("2026-10-04", day("AWS Lambda update 4"))
+
+        with mock.patch("static_export.render_day", wraps=static_export.render_day) as render_day:
+            result = export_site(self.store, self.out, jobs=1)
+        self.assertEqual(result["rendered"], ["2026-10-02", "2026-10-04"])
+        self.assertEqual(render_day.call_count, 2)
+        self.assertIn("revised", self.read("days", "2026-10-02.html"))
+        self.assertEqual(os.stat(os.path.join(self.out, "days", "2026-10-01.html")).st_mtime_ns, unchanged)
+
+        self.assertEqual(export_site(self.store, self.out, jobs=1)["rendered"], [])
+        self.assertEqual(len(export_site(self.store, self.out, jobs=1, force=True)["rendered"]), 4)
+
+    def test_missing_and_removed_days(self):
+        export_site(self.store, self.out, jobs=1)
+        os.remove(os.path.join(self.out, "days", "2026-10-01.html"))
+        with self.store._conn:
+            self.store._conn.execute("DELETE FROM days WHERE date = '2026-10-03'")
+
+        result = export_site(self.store, self.out, jobs=1)
+        self.assertEqual(result["rendered"], ["2026-10-01"])
+        self.assertEqual(result["removed"], ["2026-10-03"])
+        self.assertFalse(os.path.exists(os.path.join(self.out, "days", "2026-10-03.html")))
+        self.assertNotIn("2026-10-03", self.read("index.html"))
+
+    def test_parallel_export_matches_serial(self):
+        serial_out = os.path.join(self.tmpdir.name, "serial")
+        export_site(self.store, serial_out, jobs=1)
+        result = export_site(self.store, self.out, jobs=2)
+        self.assertEqual(sorted(result["rendered"]), ["2026-10-01", "2026-10-02", "2026-10-03"])
+        for name in sorted(os.listdir(os.path.join(serial_out, "days"))):
+            with open(os.path.join(serial_out, "days", name), "r") as f:
+                self.assertEqual(self.read("days", name), f.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
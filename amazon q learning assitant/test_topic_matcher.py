@@ -0,0 +1,44 @@
+import json
+import os
+import tempfile
+import unittest
+
+from topic_matcher import TopicMatcher, load_catalog
+
+
+class TestTopicMatcher(unittest.TestCase):
+    def setUp(self):
+        self.matcher = TopicMatcher()
+
+    def test_services_in_order_of_mention(self):
+        self.assertEqual(self.matcher.match("Amazon S3 events can now trigger AWS Lambda and Amazon S3"),
+                         ["S3", "Lambda"])
+
+    def test_whole_words_only(self):
+        """Terms inside other words are not matches"""
+        self.assertEqual(self.matcher.match("New HTML configuration dashboards"), ["General"])
+        self.assertEqual(self.matcher.match("Configure your ML pipelines"), ["Machine Learning"])
+        self.assertEqual(self.matcher.match("AWS Config rules now evaluate proactively"), ["Config"])
+
+    def test_aliases_and_multi_word_terms(self):
+        self.assertEqual(self.matcher.match("Amazon Simple Storage Service adds conditional writes"), ["S3"])
+        self.assertEqual(self.matcher.match("Amazon API  Gateway supports private APIs"), ["API Gateway"])
+        self.assertEqual(self.matcher.match("Route53 Resolver and amazon vpc updates"), ["Route 53", "VPC"])
+
+    def test_category_precedence(self):
+        """Categories are used only without a service, highest ranked first"""
+        self.assertEqual(self.matcher.match("Security for serverless database apps"), ["Serverless"])
+        self.assertEqual(self.matcher.match("Serverless inference in Amazon SageMaker"), ["SageMaker"])
+
+    def test_catalog_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "catalog.json")
+            with open(path, "w") as f:
+                json.dump({"services": {"Q Developer": ["Q Developer", "Amazon Q"]}}, f)
+            matcher = TopicMatcher(*load_catalog(path))
+        self.assertEqual(matcher.match("Amazon Q now explains code"), ["Q Developer"])
+        self.assertEqual(matcher.match("Machine learning with Amazon EC2"), ["Machine Learning"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+
+from content_store import ContentStore
+from web_interface import create_app
+
+QUIZ = {
+    "question": "What is the maximum memory for AWS Lambda?",
+    "options": ["1 GB", "3 GB", "10 GB", "64 GB"],
+    "correct_index": 2,
+    "correct_answer": "10 GB",
+}
+
+
+class WebTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.db_path = os.path.join(self.tmpdir.name, "content.sqlite3")
+        store = ContentStore(self.db_path)
+        store.save_day("2026-10-01", {
+            "summaries": [{"title": "AWS Lambda update", "link": "https://aws.amazon.com/", "summary": "More memory"}],
+            "quiz_question": QUIZ,
+            "quiz_questions": [QUIZ],
+        })
+        store.close()
+        self.app = create_app({
+            "SECRET_KEY": "test",
+            "ALLOW_USER_PARAM": True,
+            "CONTENT_DB": self.db_path,
+            "TRACKER_SHARD_DIR": os.path.join(self.tmpdir.name, "learning_stats"),
+            "TRACKER_STATS_FILE": os.path.join(self.tmpdir.name, "learning_stats.json"),
+        })
+        self.addCleanup(self.app.extensions["answers"].close)
+        self.client = self.app.test_client()
+
+
+class TestWebInterface(WebTestCase):
+    def test_healthz(self):
+        response = self.client.get("/healthz")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {"status": "ok"})
+
+    def test_index_and_answer(self):
+        response = self.client.get("/?user=alice")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"AWS Lambda update", response.data)
+
+        response = self.client.get("/answer/2026-10-01/0/2?user=alice")
+        self.assertEqual(response.status_code, 302)
+        response = self.client.get("/?user=alice")
+        self.assertIn(b"Quiz questions answered: 1", response.data)
+        self.assertEqual(self.client.get("/?user=bob").data.count(b"Quiz questions answered: 0"), 1)
+
+    def test_out_of_range_answers_redirect(self):
+        for path in ("/answer/2026-10-01/0/7?user=alice", "/answer/2026-10-01/3/0?user=alice"):
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, 302)
+            self.assertTrue(response.location.endswith("/?date=2026-10-01"))
+        self.assertIn(b"Quiz questions answered: 0", self.client.get("/?user=alice").data)
+
+    def test_learner_comes_from_the_session(self):
+        self.app.config["ALLOW_USER_PARAM"] = False
+        self.client.get("/answer/2026-10-01/0/2")
+        self.assertIn(b"Quiz questions answered: 1", self.client.get("/").data)
+        # A ?user= link cannot act as (or overwrite the session with) another learner
+        self.client.get("/answer/2026-10-01/0/2?user=alice")
+        self.assertIn(b"Quiz questions answered: 2", self.client.get("/?user=alice").data)
+        self.assertEqual(self.app.extensions["trackers"].get("alice").get_stats()["quizzes_answered"], 0)
+        # Forged cookies are not signed with the secret key
+        other = self.app.test_client()
+        other.set_cookie("session", "learner_id=alice")
+        self.assertIn(b"Quiz questions answered: 0", other.get("/").data)
+
+    def test_apps_are_independent(self):
+        other = create_app({"SECRET_KEY": "test", "CONTENT_DB": os.path.join(self.tmpdir.name, "other.sqlite3"),
+                            "TRACKER_SHARD_DIR": os.path.join(self.tmpdir.name, "other")})
+        self.assertEqual(other.test_client().get("/").status_code, 200)
+        self.assertIsNot(other.extensions["trackers"], self.app.extensions["trackers"])
+
+
+class TestJsonApi(WebTestCase):
+    def test_dates(self):
+        response = self.client.get("/api/dates")
+        self.assertEqual(response.get_json(), {"dates": ["2026-10-01"]})
+        self.assertEqual(response.headers["Cache-Control"], "public, max-age=60")
+
+    def test_day_etag_and_revalidation(self):
+        response = self.client.get("/api/days/2026-10-01")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["quiz_questions"], [QUIZ])
+        self.assertIn("immutable", response.headers["Cache-Control"])
+        etag = response.headers["ETag"]
+        self.assertFalse(etag.startswith("W/"))
+
+        response = self.client.get("/api/days/2026-10-01", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b"")
+        self.assertEqual(response.headers["ETag"], etag)
+
+        self.assertEqual(self.client.get("/api/days/2026-09-30").status_code, 404)
+
+    def test_gzip(self):
+        self.app.config["GZIP_MIN_SIZE"] = 0
+        plain = self.client.get("/api/days/2026-10-01")
+        response = self.client.get("/api/days/2026-10-01", headers={"Accept-Encoding": "gzip, deflate"})
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        self.assertEqual(json.loads(gzip.decompress(response.data)), plain.get_json())
+        # Each representation has its own strong ETag
+        self.assertNotEqual(response.headers["ETag"], plain.headers["ETag"])
+        revalidated = self.client.get("/api/days/2026-10-01", headers={
+            "Accept-Encoding": "gzip", "If-None-Match": response.headers["ETag"]})
+        self.assertEqual(revalidated.status_code, 304)
+
+    def test_stats(self):
+        self.assertEqual(self.client.get("/api/stats").status_code, 404)
+        self.client.get("/answer/2026-10-01/0/1?user=carol")
+        response = self.client.get("/api/stats?user=carol")
+        self.assertEqual(response.get_json()["stats"]["quizzes_answered"], 1)
+        self.assertEqual(response.headers["Cache-Control"], "private, no-cache")
+
+
+class TestSearch(WebTestCase):
+    def test_search(self):
+        response = self.client.get("/search?q=lambda")
+        self.assertEqual(response.status_code, 200)
+        results = response.get_json()["results"]
+        self.assertEqual([(r["date"], r["title"]) for r in results], [("2026-10-01", "AWS Lambda update")])
+        self.assertEqual(results[0]["topics"], ["Lambda"])
+        self.assertIn("ETag", response.headers)
+
+        self.assertEqual(self.client.get("/search?q=lambda&since=2026-10-02").get_json()["results"], [])
+        self.assertEqual(self.client.get("/search?q=").status_code, 400)
+        self.assertEqual(self.client.get("/search?q=lambda&until=yesterday").status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
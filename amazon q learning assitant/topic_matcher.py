@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+AWS Learning Assistant - Topic Matcher
+-------------------------------------
+This module finds the AWS services an update title is about. The service
+catalog (each topic with the names and aliases it goes by) is compiled
+once into a single regular expression whose alternatives are factored
+into a prefix trie, so a lowercased title is scanned in one pass.
+Terms only match as whole words: "ml" does not match inside "HTML" and
+"Config" does not match "configure".
+
+Titles that mention no service fall back to the first matching general
+category (Serverless, Containers, ...), and to "General" otherwise.
+"""
+
+import json
+import os
+import re
+
+# Optional JSON file with the service catalog (see load_catalog)
+TOPIC_CATALOG = os.getenv("TOPIC_CATALOG")
+
+# Topic -> terms that mention it. Ambiguous words (Config, Glue, Lex, Shield,
+# Comprehend) are only matched in their unambiguous forms.
+DEFAULT_SERVICES = {
+    "EC2": ["EC2", "Elastic Compute Cloud"],
+    "S3": ["S3", "Simple Storage Service"],
+    "Lambda": ["Lambda"],
+    "DynamoDB": ["DynamoDB"],
+    "RDS": ["RDS", "Relational Database Service"],
+    "Aurora": ["Aurora"],
+    "ECS": ["ECS", "Elastic Container Service"],
+    "EKS": ["EKS", "Elastic Kubernetes Service"],
+    "Fargate": ["Fargate"],
+    "SQS": ["SQS", "Simple Queue Service"],
+    "SNS": ["SNS", "Simple Notification Service"],
+    "CloudFormation": ["CloudFormation"],
+    "CloudWatch": ["CloudWatch"],
+    "IAM": ["IAM", "Identity and Access Management"],
+    "Cognito": ["Cognito"],
+    "API Gateway": ["API Gateway"],
+    "Step Functions": ["Step Functions"],
+    "Kinesis": ["Kinesis"],
+    "Glue": ["AWS Glue", "Glue Data Catalog", "Glue Studio", "Glue job", "Glue jobs", "Glue crawler", "Glue crawlers"],
+    "Athena": ["Athena"],
+    "Redshift": ["Redshift"],
+    "EMR": ["EMR", "Elastic MapReduce"],
+    "SageMaker": ["SageMaker"],
+    "Comprehend": ["Amazon Comprehend", "Comprehend Medical"],
+    "Rekognition": ["Rekognition"],
+    "Polly": ["Polly"],
+    "Lex": ["Amazon Lex", "Lex V2"],
+    "Bedrock": ["Bedrock"],
+    "CodeBuild": ["CodeBuild"],
+    "CodePipeline": ["CodePipeline"],
+    "CodeDeploy": ["CodeDeploy"],
+    "CloudFront": ["CloudFront"],
+    "Route 53": ["Route 53", "Route53"],
+    "VPC": ["VPC", "VPCs", "Virtual Private Cloud"],
+    "ELB": ["ELB", "Elastic Load Balancing"],
+    "ALB": ["ALB", "Application Load Balancer", "Application Load Balancers"],
+    "NLB": ["NLB", "Network Load Balancer", "Network Load Balancers"],
+    "WAF": ["WAF"],
+    "Shield": ["AWS Shield", "Shield Advanced"],
+    "GuardDuty": ["GuardDuty"],
+    "Security Hub": ["Security Hub"],
+    "CloudTrail": ["CloudTrail"],
+    "Config": ["AWS Config", "Config rule", "Config rules"],
+    "Secrets Manager": ["Secrets Manager"],
+    "KMS": ["KMS", "Key Management Service"],
+    "ACM": ["ACM", "Certificate Manager"],
+    "Lake Formation": ["Lake Formation"],
+    "EventBridge": ["EventBridge"],
+    "AppSync": ["AppSync"],
+    "Amplify": ["Amplify"],
+}
+
+# Fallback categories, in order of precedence
+DEFAULT_CATEGORIES = {
+    "Serverless": ["serverless"],
+    "Containers": ["container", "containers", "containerized"],
+    "Machine Learning": ["machine learning", "ML"],
+    "Databases": ["database", "databases", "DB"],
+    "Security": ["security"],
+}
+
+FALLBACK_TOPIC = "General"
+
+
+def load_catalog(path):
+    """
+    Load a topic catalog from a JSON file.
+
+    The file may define "services" and/or "categories", each an object
+    mapping a topic to the list of terms that mention it. A section that
+    is left out keeps its default.
+
+    Returns:
+        tuple: The (services, categories) mappings
+    """
+    with open(path, 'r') as f:
+        catalog = json.load(f)
+    return catalog.get("services", DEFAULT_SERVICES), catalog.get("categories", DEFAULT_CATEGORIES)
+
+
+def _normalize(term):
+    return " ".join(term.lower().split())
+
+
+def _trie_pattern(terms):
+    """Build a regex alternation of terms with common prefixes factored out."""
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        end = "" in node
+        branches = [
+            (r"\s+" if char == " " else re.escape(char)) + build(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 and not end else "(?:" + "|".join(branches) + ")"
+        # Prefer the longest match ("API Gateway" over "API"), fall back to the shorter term
+        return body + "?" if end else body
+
+    return build(trie)
+
+
+class TopicMatcher:
+    """Find catalog topics in titles with one precompiled regular expression."""
+
+    def __init__(self, services=None, categories=None):
+        services = DEFAULT_SERVICES if services is None else services
+        categories = DEFAULT_CATEGORIES if categories is None else categories
+        # Normalized term -> (is_category, rank, topic); services rank before all categories
+        self._terms = {}
+        for rank, (topic, terms) in enumerate(list(services.items()) + list(categories.items())):
+            is_category = rank >= len(services)
+            for term in terms:
+                self._terms.setdefault(_normalize(term), (is_category, rank, topic))
+        # Terms are lowercase and titles are lowercased once per match;
+        # this is much faster than re.IGNORECASE
+        self._pattern = re.compile(r"\b" + _trie_pattern(self._terms) + r"\b", re.ASCII)
+
+    def match(self, title):
+        """
+        Return the topics a title mentions.
+
+        Args:
+            title (str): An update title
+
+        Returns:
+            list: The services mentioned, in order of first mention; the
+            highest ranked category if there are none; or ["General"]
+        """
+        topics = []
+        category = None
+        for term in self._pattern.findall(title.lower()):
+            is_category, rank, topic = self._terms[" ".join(term.split())]
+            if not is_category:
+                if topic not in topics:
+                    topics.append(topic)
+            elif category is None or rank < category[0]:
+                category = (rank, topic)
+        if topics:
+            return topics
+        return [category[1] if category else FALLBACK_TOPIC]
+
+
+_default_matcher = None
+
+
+def get_topic_matcher():
+    """Return the shared TopicMatcher for TOPIC_CATALOG, compiling it on first use."""
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = TopicMatcher(*load_catalog(TOPIC_CATALOG)) if TOPIC_CATALOG else TopicMatcher()
+    return _default_matcher
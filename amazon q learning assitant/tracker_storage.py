@@ -0,0 +1,843 @@
+#!/usr/bin/env python3
+"""
+AWS Learning Assistant - Tracker Storage
+---------------------------------------
+Storage backends for the LearningTracker. Every change to the stats is
+an event (an update was read, a quiz was answered); a backend applies
+events to the stats and makes them durable.
+
+- JsonStatsStore rewrites the whole stats document on every change
+  (the original learning_stats.json format).
+- EventLogStore appends each event to a JSON Lines log, so recording is
+  an O(1) append no matter how long the history is, and periodically
+  compacts the log into a snapshot that startup replays from.
+- SQLiteStatsStore keeps the events in indexed SQLite tables and computes
+  the stats, topic ranking and streak with SQL aggregates.
+
+Stats documents are bounded: recent days keep their own activity entry,
+older ones are rolled up into weekly and then monthly buckets, and
+quiz_history keeps a bounded window of recent answers that refer to their
+question text by hash (see apply_retention).
+
+The file backends can be shared by several processes (the CLI run and the
+web interface). Writers take an advisory lock on ``<stats_file>.lock``,
+merge in whatever other processes wrote since they last looked, and
+replace files by atomic rename, so no increment is lost and a crash never
+leaves a half-written stats file behind.
+"""
+
+import contextlib
+import datetime
+import hashlib
+import itertools
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Retention tiers, counted back from the last activity date: days in the
+# raw window keep their own daily_activity entry, older days are rolled up
+# into weekly_activity (keyed by the Monday of the week) and then into
+# monthly_activity (keyed by the month the week starts in). Months past the
+# monthly window are dropped; the totals still count them.
+RAW_ACTIVITY_DAYS = 28
+WEEKLY_ACTIVITY_WEEKS = 26
+MONTHLY_ACTIVITY_MONTHS = 24
+# quiz_history keeps at most this many answers from the raw window
+QUIZ_HISTORY_LIMIT = 200
+
+ACTIVITY_TIERS = ("daily_activity", "weekly_activity", "monthly_activity")
+# Number of most studied topics kept ranked in top_topics
+TOP_TOPICS_SIZE = 10
+
+
+def default_stats():
+    """Return the stats of a learner with no activity."""
+    return {
+        "total_updates": 0,
+        "quizzes_answered": 0,
+        "correct_answers": 0,
+        "streak": 0,
+        "last_activity_date": None,
+        "topics": {},
+        "top_topics": [],
+        "related_topics": {},
+        "daily_activity": {},
+        "weekly_activity": {},
+        "monthly_activity": {},
+        "quiz_history": [],
+        "questions": {}
+    }
+
+
+def question_id(question):
+    """Return the short hash quiz_history uses to refer to a question's text."""
+    return hashlib.sha1(question.encode("utf-8")).hexdigest()[:12]
+
+
+def retention_cutoffs(last_date):
+    """
+    Return the (raw, weekly, monthly) cutoffs for a last activity date.
+
+    A day after the raw cutoff is kept as is, a day whose week starts after
+    the weekly cutoff is in a weekly bucket, and a week starting in a month
+    at or after the monthly cutoff is in a monthly bucket.
+    """
+    last = datetime.date.fromisoformat(last_date)
+    raw = last - datetime.timedelta(days=RAW_ACTIVITY_DAYS)
+    weekly = last - datetime.timedelta(weeks=WEEKLY_ACTIVITY_WEEKS)
+    months = last.year * 12 + last.month - MONTHLY_ACTIVITY_MONTHS
+    monthly = f"{months // 12:04d}-{months % 12 + 1:02d}"
+    return raw.isoformat(), weekly.isoformat(), monthly
+
+
+def _week_start(date):
+    day = datetime.date.fromisoformat(date)
+    return (day - datetime.timedelta(days=day.weekday())).isoformat()
+
+
+def _activity_key(date, cutoffs):
+    """Return the (tier, key) a day's activity belongs in, or None if it is dropped."""
+    raw, weekly, monthly = cutoffs
+    if date > raw:
+        return "daily_activity", date
+    week = _week_start(date)
+    if week > weekly:
+        return "weekly_activity", week
+    if week[:7] >= monthly:
+        return "monthly_activity", week[:7]
+    return None
+
+
+def _add_activity(bucket, activity):
+    for counter, value in activity.items():
+        bucket[counter] = bucket.get(counter, 0) + value
+
+
+def _topic_rank(topic, count):
+    return -count, topic
+
+
+def _update_top_topics(stats, topic):
+    """
+    Keep top_topics ranked after topic's count went up.
+
+    Counts only grow, so a topic outside the top can only enter it by
+    overtaking the last entry; this is O(TOP_TOPICS_SIZE).
+    """
+    count = stats["topics"][topic]
+    top = stats["top_topics"]
+    for entry in top:
+        if entry[0] == topic:
+            entry[1] = count
+            break
+    else:
+        if len(top) < TOP_TOPICS_SIZE:
+            top.append([topic, count])
+        elif _topic_rank(topic, count) < _topic_rank(*top[-1]):
+            top[-1] = [topic, count]
+        else:
+            return
+    top.sort(key=lambda entry: _topic_rank(*entry))
+
+
+def _add_cooccurrence(related, topics):
+    """Add one to the edge weight of every pair of distinct topics."""
+    for topic, other in itertools.permutations(sorted(set(topics)), 2):
+        neighbours = related.setdefault(topic, {})
+        neighbours[other] = neighbours.get(other, 0) + 1
+
+
+def upgrade_stats(stats):
+    """
+    Bring a loaded stats document up to the current format and retention.
+
+    Fills in the keys added since it was written, moves question text out
+    of quiz_history, rebuilds top_topics and applies retention.
+    """
+    for tier in ACTIVITY_TIERS:
+        stats.setdefault(tier, {})
+    stats.setdefault("questions", {})
+    stats.setdefault("related_topics", {})
+    stats["top_topics"] = [
+        list(entry) for entry in sorted(stats["topics"].items(), key=lambda entry: _topic_rank(*entry))
+    ][:TOP_TOPICS_SIZE]
+    for answer in stats["quiz_history"]:
+        if "question" in answer:
+            answer["question_id"] = question_id(answer["question"])
+            stats["questions"][answer["question_id"]] = answer.pop("question")
+    apply_retention(stats)
+
+
+def apply_retention(stats):
+    """Roll activity and quiz history that aged out of their tier into the next one."""
+    if stats["last_activity_date"] is None:
+        return
+
+    cutoffs = retention_cutoffs(stats["last_activity_date"])
+    for tier in ACTIVITY_TIERS:
+        entries = stats[tier]
+        for key in list(entries):
+            if tier == "monthly_activity":
+                target = (tier, key) if key >= cutoffs[2] else None
+            else:
+                # A week's key is its Monday, which places it like a day
+                target = _activity_key(key, cutoffs)
+            if target == (tier, key):
+                continue
+            activity = entries.pop(key)
+            if target is not None:
+                _add_activity(stats[target[0]].setdefault(target[1], {}), activity)
+
+    history = stats["quiz_history"]
+    keep = len(history)
+    while keep > QUIZ_HISTORY_LIMIT or (keep and history[-keep]["date"] <= cutoffs[0]):
+        keep -= 1
+    if keep < len(history):
+        del history[:len(history) - keep]
+        referenced = {answer["question_id"] for answer in history}
+        stats["questions"] = {qid: text for qid, text in stats["questions"].items() if qid in referenced}
+
+
+def _update_streak(stats, date):
+    """Update the learning streak for activity on the given date."""
+    last_date = stats["last_activity_date"]
+
+    if last_date is None:
+        # First activity
+        stats["streak"] = 1
+    else:
+        # Calculate the difference in days
+        diff = (datetime.date.fromisoformat(date) - datetime.date.fromisoformat(last_date)).days
+
+        if diff == 0:
+            # Same day, streak unchanged
+            pass
+        elif diff == 1:
+            # Consecutive day, increment streak
+            stats["streak"] += 1
+        elif diff > 1:
+            # Streak broken
+            stats["streak"] = 1
+        else:
+            # An older event replayed out of order does not move the streak
+            return
+
+    # Update last activity date
+    stats["last_activity_date"] = date
+
+
+def _activity(stats, date):
+    """Return the activity counters of the tier bucket a day belongs in."""
+    if stats["last_activity_date"] is None or date >= stats["last_activity_date"]:
+        target = ("daily_activity", date)
+    else:
+        target = _activity_key(date, retention_cutoffs(stats["last_activity_date"]))
+    if target is None:
+        # Too old to be kept anywhere; only the totals count it
+        return {"updates_read": 0, "quizzes_answered": 0, "correct_answers": 0}
+    return stats[target[0]].setdefault(target[1], {
+        "updates_read": 0,
+        "quizzes_answered": 0,
+        "correct_answers": 0
+    })
+
+
+def apply_event(stats, event):
+    """
+    Apply a tracker event to a stats document in place.
+
+    Args:
+        stats (dict): The stats to update
+        event (dict): An "update_read" or "quiz_answer" event
+    """
+    date = event["date"]
+    if event["type"] == "update_read":
+        stats["total_updates"] += 1
+        for topic in event["topics"]:
+            stats["topics"][topic] = stats["topics"].get(topic, 0) + 1
+            _update_top_topics(stats, topic)
+        _add_cooccurrence(stats["related_topics"], event["topics"])
+        _activity(stats, date)["updates_read"] += 1
+    elif event["type"] == "quiz_answer":
+        stats["quizzes_answered"] += 1
+        day = _activity(stats, date)
+        day["quizzes_answered"] += 1
+        if event["is_correct"]:
+            stats["correct_answers"] += 1
+            day["correct_answers"] += 1
+        qid = question_id(event["question"])
+        stats["questions"][qid] = event["question"]
+        stats["quiz_history"].append({
+            "date": date,
+            "question_id": qid,
+            "user_answer": event["user_answer"],
+            "correct_answer": event["correct_answer"],
+            "is_correct": event["is_correct"]
+        })
+    else:
+        raise ValueError(f"Unknown tracker event type: {event['type']}")
+
+    last_date = stats["last_activity_date"]
+    _update_streak(stats, date)
+    if stats["last_activity_date"] != last_date or len(stats["quiz_history"]) > QUIZ_HISTORY_LIMIT:
+        apply_retention(stats)
+
+
+def _write_json(path, data, **kwargs):
+    """Write JSON to a temporary file and rename it over path."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, **kwargs)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _read_json(path):
+    """
+    Read a JSON file, returning None if it does not exist.
+
+    A file that cannot be parsed is renamed to ``<path>.corrupt-<timestamp>``
+    so it can be inspected or restored instead of being overwritten.
+    """
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        backup = f"{path}.corrupt-{time.strftime('%Y%m%d%H%M%S')}"
+        os.replace(path, backup)
+        print(f"Warning: {path} is corrupt ({e}); moved it to {backup}")
+        return None
+
+
+def _file_signature(path):
+    """Return what identifies the current version of a file, or None if it is missing."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+@contextlib.contextmanager
+def file_lock(path):
+    """
+    Hold an exclusive advisory lock on path for the duration of the block.
+
+    Uses flock on POSIX and msvcrt.locking on Windows. The lock file is
+    created if needed and left in place.
+    """
+    with open(path, 'a') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after about 10 seconds
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class DictStatsStore:
+    """Base class for stores that keep the whole stats document in memory."""
+
+    stats = None
+
+    def get_stats(self):
+        return self.stats
+
+    def top_topics(self, limit):
+        """Return the limit most studied (topic, count) pairs, most studied first."""
+        stats = self.get_stats()
+        if limit <= TOP_TOPICS_SIZE:
+            return [tuple(entry) for entry in stats["top_topics"][:limit]]
+        return sorted(stats["topics"].items(), key=lambda entry: _topic_rank(*entry))[:limit]
+
+    def related_topics(self, topics):
+        """Return the co-occurrence weights {other: weight} of each of topics."""
+        related = self.get_stats()["related_topics"]
+        return {topic: related.get(topic, {}) for topic in topics}
+
+    def close(self):
+        pass
+
+
+class JsonStatsStore(DictStatsStore):
+    """
+    Keep the stats in one JSON document that is rewritten on every change.
+
+    Each write re-reads the document under the file lock if another
+    process has replaced it, applies the new events on top and renames a
+    complete new document into place.
+    """
+
+    def __init__(self, stats_file='learning_stats.json'):
+        self.stats_file = stats_file
+        self.lock_file = f"{stats_file}.lock"
+        with file_lock(self.lock_file):
+            self._reload()
+
+    def _reload(self):
+        self.signature = _file_signature(self.stats_file)
+        self.stats = _read_json(self.stats_file) or default_stats()
+        upgrade_stats(self.stats)
+
+    def _refresh(self):
+        """Reload the stats if another process has written them since."""
+        if _file_signature(self.stats_file) != self.signature:
+            self._reload()
+
+    def get_stats(self):
+        self._refresh()
+        return self.stats
+
+    def record(self, events):
+        """Apply events to the latest stats on disk and save them."""
+        with file_lock(self.lock_file):
+            self._refresh()
+            for event in events:
+                apply_event(self.stats, event)
+            _write_json(self.stats_file, self.stats, indent=2)
+            self.signature = _file_signature(self.stats_file)
+
+
+class EventLogStore(DictStatsStore):
+    """
+    Keep the stats as a snapshot plus an append-only JSON Lines event log.
+
+    Each event is appended to ``<base>.events.jsonl`` with a sequence number.
+    Every snapshot_interval events the current stats are written to
+    ``<base>.snapshot.json`` together with the last sequence number applied,
+    and the log is truncated. Loading reads the snapshot and replays the
+    events after it. A missing snapshot is seeded from an existing stats
+    file in the JsonStatsStore format.
+
+    Before appending, a writer replays the events other processes appended
+    since it last read the log (or reloads everything if the log was
+    compacted meanwhile), so sequence numbers stay unique.
+    """
+
+    def __init__(self, stats_file='learning_stats.json', snapshot_interval=1000):
+        base, _ = os.path.splitext(stats_file)
+        self.stats_file = stats_file
+        self.snapshot_file = f"{base}.snapshot.json"
+        self.log_file = f"{base}.events.jsonl"
+        self.lock_file = f"{stats_file}.lock"
+        self.snapshot_interval = snapshot_interval
+        with file_lock(self.lock_file):
+            self._load()
+        # Binary, so offset counts the bytes on disk (no newline translation)
+        self._log = open(self.log_file, 'ab')
+
+    def _load(self):
+        self.snapshot_signature = _file_signature(self.snapshot_file)
+        snapshot = _read_json(self.snapshot_file)
+        if snapshot is None:
+            snapshot = {"last_seq": 0, "stats": _read_json(self.stats_file) or default_stats()}
+        self.stats = snapshot["stats"]
+        upgrade_stats(self.stats)
+        self.last_seq = snapshot["last_seq"]
+        self.pending = 0
+        self.offset = 0
+        self._replay()
+
+    def _replay(self):
+        """Apply the events appended to the log after self.offset."""
+        try:
+            with open(self.log_file, 'rb') as f:
+                f.seek(self.offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+
+        # Drop a torn final line left by a crash mid-append, so the next
+        # append starts on a fresh line
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            with open(self.log_file, 'r+b') as f:
+                f.truncate(self.offset + complete)
+
+        for line in data[:complete].splitlines():
+            event = json.loads(line)
+            if event["seq"] > self.last_seq:
+                apply_event(self.stats, event)
+                self.last_seq = event["seq"]
+                self.pending += 1
+        self.offset += complete
+
+    def _catch_up(self):
+        """Pick up what other processes wrote; call with the file lock held."""
+        if _file_signature(self.snapshot_file) != self.snapshot_signature:
+            self._load()
+        else:
+            self._replay()
+
+    def get_stats(self):
+        with file_lock(self.lock_file):
+            self._catch_up()
+        return self.stats
+
+    def record(self, events):
+        """Apply events and append them to the log."""
+        with file_lock(self.lock_file):
+            self._catch_up()
+            lines = []
+            for event in events:
+                self.last_seq += 1
+                event = dict(event, seq=self.last_seq)
+                apply_event(self.stats, event)
+                lines.append(json.dumps(event) + "\n")
+            data = "".join(lines).encode("utf-8")
+            self._log.write(data)
+            self._log.flush()
+            self.offset += len(data)
+            self.pending += len(lines)
+            if self.pending >= self.snapshot_interval:
+                self._compact()
+
+    def compact(self):
+        """Write a snapshot of the current stats and truncate the log."""
+        with file_lock(self.lock_file):
+            self._catch_up()
+            self._compact()
+
+    def _compact(self):
+        _write_json(self.snapshot_file, {"last_seq": self.last_seq, "stats": self.stats})
+        self.snapshot_signature = _file_signature(self.snapshot_file)
+        # Events at or below last_seq are skipped on replay, so a crash
+        # before the truncate below only leaves redundant lines behind
+        self._log.truncate(0)
+        self.offset = 0
+        self.pending = 0
+
+    def close(self):
+        self._log.close()
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS updates_read (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    title TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_updates_read_date ON updates_read (date);
+CREATE TABLE IF NOT EXISTS quiz_answers (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    question TEXT NOT NULL,
+    user_answer TEXT,
+    correct_answer TEXT,
+    is_correct INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_quiz_answers_date ON quiz_answers (date);
+CREATE TABLE IF NOT EXISTS topics (
+    topic TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_topics_count ON topics (count DESC, topic);
+CREATE TABLE IF NOT EXISTS topic_pairs (
+    topic TEXT NOT NULL,
+    related TEXT NOT NULL,
+    weight INTEGER NOT NULL,
+    PRIMARY KEY (topic, related)
+);
+CREATE TABLE IF NOT EXISTS daily_activity (
+    date TEXT PRIMARY KEY,
+    updates_read INTEGER NOT NULL DEFAULT 0,
+    quizzes_answered INTEGER NOT NULL DEFAULT 0,
+    correct_answers INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+def _rolled_up_days(stats):
+    """
+    Yield (date, activity) rows for every tier of a stats document.
+
+    Weekly buckets become a row on their Monday and monthly buckets a row
+    on the first Monday of the month, so they fall back into the same
+    buckets when the stats are rolled up again.
+    """
+    yield from stats["daily_activity"].items()
+    yield from stats["weekly_activity"].items()
+    for month, activity in stats["monthly_activity"].items():
+        first = datetime.date.fromisoformat(month + "-01")
+        yield (first + datetime.timedelta(days=-first.weekday() % 7)).isoformat(), activity
+
+
+# Consecutive days of activity after :since ending at the most recent
+# active day, and the first of those days
+STREAK_QUERY = """
+WITH days AS (
+    SELECT date, julianday(date) - ROW_NUMBER() OVER (ORDER BY date) AS run
+    FROM daily_activity WHERE date > :since
+)
+SELECT COUNT(*), MIN(date) FROM days
+WHERE run = (SELECT run FROM days ORDER BY date DESC LIMIT 1)
+"""
+
+
+# Daily activity grouped into the retention tiers of apply_retention
+ACTIVITY_TIERS_QUERY = """
+WITH days AS (
+    SELECT *, date(date, 'weekday 0', '-6 days') AS week FROM daily_activity
+), tiered AS (
+    SELECT CASE
+               WHEN date > :raw THEN 'daily_activity'
+               WHEN week > :weekly THEN 'weekly_activity'
+               ELSE 'monthly_activity'
+           END AS tier,
+           CASE
+               WHEN date > :raw THEN date
+               WHEN week > :weekly THEN week
+               ELSE substr(week, 1, 7)
+           END AS key,
+           updates_read, quizzes_answered, correct_answers
+    FROM days
+    WHERE date > :raw OR week > :weekly OR substr(week, 1, 7) >= :monthly
+)
+SELECT tier, key, SUM(updates_read), SUM(quizzes_answered), SUM(correct_answers)
+FROM tiered GROUP BY tier, key ORDER BY tier, key
+"""
+
+
+class SQLiteStatsStore:
+    """
+    Keep tracker events in SQLite and compute the stats with SQL.
+
+    The database lives next to the stats file (``<base>.sqlite3``), runs
+    in WAL mode and indexes activity by date and topics by count. On first
+    use an existing JSON stats file is migrated into it. The tables keep
+    the full history; get_stats() rolls it up into the same retention
+    tiers as the other backends.
+
+    A migrated file only has rolled-up activity for older days, and none
+    for months retention already dropped, so the migration also saves the
+    file's totals and streak in meta as a baseline that get_stats()
+    builds on.
+    """
+
+    def __init__(self, stats_file='learning_stats.json'):
+        base, _ = os.path.splitext(stats_file)
+        self.stats_file = stats_file
+        self.db_file = f"{base}.sqlite3"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_file, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(SQLITE_SCHEMA)
+        self._migrate_json()
+
+    def _migrate_json(self):
+        """Import an existing JSON stats file the first time the database is used."""
+        with self._lock, self._conn:
+            # Take the write lock up front so two processes cannot both migrate
+            self._conn.execute("BEGIN IMMEDIATE")
+            if self._conn.execute("SELECT 1 FROM meta WHERE key = 'migrated'").fetchone():
+                return
+            stats = _read_json(self.stats_file)
+            if stats:
+                upgrade_stats(stats)
+                rows = [
+                    (date, day.get("updates_read", 0), day.get("quizzes_answered", 0), day.get("correct_answers", 0))
+                    for date, day in _rolled_up_days(stats)
+                ]
+                self._conn.executemany(
+                    "INSERT INTO daily_activity (date, updates_read, quizzes_answered, correct_answers)"
+                    " VALUES (?, ?, ?, ?) ON CONFLICT (date) DO UPDATE SET"
+                    " updates_read = updates_read + excluded.updates_read,"
+                    " quizzes_answered = quizzes_answered + excluded.quizzes_answered,"
+                    " correct_answers = correct_answers + excluded.correct_answers",
+                    rows,
+                )
+                # Activity in the months retention dropped only survives in the totals
+                baseline = {
+                    counter: stats[total] - sum(row[column] for row in rows)
+                    for column, (total, counter) in enumerate(
+                        (("total_updates", "updates_read"), ("quizzes_answered", "quizzes_answered"),
+                         ("correct_answers", "correct_answers")), start=1)
+                }
+                baseline.update(streak=stats["streak"], last_activity_date=stats["last_activity_date"])
+                self._conn.execute("INSERT INTO meta (key, value) VALUES ('baseline', ?)", (json.dumps(baseline),))
+                self._conn.executemany(
+                    "INSERT INTO topics (topic, count) VALUES (?, ?)",
+                    list(stats.get("topics", {}).items()),
+                )
+                self._conn.executemany(
+                    "INSERT INTO topic_pairs (topic, related, weight) VALUES (?, ?, ?)",
+                    [(topic, other, weight) for topic, neighbours in stats["related_topics"].items()
+                     for other, weight in neighbours.items()],
+                )
+                self._conn.executemany(
+                    "INSERT INTO quiz_answers (date, question, user_answer, correct_answer, is_correct)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    [(q["date"], stats["questions"][q["question_id"]], q.get("user_answer"), q.get("correct_answer"),
+                      int(q["is_correct"]))
+                     for q in stats["quiz_history"]],
+                )
+            self._conn.execute("INSERT INTO meta (key, value) VALUES ('migrated', ?)", (self.stats_file,))
+
+    def record(self, events):
+        """Insert events and update the topic and daily counters."""
+        with self._lock, self._conn:
+            for event in events:
+                date = event["date"]
+                self._conn.execute("INSERT OR IGNORE INTO daily_activity (date) VALUES (?)", (date,))
+                if event["type"] == "update_read":
+                    self._conn.execute("INSERT INTO updates_read (date, title) VALUES (?, ?)",
+                                       (date, event.get("title")))
+                    self._conn.executemany(
+                        "INSERT INTO topics (topic, count) VALUES (?, 1)"
+                        " ON CONFLICT (topic) DO UPDATE SET count = count + 1",
+                        [(topic,) for topic in event["topics"]],
+                    )
+                    self._conn.executemany(
+                        "INSERT INTO topic_pairs (topic, related, weight) VALUES (?, ?, 1)"
+                        " ON CONFLICT (topic, related) DO UPDATE SET weight = weight + 1",
+                        list(itertools.permutations(sorted(set(event["topics"])), 2)),
+                    )
+                    self._conn.execute(
+                        "UPDATE daily_activity SET updates_read = updates_read + 1 WHERE date = ?", (date,))
+                elif event["type"] == "quiz_answer":
+                    correct = int(bool(event["is_correct"]))
+                    self._conn.execute(
+                        "INSERT INTO quiz_answers (date, question, user_answer, correct_answer, is_correct)"
+                        " VALUES (?, ?, ?, ?, ?)",
+                        (date, event["question"], event["user_answer"], event["correct_answer"], correct),
+                    )
+                    self._conn.execute(
+                        "UPDATE daily_activity SET quizzes_answered = quizzes_answered + 1,"
+                        " correct_answers = correct_answers + ? WHERE date = ?",
+                        (correct, date),
+                    )
+                else:
+                    raise ValueError(f"Unknown tracker event type: {event['type']}")
+
+    def get_stats(self):
+        """Build the stats document from SQL aggregates."""
+        with self._lock:
+            totals = self._conn.execute(
+                "SELECT COALESCE(SUM(updates_read), 0), COALESCE(SUM(quizzes_answered), 0),"
+                " COALESCE(SUM(correct_answers), 0), MAX(date) FROM daily_activity"
+            ).fetchone()
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'baseline'").fetchone()
+            baseline = json.loads(row[0]) if row else None
+            since = baseline["last_activity_date"] if baseline and baseline["last_activity_date"] else ""
+            streak, streak_start = self._conn.execute(STREAK_QUERY, {"since": since}).fetchone()
+            topics = self._conn.execute("SELECT topic, count FROM topics ORDER BY count DESC, topic").fetchall()
+            pairs = self._conn.execute("SELECT topic, related, weight FROM topic_pairs").fetchall()
+            stats = default_stats()
+            if totals[3] is not None:
+                raw, weekly, monthly = retention_cutoffs(totals[3])
+                # Bucket each day into its retention tier the same way apply_retention does
+                activity = self._conn.execute(ACTIVITY_TIERS_QUERY, {
+                    "raw": raw, "weekly": weekly, "monthly": monthly,
+                }).fetchall()
+                history = self._conn.execute(
+                    "SELECT date, question, user_answer, correct_answer, is_correct FROM ("
+                    " SELECT * FROM quiz_answers WHERE date > ? ORDER BY id DESC LIMIT ?"
+                    ") ORDER BY id",
+                    (raw, QUIZ_HISTORY_LIMIT),
+                ).fetchall()
+            else:
+                activity = history = []
+        if baseline:
+            totals = (totals[0] + baseline["updates_read"], totals[1] + baseline["quizzes_answered"],
+                      totals[2] + baseline["correct_answers"], totals[3])
+            if since:
+                # The migrated streak ends on the migrated last day; continue it
+                # if the activity since then starts the day after
+                next_day = (datetime.date.fromisoformat(since) + datetime.timedelta(days=1)).isoformat()
+                if not streak:
+                    streak = baseline["streak"]
+                elif streak_start == next_day:
+                    streak += baseline["streak"]
+        stats.update({
+            "total_updates": totals[0],
+            "quizzes_answered": totals[1],
+            "correct_answers": totals[2],
+            "streak": streak,
+            "last_activity_date": totals[3],
+            "topics": dict(topics),
+            "top_topics": [list(entry) for entry in topics[:TOP_TOPICS_SIZE]],
+        })
+        for topic, other, weight in pairs:
+            stats["related_topics"].setdefault(topic, {})[other] = weight
+        for tier, key, u, q, c in activity:
+            stats[tier][key] = {"updates_read": u, "quizzes_answered": q, "correct_answers": c}
+        for date, question, user_answer, correct_answer, ok in history:
+            qid = question_id(question)
+            stats["questions"][qid] = question
+            stats["quiz_history"].append({
+                "date": date, "question_id": qid, "user_answer": user_answer,
+                "correct_answer": correct_answer, "is_correct": bool(ok),
+            })
+        return stats
+
+    def top_topics(self, limit):
+        """Return the limit most studied (topic, count) pairs, most studied first."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT topic, count FROM topics ORDER BY count DESC, topic LIMIT ?", (limit,)
+            ).fetchall()
+
+    def related_topics(self, topics):
+        """Return the co-occurrence weights {other: weight} of each of topics."""
+        related = {topic: {} for topic in topics}
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT topic, related, weight FROM topic_pairs WHERE topic IN ({', '.join('?' * len(topics))})",
+                list(topics),
+            ).fetchall()
+        for topic, other, weight in rows:
+            related[topic][other] = weight
+        return related
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+STORES = {
+    "json": JsonStatsStore,
+    "eventlog": EventLogStore,
+    "sqlite": SQLiteStatsStore,
+}
+
+
+def open_store(kind, stats_file):
+    """Create the storage backend named kind for stats_file."""
+    try:
+        store_class = STORES[kind]
+    except KeyError:
+        raise ValueError(f"Unknown tracker storage '{kind}' (expected one of: {', '.join(STORES)})")
+    return store_class(stats_file)
@@ -3,195 +3,172 @@
 AWS Learning Assistant - Web Interface
 -------------------------------------
 A simple Flask web application to view past AWS updates and quiz results.
+
+create_app() builds the application; importing this module has no side
+effects. Run the development server with ``python web_interface.py`` and
+serve it in production through ``wsgi.py`` (e.g. ``gunicorn wsgi:app``).
 """
 
-from flask import Flask, render_template, request, redirect, url_for, flash
+from flask import Flask, Response, current_app, jsonify, render_template, request, redirect, url_for, flash, make_response, session
 import os
 import json
-import glob
-from datetime import datetime
+import gzip
+import hashlib
+import secrets
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
 
-# Try to import the learning tracker
-try:
-    from learning_tracker import LearningTracker
-    TRACKER_AVAILABLE = True
-    tracker = LearningTracker()
-    print("Learning tracker is available and will be used.")
-except (ImportError, Exception) as e:
-    TRACKER_AVAILABLE = False
-    print(f"Learning tracker is not available: {e}")
-    print("Learning progress will not be tracked.")
+from answer_queue import ANSWER_QUEUE_SIZE, AnswerQueue
+from content_cache import DailyContentCache
+from content_store import ContentStore
 
-app = Flask(__name__)
+# Session key that identifies a learner between visits
+USER_SESSION_KEY = 'learner_id'
 
-# Create templates directory if it doesn't exist
-os.makedirs('templates', exist_ok=True)
+# Parsed daily documents kept in memory, and how often (seconds) the
+# content store is checked for changes
+CONTENT_CACHE_SIZE = int(os.getenv("CONTENT_CACHE_SIZE", "32"))
+CONTENT_POLL_INTERVAL = float(os.getenv("CONTENT_POLL_INTERVAL", "1"))
 
-# Create a basic HTML template
-with open('templates/index.html', 'w') as f:
-    f.write("""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>AWS Learning Assistant</title>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <style>
-        body {
-            font-family: Arial, sans-serif;
-            line-height: 1.6;
-            margin: 0;
-            padding: 20px;
-            background-color: #f5f5f5;
-        }
-        .container {
-            max-width: 800px;
-            margin: 0 auto;
-            background-color: white;
-            padding: 20px;
-            border-radius: 5px;
-            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-        }
-        .header {
-            background-color: #232F3E;
-            color: white;
-            padding: 10px 20px;
-            margin: -20px -20px 20px;
-            border-radius: 5px 5px 0 0;
-        }
-        .summary {
-            margin: 20px 0;
-            padding: 15px;
-            border-left: 4px solid #FF9900;
-            background-color: #fafafa;
-        }
-        .quiz {
-            background-color: #f0f8ff;
-            padding: 15px;
-            margin: 20px 0;
-            border-radius: 5px;
-            border: 1px solid #ddd;
-        }
-        .options {
-            margin-left: 20px;
-        }
-        .correct {
-            color: green;
-            font-weight: bold;
-        }
-        .date-selector {
-            margin: 20px 0;
-        }
-        select {
-            padding: 8px;
-            border-radius: 4px;
-            border: 1px solid #ddd;
-        }
-        button {
-            padding: 8px 16px;
-            background-color: #FF9900;
-            color: white;
-            border: none;
-            border-radius: 4px;
-            cursor: pointer;
-        }
-        button:hover {
-            background-color: #e68a00;
-        }
-        .stats {
-            margin-top: 20px;
-            padding: 15px;
-            background-color: #f0f0f0;
-            border-radius: 5px;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>AWS Learning Assistant</h1>
-        </div>
-        
-        <div class="date-selector">
-            <form method="GET" action="/">
-                <label for="date">Select Date:</label>
-                <select name="date" id="date">
-                    {% for date in available_dates %}
-                        <option value="{{ date }}" {% if date == selected_date %}selected{% endif %}>{{ date }}</option>
-                    {% endfor %}
-                </select>
-                <button type="submit">View</button>
-            </form>
-        </div>
-        
-        {% if content %}
-            <h2>AWS Updates for {{ selected_date }}</h2>
-            
-            {% for summary in content.summaries %}
-                <div class="summary">
-                    <h3>{{ summary.title }}</h3>
-                    <p>{{ summary.summary }}</p>
-                    <p><a href="{{ summary.link }}" target="_blank">Read more</a></p>
-                </div>
-            {% endfor %}
-            
-            <div class="quiz">
-                <h2>Quiz Question</h2>
-                <p><strong>{{ content.quiz_question.question }}</strong></p>
-                <div class="options">
-                    {% for option in content.quiz_question.options %}
-                        <p {% if option == content.quiz_question.correct_answer %}class="correct"{% endif %}>
-                            {{ loop.index | chr }}. {{ option }}
-                            {% if option == content.quiz_question.correct_answer %}(Correct Answer){% endif %}
-                        </p>
-                    {% endfor %}
-                </div>
-                <p>Source: <a href="{{ content.quiz_question.source }}" target="_blank">Read the article</a></p>
-            </div>
-            
-            {% if stats %}
-            <div class="stats">
-                <h2>Your Learning Stats</h2>
-                <p>Total updates read: {{ stats.total_updates }}</p>
-                <p>Quiz questions answered: {{ stats.quizzes_answered }}</p>
-                <p>Correct answers: {{ stats.correct_answers }}</p>
-                <p>Learning streak: {{ stats.streak }} days</p>
-            </div>
-            {% endif %}
-        {% else %}
-            <p>No content available for the selected date.</p>
-        {% endif %}
-    </div>
-</body>
-</html>
-    """)
+# JSON API responses smaller than this are not worth compressing
+GZIP_MIN_SIZE = 512
+# Past days never change, so clients and proxies may keep them for good
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+RECENT_CACHE_CONTROL = "public, max-age=60"
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+# Search results per request, by default and at most
+SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
 
-# Create a template for the Jinja2 filter
-@app.template_filter('chr')
 def chr_filter(number):
     return chr(64 + number)  # A=1, B=2, etc.
 
-@app.route('/')
+def create_app(config=None):
+    """
+    Create the web application.
+    
+    Args:
+        config (dict): Settings that override the defaults and environment
+    
+    Returns:
+        Flask: The application, with its own content cache and trackers
+    """
+    app = Flask(__name__)
+    app.config.update(
+        # The session (learner id, flash messages) is signed with this key; workers must share it
+        SECRET_KEY=os.getenv("SECRET_KEY"),
+        PERMANENT_SESSION_LIFETIME=timedelta(days=365),
+        SESSION_COOKIE_SAMESITE='Lax',
+        # Let ?user=<id> pick the learner; only for development and tests
+        ALLOW_USER_PARAM=False,
+        CONTENT_DB=None,
+        CONTENT_CACHE_SIZE=CONTENT_CACHE_SIZE,
+        CONTENT_POLL_INTERVAL=CONTENT_POLL_INTERVAL,
+        GZIP_MIN_SIZE=GZIP_MIN_SIZE,
+        TRACKER_SHARD_DIR=None,
+        TRACKER_STATS_FILE='learning_stats.json',
+        ANSWER_QUEUE_SIZE=ANSWER_QUEUE_SIZE,
+    )
+    app.config.update(config or {})
+    if not app.config["SECRET_KEY"]:
+        print("SECRET_KEY is not set; using a random key for this process only.")
+        app.config["SECRET_KEY"] = secrets.token_hex(32)
+    
+    app.extensions["daily_content"] = DailyContentCache(
+        ContentStore(app.config["CONTENT_DB"]),
+        max_documents=app.config["CONTENT_CACHE_SIZE"],
+        poll_interval=app.config["CONTENT_POLL_INTERVAL"],
+    )
+    
+    # Try to import the learning tracker
+    try:
+        from learning_tracker import TrackerPool, TRACKER_FLUSH_INTERVAL
+        # One tracker per learner, loaded on demand; answers are written behind
+        # every TRACKER_FLUSH_INTERVAL seconds when it is set
+        app.extensions["trackers"] = TrackerPool(
+            shard_dir=app.config["TRACKER_SHARD_DIR"],
+            default_stats_file=app.config["TRACKER_STATS_FILE"],
+            flush_interval=app.config.get("TRACKER_FLUSH_INTERVAL", TRACKER_FLUSH_INTERVAL),
+        )
+        # Answers are recorded by a background worker, not in the request
+        app.extensions["answers"] = AnswerQueue(app.extensions["trackers"], app.config["ANSWER_QUEUE_SIZE"])
+    except (ImportError, Exception) as e:
+        app.extensions["trackers"] = None
+        app.extensions["answers"] = None
+        print(f"Learning tracker is not available: {e}")
+        print("Learning progress will not be tracked.")
+    
+    app.add_template_filter(chr_filter, 'chr')
+    app.add_url_rule('/', 'index', index)
+    app.add_url_rule('/answer/<date>/<int:answer_index>', 'submit_answer', submit_answer)
+    app.add_url_rule('/answer/<date>/<int:question_index>/<int:answer_index>', 'submit_answer', submit_answer)
+    app.add_url_rule('/healthz', 'healthz', healthz)
+    
+    # Serialized (and compressed) day documents for the JSON API
+    app.extensions["api_day_bodies"] = (threading.Lock(), OrderedDict())
+    app.add_url_rule('/api/dates', 'api_dates', api_dates)
+    app.add_url_rule('/api/days/<date>', 'api_day', api_day)
+    app.add_url_rule('/api/stats', 'api_stats', api_stats)
+    app.add_url_rule('/search', 'search', search)
+    return app
+
+def get_daily_content():
+    return current_app.extensions["daily_content"]
+
+def get_trackers():
+    """Return the app's TrackerPool, or None if the tracker is not available."""
+    return current_app.extensions["trackers"]
+
+def get_answers():
+    """Return the app's AnswerQueue, or None if the tracker is not available."""
+    return current_app.extensions["answers"]
+
+def get_tracker(user_id):
+    """Return a learner's tracker once their queued answers are recorded."""
+    get_answers().wait_for(user_id)
+    return get_trackers().get(user_id)
+
+def get_user_id(create=True):
+    """
+    Identify the learner from the signed session.
+    
+    ?user=<id> is only honored when ALLOW_USER_PARAM is set, so a link
+    cannot make a visitor act as another learner. Without an id in the
+    session a new random one is returned, or None if create is False.
+    """
+    user_id = request.args.get('user') if current_app.config["ALLOW_USER_PARAM"] else None
+    user_id = user_id or session.get(USER_SESSION_KEY)
+    if user_id is None and create:
+        user_id = uuid.uuid4().hex
+    return user_id
+
+def remember_user(response, user_id):
+    """Keep the learner id in the session if it is not already there."""
+    if session.get(USER_SESSION_KEY) != user_id:
+        session[USER_SESSION_KEY] = user_id
+        session.permanent = True
+    return response
+
+
 def index():
-    # Get all available dates from the JSON files
-    json_files = glob.glob('aws_learning_*.json')
-    available_dates = [os.path.basename(f).replace('aws_learning_', '').replace('.json', '') for f in json_files]
-    available_dates.sort(reverse=True)  # Most recent first
+    user_id = get_user_id()
+    
+    # Get all available dates (most recent first) from the cached index
+    daily_content = get_daily_content()
+    available_dates = daily_content.dates()
     
     # Get the selected date or default to the most recent
     selected_date = request.args.get('date', available_dates[0] if available_dates else None)
     
-    content = None
-    if selected_date:
-        try:
-            with open(f'aws_learning_{selected_date}.json', 'r') as f:
-                content = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            content = None
+    content = daily_content.get(selected_date) if selected_date else None
     
     # Load learning stats if available
     stats = None
-    if TRACKER_AVAILABLE:
+    trackers = get_trackers()
+    if trackers is not None:
+        tracker = get_tracker(user_id)
         stats = tracker.get_stats()
         
         # Get topic recommendations
@@ -213,29 +190,36 @@ def index():
         
         recommendations = ["EC2", "S3", "Lambda"]  # Default recommendations
     
-    return render_template('index.html', 
+    response = make_response(render_template('index.html', 
                           available_dates=available_dates,
                           selected_date=selected_date,
                           content=content,
                           stats=stats,
-                          recommendations=recommendations)
+                          recommendations=recommendations))
+    return remember_user(response, user_id)
 
-@app.route('/answer/<date>/<int:answer_index>')
-def submit_answer(date, answer_index):
-    # Load the content for the given date
-    try:
-        with open(f'aws_learning_{date}.json', 'r') as f:
-            content = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
+def submit_answer(date, answer_index, question_index=0):
+    user_id = get_user_id()
+    
+    # Look up the day's quiz set in the in-memory answer key index
+    quiz_questions = get_daily_content().quiz_questions(date)
+    if quiz_questions is None:
         return redirect(url_for('index'))
     
+    if question_index >= len(quiz_questions):
+        return redirect(url_for('index', date=date))
+    quiz_question = quiz_questions[question_index]
+    if answer_index >= len(quiz_question['options']):
+        return redirect(url_for('index', date=date))
+    
     # Check if the answer is correct
-    correct = answer_index == content['quiz_question']['correct_index']
+    correct = answer_index == quiz_question['correct_index']
     
-    # Update stats using the tracker if available
-    if TRACKER_AVAILABLE:
-        user_answer = content['quiz_question']['options'][answer_index]
-        tracker.record_quiz_answer(content['quiz_question'], user_answer, correct)
+    # Queue the answer for the tracker if available; it is recorded in the background
+    answers = get_answers()
+    if answers is not None:
+        user_answer = quiz_question['options'][answer_index]
+        answers.submit(user_id, quiz_question, user_answer, correct)
     else:
         # Update stats manually
         try:
@@ -261,10 +245,112 @@ def submit_answer(date, answer_index):
     if correct:
         flash('Correct! Great job!', 'success')
     else:
-        correct_answer = content['quiz_question']['options'][content['quiz_question']['correct_index']]
+        correct_answer = quiz_question['options'][quiz_question['correct_index']]
         flash(f'Incorrect. The correct answer is: {correct_answer}', 'error')
     
-    return redirect(url_for('index', date=date))
+    return remember_user(redirect(url_for('index', date=date)), user_id)
+
+def healthz():
+    """Liveness check for load balancers; also checks the content store responds."""
+    get_daily_content().store.version()
+    return jsonify(status="ok")
+
+class EncodedJson:
+    """A JSON body with its strong ETag and, once needed, its gzip encoding."""
+    
+    def __init__(self, payload):
+        self.body = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        self.etag = hashlib.sha256(self.body).hexdigest()[:32]
+        self._gzipped = None
+    
+    @property
+    def gzipped(self):
+        if self._gzipped is None:
+            # A fixed mtime keeps the compressed bytes (and their ETag) stable
+            self._gzipped = gzip.compress(self.body, mtime=0)
+        return self._gzipped
+
+def json_response(encoded, cache_control):
+    """
+    Send an EncodedJson with caching headers, compressing it if the client accepts gzip.
+    
+    The gzip representation gets its own strong ETag. A request whose
+    If-None-Match matches the representation it would get is answered
+    with 304 Not Modified and no body.
+    """
+    use_gzip = len(encoded.body) >= current_app.config["GZIP_MIN_SIZE"] and request.accept_encodings["gzip"] > 0
+    etag = f"{encoded.etag}-gzip" if use_gzip else encoded.etag
+    
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(encoded.gzipped if use_gzip else encoded.body, mimetype="application/json")
+        if use_gzip:
+            response.headers["Content-Encoding"] = "gzip"
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = cache_control
+    response.vary.add("Accept-Encoding")
+    return response
+
+def api_dates():
+    """GET /api/dates: the available dates, most recent first."""
+    return json_response(EncodedJson({"dates": get_daily_content().dates()}), RECENT_CACHE_CONTROL)
+
+def api_day(date):
+    """GET /api/days/<date>: the summaries and quiz questions of a day."""
+    document = get_daily_content().get(date)
+    if document is None:
+        return jsonify(error=f"No content for {date}"), 404
+    
+    # Reuse the encoding while the content cache hands out the same document
+    lock, bodies = current_app.extensions["api_day_bodies"]
+    with lock:
+        cached = bodies.get(date)
+        if cached is not None and cached[0] is document:
+            bodies.move_to_end(date)
+            encoded = cached[1]
+        else:
+            encoded = None
+    if encoded is None:
+        encoded = EncodedJson(document)
+        with lock:
+            bodies[date] = (document, encoded)
+            while len(bodies) > current_app.config["CONTENT_CACHE_SIZE"]:
+                bodies.popitem(last=False)
+    
+    today = datetime.now().strftime("%Y-%m-%d")
+    return json_response(encoded, IMMUTABLE_CACHE_CONTROL if date < today else RECENT_CACHE_CONTROL)
+
+def api_stats():
+    """GET /api/stats: the current learner's stats and topic recommendations."""
+    user_id = get_user_id(create=False)
+    trackers = get_trackers()
+    if not user_id or trackers is None:
+        return jsonify(error="Unknown learner"), 404
+    tracker = get_tracker(user_id)
+    payload = {"stats": tracker.get_stats(), "recommendations": tracker.get_topic_recommendations()}
+    return json_response(EncodedJson(payload), PRIVATE_CACHE_CONTROL)
+
+def search():
+    """GET /search?q=<text>[&topic=&since=&until=&limit=]: matching updates, best first."""
+    text = request.args.get('q', '')
+    topic = request.args.get('topic')
+    if not text.strip() and not topic:
+        return jsonify(error="Nothing to search for; pass q and/or topic"), 400
+    dates = {}
+    for name in ('since', 'until'):
+        value = request.args.get(name)
+        if value:
+            try:
+                datetime.strptime(value, "%Y-%m-%d")
+            except ValueError:
+                return jsonify(error=f"{name} must be a date as YYYY-MM-DD"), 400
+        dates[name] = value
+    limit = min(max(request.args.get('limit', SEARCH_LIMIT, type=int), 1), MAX_SEARCH_LIMIT)
+    
+    results = get_daily_content().store.search(text, topic=topic, limit=limit, **dates)
+    return json_response(EncodedJson({"query": text, "results": results}), RECENT_CACHE_CONTROL)
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    debug = os.getenv("FLASK_DEBUG", "1") == "1"
+    create_app({"ALLOW_USER_PARAM": debug}).run(debug=debug, host='0.0.0.0', port=int(os.getenv("PORT", "5000")))
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+AWS Learning Assistant - WSGI Entry Point
+----------------------------------------
+Production entry point for the web interface, for example:
+
+    gunicorn --workers 4 --threads 4 --bind 0.0.0.0:5000 wsgi:app
+
+Every worker builds its own application (do not use --preload, so each
+worker opens its own database connections). Set SECRET_KEY so all
+workers sign flash messages with the same key.
+"""
+
+from web_interface import create_app
+
+app = create_app()